@@ -0,0 +1,89 @@
+from helpers.config import get_settings
+from stores.llm.LLMProviderFactory import LLMProviderFactory
+from stores.llm.LLMEnums import LLMEnums, JinaAIBackendEnums
+import numpy as np
+import argparse
+import logging
+import time
+
+logger = logging.getLogger("uvicorn")
+
+# Compares the JinaAI embedding backends on this machine: the PyTorch model against the
+# ONNX Runtime model (JINAAI_ONNX_* settings). Run from src:
+#   python benchmark_embedding_backends.py [--file chunks.txt] [--samples 256] [--quantization avx512_vnni]
+# Reports throughput of each backend and the cosine agreement of their vectors.
+
+SAMPLE_TEXTS = [
+    "The tenant may terminate the lease with three months written notice to the landlord.",
+    "Contracts concluded by a minor are voidable at the request of the minor or their guardian.",
+    "An appeal against the judgment must be filed within forty days of its pronouncement.",
+    "يلتزم المؤجر بتسليم العين المؤجرة وملحقاتها في حالة تصلح معها لأن تفي بما أعدت له من المنفعة.",
+    "لا يجوز للمحكمة أن تقضي بعقوبة لم ينص عليها القانون.",
+    "Article 147: the contract is the law of the contracting parties, it may not be revoked or amended "
+    "except by mutual consent of the parties or for reasons provided by law.",
+]
+
+def load_texts(file_path: str, samples: int) -> list:
+    if file_path:
+        with open(file_path, encoding="utf-8") as f:
+            texts = [ line.strip() for line in f if line.strip() ]
+    else:
+        texts = SAMPLE_TEXTS
+
+    return [ texts[i % len(texts)] for i in range(samples) ]
+
+def create_provider(settings, backend: str, quantization: str = None):
+    settings = settings.model_copy(update={
+        "JINAAI_BACKEND": backend,
+        "JINAAI_ONNX_QUANTIZATION": quantization or settings.JINAAI_ONNX_QUANTIZATION,
+    })
+
+    provider = LLMProviderFactory(settings).create(provider=LLMEnums.JINAAI.value)
+    provider.set_embedding_model(model_id=settings.EMBEDDING_MODEL_ID,
+                                 embedding_size=settings.EMBEDDING_MODEL_SIZE)
+    return provider
+
+def measure(provider, texts: list):
+    # one warm-up call so session / graph setup is not timed
+    provider.embed_text(text=texts[:provider.encode_batch_size])
+
+    start_time = time.perf_counter()
+    vectors = provider.embed_text(text=texts)
+    elapsed = time.perf_counter() - start_time
+
+    if not vectors:
+        raise SystemExit(f"{provider.backend} backend failed to embed the texts")
+
+    return np.asarray(vectors, dtype=np.float32), len(texts) / elapsed
+
+def compare(file_path: str = None, samples: int = 256, quantization: str = None):
+    settings = get_settings()
+    texts = load_texts(file_path=file_path, samples=samples)
+
+    torch_vectors, torch_throughput = measure(create_provider(settings, JinaAIBackendEnums.TORCH.value), texts)
+    onnx_vectors, onnx_throughput = measure(
+        create_provider(settings, JinaAIBackendEnums.ONNX.value, quantization=quantization), texts
+    )
+
+    torch_vectors /= np.linalg.norm(torch_vectors, axis=1, keepdims=True)
+    onnx_vectors /= np.linalg.norm(onnx_vectors, axis=1, keepdims=True)
+    agreement = np.sum(torch_vectors * onnx_vectors, axis=1)
+
+    logger.info(f"{len(texts)} texts, model {settings.EMBEDDING_MODEL_ID}")
+    logger.info(f"torch: {torch_throughput:.1f} texts/s")
+    logger.info(f"onnx ({quantization or settings.JINAAI_ONNX_QUANTIZATION}): {onnx_throughput:.1f} texts/s "
+                f"({onnx_throughput / torch_throughput:.2f}x)")
+    logger.info(f"cosine agreement: mean {agreement.mean():.4f}, p5 {np.percentile(agreement, 5):.4f}, "
+                f"min {agreement.min():.4f}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description="Compare the PyTorch and ONNX Runtime JinaAI embedding backends")
+    parser.add_argument("--file", help="text file, one text per line (defaults to built-in samples)")
+    parser.add_argument("--samples", type=int, default=256, help="number of texts to embed")
+    parser.add_argument("--quantization", help="override JINAAI_ONNX_QUANTIZATION")
+    args = parser.parse_args()
+
+    compare(file_path=args.file, samples=args.samples, quantization=args.quantization)
@@ -0,0 +1,353 @@
+from .BaseController import BaseController
+from .NLPController import NLPController
+from .ProcessController import ProcessController
+from models import ResponseSignal
+from models.JobModel import JobModel
+from models.ProjectModel import ProjectModel
+from models.ChunkModel import ChunkModel
+from models.AssetModel import AssetModel
+from models.db_schemas import Job
+from models.enums.AssetTypeEnum import AssetTypeEnum
+from models.enums.JobEnums import JobTypeEnum, JobStatusEnum
+from sqlalchemy import func
+from datetime import datetime, timezone
+import asyncio
+import logging
+
+class JobController(BaseController):
+    """
+    Runs process and index jobs in the background. Jobs live in the `jobs` table,
+    every app worker polls it, and a job whose heartbeat went stale is picked up
+    again and resumed from its checkpoint.
+    """
+
+    def __init__(self, db_client, vectordb_client, generation_client,
+                 embedding_client, template_parser, process_pool=None):
+        super().__init__()
+
+        self.db_client = db_client
+        self.vectordb_client = vectordb_client
+        self.generation_client = generation_client
+        self.embedding_client = embedding_client
+        self.template_parser = template_parser
+        self.process_pool = process_pool
+
+        self.job_model = JobModel(db_client=db_client)
+
+        self.workers = []
+        self.wakeup = asyncio.Event()
+
+        self.logger = logging.getLogger('uvicorn.error')
+
+    async def start(self):
+        self.workers = [
+            asyncio.create_task(self.worker_loop())
+            for _ in range(self.app_settings.JOB_WORKERS)
+        ]
+
+    async def stop(self):
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
+
+    async def submit_job(self, job_type: str, project_id: int, params: dict):
+        job = await self.job_model.create_job(Job(
+            job_type=job_type,
+            job_status=JobStatusEnum.QUEUED.value,
+            job_project_id=project_id,
+            job_params=params,
+            job_processed=0,
+            job_attempts=0,
+            job_run_processed=0,
+        ))
+
+        self.wakeup.set()
+        return job
+
+    async def get_job_status(self, job_id: int):
+
+        job = await self.job_model.get_job(job_id=job_id)
+        if job is None:
+            return None
+
+        throughput, eta = None, None
+        if job.job_run_started_at:
+            run_end = job.job_finished_at if job.job_finished_at else datetime.now(timezone.utc)
+            elapsed = (run_end - job.job_run_started_at).total_seconds()
+            run_processed = job.job_processed - job.job_run_processed
+
+            if elapsed > 0 and run_processed > 0:
+                throughput = run_processed / elapsed
+                if job.job_total is not None and job.job_status == JobStatusEnum.RUNNING.value:
+                    eta = max(0, job.job_total - job.job_processed) / throughput
+
+        return {
+            "job_id": job.job_id,
+            "job_type": job.job_type,
+            "status": job.job_status,
+            "project_id": job.job_project_id,
+            "processed": job.job_processed,
+            "total": job.job_total,
+            "throughput_per_second": throughput,
+            "eta_seconds": eta,
+            "attempts": job.job_attempts,
+            "error": job.job_error,
+            "created_at": job.created_at.isoformat() if job.created_at else None,
+            "finished_at": job.job_finished_at.isoformat() if job.job_finished_at else None,
+        }
+
+    async def worker_loop(self):
+        while True:
+            self.wakeup.clear()
+
+            job = None
+            try:
+                job = await self.job_model.claim_next_job(
+                    stale_after_seconds=self.app_settings.JOB_STALE_SECONDS
+                )
+            except Exception as e:
+                self.logger.error(f"Error while claiming a job: {e}")
+
+            if job is None:
+                try:
+                    await asyncio.wait_for(self.wakeup.wait(), timeout=self.app_settings.JOB_POLL_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            await self.run_job(job)
+
+    async def heartbeat_loop(self, job_id: int):
+        while True:
+            await asyncio.sleep(self.app_settings.JOB_HEARTBEAT_INTERVAL)
+            try:
+                await self.job_model.update_job(job_id=job_id)
+            except Exception as e:
+                self.logger.error(f"Error while updating job {job_id} heartbeat: {e}")
+
+    async def run_job(self, job: Job):
+
+        self.logger.info(f"Starting {job.job_type} job {job.job_id} (attempt {job.job_attempts})")
+        heartbeat = asyncio.create_task(self.heartbeat_loop(job_id=job.job_id))
+
+        try:
+            if job.job_type == JobTypeEnum.PROCESS.value:
+                await self.run_process_job(job)
+            elif job.job_type == JobTypeEnum.INDEX.value:
+                await self.run_index_job(job)
+            else:
+                raise ValueError(f"Unknown job type: {job.job_type}")
+
+            await self.job_model.update_job(job_id=job.job_id,
+                                            job_status=JobStatusEnum.COMPLETED.value,
+                                            job_finished_at=func.now())
+
+        except asyncio.CancelledError:
+            # app shutdown, hand the job back so it resumes from its checkpoint
+            await self.job_model.update_job(job_id=job.job_id, job_status=JobStatusEnum.QUEUED.value)
+            raise
+
+        except Exception as e:
+            self.logger.error(f"Job {job.job_id} failed: {e}")
+            await self.job_model.update_job(job_id=job.job_id,
+                                            job_status=JobStatusEnum.FAILED.value,
+                                            job_error=str(e),
+                                            job_finished_at=func.now())
+
+        finally:
+            heartbeat.cancel()
+
+    def create_nlp_controller(self):
+        return NLPController(
+            vectordb_client=self.vectordb_client,
+            generation_client=self.generation_client,
+            embedding_client=self.embedding_client,
+            template_parser=self.template_parser,
+        )
+
+    async def run_process_job(self, job: Job):
+
+        params = job.job_params or {}
+        checkpoint = job.job_checkpoint or {}
+        processed_asset_ids = checkpoint.get("processed_asset_ids", [])
+        is_resumed = job.job_attempts > 1
+
+        project_model = await ProjectModel.create_instance(db_client=self.db_client)
+        asset_model = await AssetModel.create_instance(db_client=self.db_client)
+        chunk_model = await ChunkModel.create_instance(db_client=self.db_client)
+
+        project = await project_model.get_project_or_create_one(project_id=job.job_project_id)
+
+        if params.get("file_id"):
+            asset_record = await asset_model.get_asset_record(
+                asset_project_id=project.project_id,
+                asset_name=params["file_id"]
+            )
+            if asset_record is None:
+                raise ValueError(ResponseSignal.FILE_ID_ERROR.value)
+
+            project_assets = { asset_record.asset_id: asset_record }
+        else:
+            project_files = await asset_model.get_all_project_assets(
+                asset_project_id=project.project_id,
+                asset_type=AssetTypeEnum.FILE.value,
+            )
+            project_assets = { record.asset_id: record for record in project_files }
+
+        project_files_ids = { asset_id: asset.asset_name for asset_id, asset in project_assets.items() }
+
+        if len(project_files_ids) == 0:
+            raise ValueError(ResponseSignal.NO_FILES_ERROR.value)
+
+        chunk_size = params.get("chunk_size", 100)
+        overlap_size = params.get("overlap_size", 20)
+        do_incremental = params.get("do_incremental") == 1
+        nlp_controller = self.create_nlp_controller()
+
+        if params.get("do_reset") == 1 and not is_resumed:
+            _ = await nlp_controller.reset_vector_db_collection(project=project)
+            _ = await chunk_model.delete_chunks_by_project_id(project_id=project.project_id)
+
+        await self.job_model.update_job(job_id=job.job_id, job_total=len(project_files_ids))
+
+        process_controller = ProcessController(project_id=project.project_id)
+
+        remaining_files_ids = {}
+        processing_signatures = {}
+        for asset_id, file_id in project_files_ids.items():
+            if asset_id in processed_asset_ids:
+                continue
+
+            if not process_controller.is_file_existed(file_id=file_id):
+                if do_incremental:
+                    _ = await process_controller.remove_asset_chunks(
+                        asset_id=asset_id, chunk_model=chunk_model,
+                        nlp_controller=nlp_controller, project=project
+                    )
+                    _ = await asset_model.update_asset_config(asset_id=asset_id, asset_config={"processing": None})
+                processed_asset_ids.append(asset_id)
+                continue
+
+            processing_signatures[asset_id] = await process_controller.get_processing_signature(
+                file_id=file_id, chunk_size=chunk_size, overlap_size=overlap_size
+            )
+
+            if do_incremental and process_controller.is_asset_unchanged(
+                asset=project_assets[asset_id], signature=processing_signatures[asset_id]
+            ):
+                processed_asset_ids.append(asset_id)
+                continue
+
+            remaining_files_ids[asset_id] = file_id
+
+        await self.job_model.update_job(job_id=job.job_id,
+                                        job_processed=len(processed_asset_ids),
+                                        job_checkpoint={ "processed_asset_ids": processed_asset_ids })
+
+        files_chunks = process_controller.iter_files_chunks(
+            files=remaining_files_ids,
+            chunk_size=chunk_size,
+            overlap_size=overlap_size,
+            executor=self.process_pool,
+            max_pending=self.app_settings.PROCESSING_MAX_PENDING_FILES,
+        )
+
+        try:
+            async for asset_id, file_id, file_chunks in files_chunks:
+
+                if file_chunks is None:
+                    self.logger.error(f"Error while processing file: {file_id}")
+                elif len(file_chunks) == 0:
+                    raise ValueError(ResponseSignal.PROCESSING_FAILED.value)
+                else:
+                    chunks_records = process_controller.build_chunks_records(
+                        file_chunks=file_chunks,
+                        project_id=project.project_id,
+                        asset_id=asset_id
+                    )
+
+                    if do_incremental:
+                        # re-running the diff after an interruption is idempotent
+                        _ = await process_controller.sync_asset_chunks(
+                            asset_id=asset_id, chunks_records=chunks_records,
+                            chunk_model=chunk_model, nlp_controller=nlp_controller, project=project
+                        )
+                    else:
+                        if is_resumed:
+                            # chunks this job inserted before the checkpoint was written
+                            _ = await chunk_model.delete_chunks_by_asset_id(asset_id=asset_id,
+                                                                            created_after=job.created_at)
+
+                        _ = await chunk_model.insert_many_chunks(chunks=chunks_records)
+
+                    _ = await asset_model.update_asset_config(
+                        asset_id=asset_id, asset_config={"processing": processing_signatures[asset_id]}
+                    )
+
+                processed_asset_ids.append(asset_id)
+                await self.job_model.update_job(job_id=job.job_id,
+                                                job_processed=len(processed_asset_ids),
+                                                job_checkpoint={ "processed_asset_ids": processed_asset_ids })
+        finally:
+            await files_chunks.aclose()
+
+    async def run_index_job(self, job: Job):
+
+        params = job.job_params or {}
+        checkpoint = job.job_checkpoint or {}
+        last_chunk_id = checkpoint.get("last_chunk_id", 0)
+        inserted_count = checkpoint.get("inserted_items_count", 0)
+
+        project_model = await ProjectModel.create_instance(db_client=self.db_client)
+        chunk_model = await ChunkModel.create_instance(db_client=self.db_client)
+
+        project = await project_model.get_project_or_create_one(project_id=job.job_project_id)
+        nlp_controller = self.create_nlp_controller()
+
+        if "last_chunk_id" in checkpoint:
+            # pages are inserted in chunk_id order and the checkpoint is written after the insert
+            # commits, so the vector store is the resume point: a page stored right before a crash
+            # is not inserted (and counted) twice
+            last_chunk_id = await nlp_controller.get_vector_db_last_record_id(project=project)
+            inserted_count = await chunk_model.get_total_chunks_count(project_id=project.project_id,
+                                                                      max_chunk_id=last_chunk_id)
+        elif params.get("do_incremental") == 1:
+            # job_total counts every chunk, the ones already in the vector store count as processed
+            last_chunk_id = await nlp_controller.get_vector_db_last_record_id(project=project)
+            inserted_count = await chunk_model.get_total_chunks_count(project_id=project.project_id,
+                                                                      max_chunk_id=last_chunk_id)
+
+        collection_name = nlp_controller.create_collection_name(project_id=project.project_id)
+        _ = await self.vectordb_client.create_collection(
+            collection_name=collection_name,
+            embedding_size=self.embedding_client.embedding_size,
+            do_reset=params.get("do_reset") == 1 and last_chunk_id == 0,
+            quantization=params.get("quantization"),
+        )
+
+        total_chunks_count = await chunk_model.get_total_chunks_count(project_id=project.project_id)
+        await self.job_model.update_job(job_id=job.job_id, job_total=total_chunks_count)
+
+        async def save_checkpoint(run_inserted_count: int, chunk_id: int):
+            await self.job_model.update_job(
+                job_id=job.job_id,
+                job_processed=inserted_count + run_inserted_count,
+                job_checkpoint={
+                    "last_chunk_id": chunk_id,
+                    "inserted_items_count": inserted_count + run_inserted_count,
+                }
+            )
+
+        run_inserted_count = await nlp_controller.index_chunks_pipeline(
+            project=project,
+            chunks_pages=chunk_model.iter_project_chunks(project_id=project.project_id,
+                                                         page_size=params.get("page_size"),
+                                                         after_chunk_id=last_chunk_id),
+            ordered=True,
+            on_checkpoint=save_checkpoint,
+            bulk_load=params.get("do_bulk_load") == 1,
+        )
+
+        if run_inserted_count is None:
+            raise RuntimeError(ResponseSignal.INSERT_INTO_VECTORDB_ERROR.value)
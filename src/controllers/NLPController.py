@@ -1,19 +1,45 @@
 from .BaseController import BaseController
 from models.db_schemas import Project, DataChunk
 from stores.llm.LLMEnums import DocumentTypeEnum
-from typing import List
+from stores.llm.ContextBuilder import ContextBuilder
+from stores.vectordb.VectorDBEnums import SearchModeEnums
+from stores.vectordb.MetadataFilter import MetadataFilter
+from models import ResponseSignal
+from utils.metrics import RAG_ANSWER_FIRST_TOKEN_LATENCY, RAG_STAGE_LATENCY
+from typing import List, AsyncIterator, Callable, Awaitable
+import asyncio
+import heapq
+import logging
 import json
+import time
 
 class NLPController(BaseController):
 
     def __init__(self, vectordb_client, generation_client, 
-                 embedding_client, template_parser):
+                 embedding_client, template_parser, answer_cache=None, reranker=None):
         super().__init__()
 
         self.vectordb_client = vectordb_client
         self.generation_client = generation_client
         self.embedding_client = embedding_client
         self.template_parser = template_parser
+        self.answer_cache = answer_cache
+        self.reranker = reranker
+
+        # milliseconds per pipeline stage of the last search / answer
+        self.stage_timings = {}
+
+        self.context_builder = ContextBuilder(
+            count_tokens=self.generation_client.count_tokens,
+            chars_per_token=self.app_settings.GENERATION_CHARS_PER_TOKEN,
+            dedup_threshold=self.app_settings.RAG_CONTEXT_DEDUP_THRESHOLD,
+        )
+
+        self.logger = logging.getLogger('uvicorn.error')
+
+    def get_chunk_vector_metadata(self, chunk: DataChunk):
+        # asset_id travels with the vector so searches can filter and report it
+        return { **(chunk.chunk_metadata or {}), "asset_id": chunk.chunk_asset_id }
 
     def create_collection_name(self, project_id: str):
         return f"collection_{self.vectordb_client.default_vector_size}_{project_id}".strip()
@@ -22,9 +48,37 @@ class NLPController(BaseController):
         collection_name = self.create_collection_name(project_id=project.project_id)
         return await self.vectordb_client.delete_collection(collection_name=collection_name)
     
-    async def get_vector_db_collection_info(self, project: Project):
+    async def delete_vector_db_records(self, project: Project, record_ids: List[int]):
+        collection_name = self.create_collection_name(project_id=project.project_id)
+        return await self.vectordb_client.delete_records(collection_name=collection_name,
+                                                         record_ids=record_ids)
+
+    async def get_vector_db_last_record_id(self, project: Project):
+        collection_name = self.create_collection_name(project_id=project.project_id)
+        return await self.vectordb_client.get_last_record_id(collection_name=collection_name)
+    
+    async def get_vector_db_index_build_progress(self, project: Project):
+        collection_name = self.create_collection_name(project_id=project.project_id)
+        return await self.vectordb_client.get_index_build_progress(collection_name=collection_name)
+
+    async def evaluate_vector_db_quantization(self, project: Project, sample_size: int = 20, limit: int = 10):
+        collection_name = self.create_collection_name(project_id=project.project_id)
+        return await self.vectordb_client.evaluate_quantization(collection_name=collection_name,
+                                                                sample_size=sample_size, limit=limit)
+
+    async def get_vector_db_index_config(self, project: Project):
+        collection_name = self.create_collection_name(project_id=project.project_id)
+        return await self.vectordb_client.get_index_config(collection_name=collection_name)
+
+    async def set_vector_db_index_config(self, project: Project, index_config: dict):
         collection_name = self.create_collection_name(project_id=project.project_id)
-        collection_info = await self.vectordb_client.get_collection_info(collection_name=collection_name)
+        return await self.vectordb_client.set_index_config(collection_name=collection_name,
+                                                           index_config=index_config)
+
+    async def get_vector_db_collection_info(self, project: Project, exact: bool = False):
+        collection_name = self.create_collection_name(project_id=project.project_id)
+        collection_info = await self.vectordb_client.get_collection_info(collection_name=collection_name,
+                                                                         exact=exact)
 
         return json.loads(
             json.dumps(collection_info, default=lambda x: x.__dict__)
@@ -39,9 +93,9 @@ class NLPController(BaseController):
 
         # step2: manage items
         texts = [ c.chunk_text for c in chunks ]
-        metadata = [ c.chunk_metadata for c in  chunks]
-        vectors = self.embedding_client.embed_text(text=texts, 
-                                                  document_type=DocumentTypeEnum.DOCUMENT.value)
+        metadata = [ self.get_chunk_vector_metadata(c) for c in  chunks]
+        vectors = await self.embedding_client.aembed_text(text=texts, 
+                                                         document_type=DocumentTypeEnum.DOCUMENT.value)
 
         # step3: create collection if not exists
         _ = await self.vectordb_client.create_collection(
@@ -59,76 +113,413 @@ class NLPController(BaseController):
             record_ids=chunks_ids,
         )
 
+        _ = await self.vectordb_client.build_vector_index(collection_name=collection_name)
+
         return True
 
-    async def search_vector_db_collection(self, project: Project, text: str, limit: int = 10):
+    async def index_chunks_pipeline(self, project: Project, chunks_pages: AsyncIterator[List[DataChunk]],
+                                    queue_size: int = None, embedding_workers: int = None,
+                                    insert_workers: int = None, on_progress: Callable[[int], None] = None,
+                                    ordered: bool = False,
+                                    on_checkpoint: Callable[[int, int], Awaitable[None]] = None,
+                                    bulk_load: bool = False):
 
-        # step1: get collection name
-        query_vector = None
+        # read -> embed -> insert stages connected with bounded queues, so DB reads,
+        # embedding calls and vector db writes overlap while a full queue applies backpressure.
+        # ordered=True commits pages in chunk_id order with a single writer, so after each
+        # commit on_checkpoint(inserted_count, last_chunk_id) marks a safe resume point.
+        # The vector index is built (or brought up to date) once at the end; bulk_load drops it
+        # first so large loads do not pay for index maintenance on every insert
+        queue_size = queue_size if queue_size else self.app_settings.INDEX_PIPELINE_QUEUE_SIZE
+        embedding_workers = embedding_workers if embedding_workers else self.app_settings.INDEX_PIPELINE_EMBEDDING_WORKERS
+        insert_workers = insert_workers if insert_workers else self.app_settings.INDEX_PIPELINE_INSERT_WORKERS
+        if ordered:
+            insert_workers = 1
+
+        collection_name = self.create_collection_name(project_id=project.project_id)
+
+        embedding_queue = asyncio.Queue(maxsize=queue_size)
+        insert_queue = asyncio.Queue(maxsize=queue_size)
+        inserted_items_count = 0
+
+        async def read_stage():
+            page_no = 0
+            async for page_chunks in chunks_pages:
+                await embedding_queue.put((page_no, page_chunks))
+                page_no += 1
+
+            for _ in range(embedding_workers):
+                await embedding_queue.put(None)
+
+        async def embedding_stage():
+            while True:
+                item = await embedding_queue.get()
+                if item is None:
+                    break
+
+                page_no, page_chunks = item
+                texts = [ c.chunk_text for c in page_chunks ]
+                vectors = await self.embedding_client.aembed_text(
+                    text=texts,
+                    document_type=DocumentTypeEnum.DOCUMENT.value
+                )
+
+                if not vectors or len(vectors) != len(texts):
+                    raise RuntimeError(f"Embedding failed for a page of {len(texts)} chunks")
+
+                await insert_queue.put((page_no, page_chunks, vectors))
+
+        async def feed_stage():
+            await asyncio.gather(read_stage(), *[ embedding_stage() for _ in range(embedding_workers) ])
+
+            for _ in range(insert_workers):
+                await insert_queue.put(None)
+
+        async def insert_page(page_chunks: List[DataChunk], vectors: list):
+            nonlocal inserted_items_count
+
+            is_inserted = await self.vectordb_client.insert_many(
+                collection_name=collection_name,
+                texts=[ c.chunk_text for c in page_chunks ],
+                metadata=[ self.get_chunk_vector_metadata(c) for c in page_chunks ],
+                vectors=vectors,
+                record_ids=[ c.chunk_id for c in page_chunks ],
+            )
+
+            if not is_inserted:
+                raise RuntimeError(f"Vector db insert failed for collection: {collection_name}")
+
+            inserted_items_count += len(page_chunks)
+            if on_progress:
+                on_progress(len(page_chunks))
+
+            if on_checkpoint:
+                await on_checkpoint(inserted_items_count, page_chunks[-1].chunk_id)
+
+        async def insert_stage():
+            # embedding workers may finish pages out of order, ordered mode buffers them
+            next_page_no = 0
+            pending_pages = {}
+
+            while True:
+                item = await insert_queue.get()
+                if item is None:
+                    break
+
+                page_no, page_chunks, vectors = item
+                if not ordered:
+                    await insert_page(page_chunks, vectors)
+                    continue
+
+                pending_pages[page_no] = (page_chunks, vectors)
+                while next_page_no in pending_pages:
+                    await insert_page(*pending_pages.pop(next_page_no))
+                    next_page_no += 1
+
+        if bulk_load:
+            _ = await self.vectordb_client.defer_vector_index(collection_name=collection_name)
+
+        tasks = [ asyncio.create_task(feed_stage()) ] + [
+            asyncio.create_task(insert_stage()) for _ in range(insert_workers)
+        ]
+
+        try:
+            await asyncio.gather(*tasks)
+        except Exception as e:
+            self.logger.error(f"Indexing pipeline failed for project {project.project_id}: {e}")
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+            # keep whatever was inserted searchable through the index
+            if bulk_load:
+                _ = await self.vectordb_client.build_vector_index(collection_name=collection_name)
+            return None
+
+        _ = await self.vectordb_client.build_vector_index(collection_name=collection_name)
+
+        return inserted_items_count
+
+    async def search_vector_db_collection(self, project: Project, text: str, limit: int = 10,
+                                          mode: str = SearchModeEnums.VECTOR.value,
+                                          search_params: dict = None, metadata_filter: dict = None,
+                                          rerank_candidates: int = None):
+
+        # step1: get collection name, validate the filter before spending an embedding call
         collection_name = self.create_collection_name(project_id=project.project_id)
+        filter_conditions = MetadataFilter.parse(metadata_filter)
 
         # step2: get text embedding vector
-        vectors = self.embedding_client.embed_text(text=text, 
-                                                 document_type=DocumentTypeEnum.QUERY.value)
+        stage_start = time.perf_counter()
+        query_vector = await self.get_query_vector(text=text)
+        self.record_stage_latency("embed", stage_start)
+        if not query_vector:
+            return False    
 
-        if not vectors or len(vectors) == 0:
+        # step3: do semantic (or hybrid semantic + lexical) search, over-fetching for the re-ranker
+        candidates = limit
+        if self.reranker:
+            candidates = max(limit, rerank_candidates or self.app_settings.RERANK_CANDIDATES)
+
+        stage_start = time.perf_counter()
+        results = await self.search_collection_by_vector(
+            collection_name=collection_name, query_vector=query_vector, text=text, limit=candidates,
+            mode=mode, search_params=search_params, filter_conditions=filter_conditions
+        )
+        self.record_stage_latency("search", stage_start)
+
+        if not results:
             return False
+
+        # step4: re-score the candidates with the cross-encoder and keep the top limit
+        if self.reranker:
+            stage_start = time.perf_counter()
+            results = await self.reranker.arerank(query=text, documents=results, top_k=limit)
+            self.record_stage_latency("rerank", stage_start)
+
+        return results
+
+    def record_stage_latency(self, stage: str, start_time: float):
+        elapsed = time.perf_counter() - start_time
+        self.stage_timings[stage] = round(elapsed * 1000, 2)
+        RAG_STAGE_LATENCY.labels(stage=stage).observe(elapsed)
+
+    async def get_query_vector(self, text: str):
+        vectors = await self.embedding_client.aembed_text(text=text, 
+                                                        document_type=DocumentTypeEnum.QUERY.value)
+
+        if not vectors or len(vectors) == 0:
+            return None
         
         # If vectors is a list of floats (single vector), use it directly
         if isinstance(vectors, list) and all(isinstance(v, float) for v in vectors):
-            query_vector = vectors
+            return vectors
         # If vectors is a list of vectors (e.g., multiple embeddings), use the first
-        elif isinstance(vectors, list) and isinstance(vectors[0], list):
-            query_vector = vectors[0]
+        if isinstance(vectors, list) and isinstance(vectors[0], list):
+            return vectors[0]
+
+        return None
+
+    async def search_collection_by_vector(self, collection_name: str, query_vector: list, text: str,
+                                          limit: int, mode: str = SearchModeEnums.VECTOR.value,
+                                          search_params: dict = None, filter_conditions: list = None):
+        if mode == SearchModeEnums.HYBRID.value:
+            results = await self.vectordb_client.search_hybrid(
+                collection_name=collection_name,
+                vector=query_vector,
+                query_text=text,
+                limit=limit,
+                search_params=search_params,
+                metadata_filter=filter_conditions
+            )
         else:
-            return False
+            results = await self.vectordb_client.search_by_vector(
+                collection_name=collection_name,
+                vector=query_vector,
+                limit=limit,
+                search_params=search_params,
+                metadata_filter=filter_conditions
+            )
 
+        return results
+
+    async def federated_search_vector_db_collections(self, projects: List[Project], text: str, limit: int = 10,
+                                                     mode: str = SearchModeEnums.VECTOR.value,
+                                                     search_params: dict = None, metadata_filter: dict = None,
+                                                     timeout: float = None):
 
+        # the query is embedded once, every project collection is searched concurrently under its
+        # own timeout and the global top-k is kept in a heap bounded at limit entries.
+        # Returns (results, failed projects); a slow or failing collection only drops its own hits
+        timeout = timeout if timeout else self.app_settings.VECTOR_DB_FEDERATED_SEARCH_TIMEOUT
+        filter_conditions = MetadataFilter.parse(metadata_filter)
+
+        query_vector = await self.get_query_vector(text=text)
         if not query_vector:
-            return False    
+            return False, []
 
-        # step3: do semantic search
-        results = await self.vectordb_client.search_by_vector(
-            collection_name=collection_name,
-            vector=query_vector,
-            limit=limit
-        )
+        async def search_project(project: Project):
+            return await asyncio.wait_for(
+                self.search_collection_by_vector(
+                    collection_name=self.create_collection_name(project_id=project.project_id),
+                    query_vector=query_vector, text=text, limit=limit, mode=mode,
+                    search_params=search_params, filter_conditions=filter_conditions,
+                ),
+                timeout=timeout
+            )
 
-        if not results:
-            return False
+        outcomes = await asyncio.gather(*[ search_project(p) for p in projects ], return_exceptions=True)
 
-        return results
+        top_results, failed_projects, entry_no = [], [], 0
+        for project, outcome in zip(projects, outcomes):
+            if isinstance(outcome, Exception):
+                is_timeout = isinstance(outcome, asyncio.TimeoutError)
+                if not is_timeout:
+                    self.logger.error(f"Federated search failed for project {project.project_id}: {outcome}")
+                failed_projects.append({
+                    "project_id": project.project_id,
+                    "reason": "timeout" if is_timeout else "error",
+                })
+                continue
+
+            for document in outcome or []:
+                document.project_id = project.project_id
+                # the entry number breaks score ties so documents are never compared
+                item = (document.score, entry_no, document)
+                entry_no += 1
+                if len(top_results) < limit:
+                    heapq.heappush(top_results, item)
+                elif item[0] > top_results[0][0]:
+                    heapq.heapreplace(top_results, item)
+
+        results = [ item[2] for item in sorted(top_results, key=lambda item: item[0], reverse=True) ]
+
+        return results, failed_projects
     
-    async def answer_rag_question(self, project: Project, query: str, limit: int = 10):
+    async def answer_rag_question(self, project: Project, query: str, limit: int = 10,
+                                  mode: str = SearchModeEnums.VECTOR.value,
+                                  search_params: dict = None, metadata_filter: dict = None):
         
         answer, full_prompt, chat_history = None, None, None
 
+        cached_answer, cache_context = await self.lookup_rag_answer(project=project, query=query, limit=limit,
+                                                                    mode=mode, search_params=search_params,
+                                                                    metadata_filter=metadata_filter)
+        if cached_answer:
+            return cached_answer["answer"], cached_answer["full_prompt"], cached_answer["chat_history"]
+
         # step1: retrieve related documents
         retrieved_documents = await self.search_vector_db_collection(
             project=project,
             text=query,
             limit=limit,
+            mode=mode,
+            search_params=search_params,
+            metadata_filter=metadata_filter,
         )
 
         if not retrieved_documents or len(retrieved_documents) == 0:
             return answer, full_prompt, chat_history
         
         # step2: Construct LLM prompt
-        system_prompt = self.template_parser.get("rag", "system_prompt")
+        full_prompt, chat_history = self.construct_rag_prompt(query=query, retrieved_documents=retrieved_documents)
+
+        # step3: Retrieve the Answer
+        stage_start = time.perf_counter()
+        answer = await self.generation_client.agenerate_text(
+            prompt=full_prompt,
+            chat_history=chat_history
+        )
+        self.record_stage_latency("generate", stage_start)
+        self.logger.info(f"RAG stage timings (ms): {self.stage_timings}")
+
+        self.store_rag_answer(cache_context=cache_context, answer=answer, full_prompt=full_prompt,
+                              chat_history=chat_history, documents=[ doc.dict() for doc in retrieved_documents ])
+
+        return answer, full_prompt, chat_history
 
-        documents_prompts = "\n".join([
-            self.template_parser.get("rag", "document_prompt", {
-                    "doc_num": idx + 1,
-                    "chunk_text": self.generation_client.process_text(doc.text),
-            })
-            for idx, doc in enumerate(retrieved_documents)
-        ])
+    async def lookup_rag_answer(self, project: Project, query: str, limit: int = 10,
+                                mode: str = SearchModeEnums.VECTOR.value, search_params: dict = None,
+                                metadata_filter: dict = None):
+
+        # returns (cached answer or None, cache context for store_rag_answer); the query embedding
+        # is reused by the retrieval that follows a miss through the query embedding cache
+        if not self.answer_cache:
+            return None, None
+
+        query_vector = await self.get_query_vector(text=query)
+        if not query_vector:
+            return None, None
+
+        collection_name = self.create_collection_name(project_id=project.project_id)
+        # recall knobs change the retrieved documents, unset ones are the server defaults
+        search_params = { k: v for k, v in (search_params or {}).items() if v is not None }
+        search_scope = json.dumps({ "mode": mode, "limit": limit, "search_params": search_params,
+                                    "filter": metadata_filter },
+                                  sort_keys=True, ensure_ascii=False)
+        cache_key = (collection_name, self.template_parser.language, search_scope)
+
+        cache_context = {
+            "key": cache_key,
+            "query": query,
+            "query_vector": query_vector,
+            "version": self.answer_cache.get_version(collection_name),
+        }
+
+        return self.answer_cache.get(cache_key, query_vector), cache_context
+
+    def store_rag_answer(self, cache_context: dict, answer: str, full_prompt: str,
+                         chat_history: list, documents: list = None):
+        if not self.answer_cache or not cache_context or not answer:
+            return False
+
+        return self.answer_cache.set(**cache_context, answer=answer, full_prompt=full_prompt,
+                                     chat_history=chat_history, documents=documents)
+
+    def get_context_token_budget(self, system_prompt: str, footer_prompt: str) -> int:
+        budget = self.app_settings.RAG_CONTEXT_MAX_TOKENS
+
+        # leave room in the context window for the instructions, the question and the answer
+        context_tokens = self.app_settings.GENERATION_MODEL_CONTEXT_TOKENS
+        if context_tokens:
+            # unset GENERATION_DAFAULT_MAX_TOKENS leaves the answer length to the provider
+            answer_tokens = self.generation_client.default_generation_max_output_tokens or 0
+            reserved_tokens = (answer_tokens
+                               + self.context_builder.count(system_prompt)
+                               + self.context_builder.count(footer_prompt))
+            budget = min(budget, context_tokens - reserved_tokens)
+
+        return max(budget, 0)
+
+    async def astream_rag_answer(self, query: str, retrieved_documents: list, cache_context: dict = None):
+
+        # yields (event, data): the retrieved documents first, then answer deltas as the
+        # generation provider streams them, then the assembled answer (or an error)
+        full_prompt, chat_history = self.construct_rag_prompt(query=query, retrieved_documents=retrieved_documents)
+
+        yield "documents", [ doc.dict() for doc in retrieved_documents ]
+
+        start_time = time.perf_counter()
+        answer_deltas = []
+        async for delta in self.generation_client.astream_text(prompt=full_prompt, chat_history=chat_history):
+            if not answer_deltas:
+                RAG_ANSWER_FIRST_TOKEN_LATENCY.observe(time.perf_counter() - start_time)
+            answer_deltas.append(delta)
+            yield "delta", { "text": delta }
+
+        if not answer_deltas:
+            yield "error", { "signal": ResponseSignal.RAG_ANSWER_ERROR.value }
+            return
+
+        answer = "".join(answer_deltas)
+        self.store_rag_answer(cache_context=cache_context, answer=answer, full_prompt=full_prompt,
+                              chat_history=chat_history, documents=[ doc.dict() for doc in retrieved_documents ])
+
+        yield "done", {
+            "signal": ResponseSignal.RAG_ANSWER_SUCCESS.value,
+            "answer": answer,
+        }
+
+    def construct_rag_prompt(self, query: str, retrieved_documents: list):
+
+        system_prompt = self.template_parser.get("rag", "system_prompt")
 
         footer_prompt = self.template_parser.get("rag", "footer_prompt", {
             "query": query
         })
 
-        # step3: Construct Generation Client Prompts
+        # whole documents by score within the token budget, instead of every chunk cut to a fixed length
+        documents_prompts, packing_stats = self.context_builder.build(
+            documents=retrieved_documents,
+            render=lambda doc_num, text: self.template_parser.get("rag", "document_prompt", {
+                    "doc_num": doc_num,
+                    "chunk_text": text,
+            }),
+            max_tokens=self.get_context_token_budget(system_prompt=system_prompt, footer_prompt=footer_prompt),
+        )
+        documents_prompts = "\n".join(documents_prompts)
+        self.logger.debug(f"RAG context packing: {packing_stats}")
+
         chat_history = [
             self.generation_client.construct_prompt(
                 prompt=system_prompt,
@@ -138,10 +529,4 @@ class NLPController(BaseController):
 
         full_prompt = "\n\n".join([ documents_prompts,  footer_prompt])
 
-        # step4: Retrieve the Answer
-        answer = self.generation_client.generate_text(
-            prompt=full_prompt,
-            chat_history=chat_history
-        )
-
-        return answer, full_prompt, chat_history
+        return full_prompt, chat_history
@@ -4,8 +4,15 @@ import os
 from langchain_community.document_loaders import TextLoader
 from langchain_community.document_loaders import PyMuPDFLoader
 from models import ProcessingEnum
+from models.db_schemas import DataChunk
 from typing import List
 from dataclasses import dataclass
+from concurrent.futures import Executor
+import asyncio
+import hashlib
+import logging
+
+logger = logging.getLogger('uvicorn.error')
 
 @dataclass
 class Document:
@@ -23,6 +30,30 @@ class ProcessController(BaseController):
     def get_file_extension(self, file_id: str):
         return os.path.splitext(file_id)[-1]
 
+    def is_file_existed(self, file_id: str):
+        return os.path.exists(os.path.join(self.project_path, file_id))
+
+    def get_file_hash(self, file_id: str, block_size: int=1048576):
+        file_hash = hashlib.sha256()
+        with open(os.path.join(self.project_path, file_id), "rb") as f:
+            for block in iter(lambda: f.read(block_size), b""):
+                file_hash.update(block)
+
+        return file_hash.hexdigest()
+
+    async def get_processing_signature(self, file_id: str, chunk_size: int=100, overlap_size: int=20):
+        # a file has to be re-chunked when its content or the chunking params change
+        content_hash = await asyncio.to_thread(self.get_file_hash, file_id)
+        return {
+            "content_hash": content_hash,
+            "chunk_size": chunk_size,
+            "overlap_size": overlap_size,
+        }
+
+    def is_asset_unchanged(self, asset, signature: dict):
+        asset_config = asset.asset_config or {}
+        return asset_config.get("processing") == signature
+
     def get_file_loader(self, file_id: str):
 
         file_ext = self.get_file_extension(file_id=file_id)
@@ -104,5 +135,116 @@ class ProcessController(BaseController):
 
         return chunks
 
+    def build_chunks_records(self, file_chunks: list, project_id: int, asset_id: int):
+        return [
+            DataChunk(
+                chunk_text=chunk.page_content,
+                chunk_metadata=chunk.metadata,
+                chunk_order=i+1,
+                chunk_hash=hashlib.sha256(chunk.page_content.encode("utf-8")).hexdigest(),
+                chunk_project_id=project_id,
+                chunk_asset_id=asset_id
+            )
+            for i, chunk in enumerate(file_chunks)
+        ]
+
+    def diff_chunks(self, existing_chunks: list, chunks_records: List[DataChunk]):
+        # match by content hash, duplicated texts are matched one to one
+        available_ids = {}
+        for chunk in existing_chunks:
+            available_ids.setdefault(chunk.chunk_hash, []).append(chunk.chunk_id)
+
+        new_records = []
+        for record in chunks_records:
+            matched_ids = available_ids.get(record.chunk_hash)
+            if matched_ids:
+                matched_ids.pop()
+            else:
+                new_records.append(record)
+
+        removed_ids = [ chunk_id for ids in available_ids.values() for chunk_id in ids ]
+        return new_records, removed_ids
+
+    async def sync_asset_chunks(self, asset_id: int, chunks_records: List[DataChunk],
+                                chunk_model, nlp_controller, project):
+        # unchanged chunks keep their chunk_id (and vectors), only new ones are inserted
+        existing_chunks = await chunk_model.get_asset_chunks_hashes(asset_id=asset_id)
+        new_records, removed_ids = self.diff_chunks(existing_chunks=existing_chunks,
+                                                    chunks_records=chunks_records)
+
+        if len(removed_ids):
+            _ = await nlp_controller.delete_vector_db_records(project=project, record_ids=removed_ids)
+            _ = await chunk_model.delete_chunks_by_ids(chunks_ids=removed_ids)
+
+        inserted_count = 0
+        if len(new_records):
+            inserted_count = await chunk_model.insert_many_chunks(chunks=new_records)
+
+        return inserted_count, len(removed_ids)
+
+    async def remove_asset_chunks(self, asset_id: int, chunk_model, nlp_controller, project):
+        existing_chunks = await chunk_model.get_asset_chunks_hashes(asset_id=asset_id)
+        removed_ids = [ c.chunk_id for c in existing_chunks ]
+
+        if len(removed_ids):
+            _ = await nlp_controller.delete_vector_db_records(project=project, record_ids=removed_ids)
+            _ = await chunk_model.delete_chunks_by_ids(chunks_ids=removed_ids)
+
+        return len(removed_ids)
+
+    async def iter_files_chunks(self, files: dict, chunk_size: int=100, overlap_size: int=20,
+                                executor: Executor=None, max_pending: int=8):
+        # loading and chunking run in the executor (a process pool in the app), results are
+        # yielded as soon as each file is done and at most max_pending files are in flight
+        loop = asyncio.get_running_loop()
+        files_iter = iter(files.items())
+        pending = {}
+
+        def submit():
+            while len(pending) < max_pending:
+                next_file = next(files_iter, None)
+                if next_file is None:
+                    return
+
+                asset_id, file_id = next_file
+                future = loop.run_in_executor(executor, load_file_chunks, self.project_id,
+                                              file_id, chunk_size, overlap_size)
+                pending[future] = (asset_id, file_id)
+
+        try:
+            submit()
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+
+                for future in done:
+                    asset_id, file_id = pending.pop(future)
+                    try:
+                        file_chunks = future.result()
+                    except Exception as e:
+                        logger.error(f"Error while processing file {file_id}: {e}")
+                        file_chunks = None
+
+                    yield asset_id, file_id, file_chunks
+
+                submit()
+        finally:
+            # the consumer stopped early (error or closed generator): files not started yet
+            # are dropped from the executor queue
+            for future in pending:
+                future.cancel()
+
+
+def load_file_chunks(project_id: str, file_id: str, chunk_size: int=100, overlap_size: int=20):
+    # module level so it can be pickled into worker processes
+    process_controller = ProcessController(project_id=project_id)
+
+    file_content = process_controller.get_file_content(file_id=file_id)
+    if file_content is None:
+        return None
 
-    
+    return process_controller.process_file_content(
+        file_content=file_content,
+        file_id=file_id,
+        chunk_size=chunk_size,
+        overlap_size=overlap_size
+    )
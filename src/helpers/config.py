@@ -10,11 +10,24 @@ class Settings(BaseSettings):
     FILE_MAX_SIZE: int
     FILE_DEFAULT_CHUNK_SIZE: int
 
+    PROCESSING_MAX_WORKERS: int = 4
+    PROCESSING_MAX_PENDING_FILES: int = 8
+
+    JOB_WORKERS: int = 1
+    JOB_POLL_INTERVAL: float = 2.0
+    JOB_HEARTBEAT_INTERVAL: float = 15.0
+    JOB_STALE_SECONDS: int = 120
+
     POSTGRES_USERNAME: str
     POSTGRES_PASSWORD: str
     POSTGRES_HOST: str
     POSTGRES_PORT: int
     POSTGRES_MAIN_DATABASE: str
+    POSTGRES_POOL_SIZE: int = 10
+    POSTGRES_MAX_OVERFLOW: int = 20
+    POSTGRES_POOL_PRE_PING: bool = True
+    POSTGRES_POOL_RECYCLE: int = 1800
+    POSTGRES_STATEMENT_CACHE_SIZE: int = 100
 
     GENERATION_BACKEND: str
     EMBEDDING_BACKEND: str
@@ -30,11 +43,82 @@ class Settings(BaseSettings):
     INPUT_DAFAULT_MAX_CHARACTERS: int = None
     GENERATION_DAFAULT_MAX_TOKENS: int = None
     GENERATION_DAFAULT_TEMPERATURE: float = None
+    GENERATION_MODEL_CONTEXT_TOKENS: int = None
+    GENERATION_CHARS_PER_TOKEN: float = 3.0
+    RAG_CONTEXT_MAX_TOKENS: int = 3000
+    RAG_CONTEXT_DEDUP_THRESHOLD: float = 0.85
+    LOCAL_MODEL_MAX_WORKERS: int = 2
+
+    JINAAI_BACKEND: str = "torch"
+    JINAAI_ONNX_FILE_NAME: str = None
+    JINAAI_ONNX_QUANTIZATION: str = "none"
+    JINAAI_ONNX_EXPORT_DIR: str = "assets/onnx_models"
+    JINAAI_INTRA_OP_THREADS: int = None
+    JINAAI_ENCODE_BATCH_SIZE: int = 32
+    JINAAI_ENCODE_MAX_BATCH_TOKENS: int = 16384
+
+    EMBEDDING_BATCH_MAX_ITEMS: int = None
+    EMBEDDING_BATCH_MAX_TOKENS: int = None
+    EMBEDDING_BATCH_MAX_CONCURRENCY: int = 4
+    EMBEDDING_BATCH_CHARS_PER_TOKEN: float = 3.0
+
+    EMBEDDING_CACHE_ENABLED: bool = False
+    EMBEDDING_CACHE_MAX_ENTRIES: int = 1000000
+
+    QUERY_EMBEDDING_CACHE_SIZE: int = 1024
+    QUERY_EMBEDDING_CACHE_TTL: int = 600
+    QUERY_EMBEDDING_BATCH_WINDOW_MS: float = 5
+    QUERY_EMBEDDING_MAX_BATCH_SIZE: int = 32
+
+    RERANK_ENABLED: bool = False
+    RERANK_MODEL_ID: str = "cross-encoder/mmarco-mMiniLMv2-L12-H384-v1"
+    RERANK_CANDIDATES: int = 50
+    RERANK_BATCH_SIZE: int = 16
+    RERANK_MAX_WORKERS: int = 2
+    RERANK_MAX_LENGTH: int = 512
+
+    ANSWER_CACHE_ENABLED: bool = False
+    ANSWER_CACHE_SIMILARITY_THRESHOLD: float = 0.95
+    ANSWER_CACHE_MAX_ENTRIES: int = 256
+    ANSWER_CACHE_TTL: int = 3600
 
     VECTOR_DB_BACKEND : str
     VECTOR_DB_PATH : str
+    VECTOR_DB_QDRANT_URL: str = None
+    VECTOR_DB_QDRANT_API_KEY: str = None
+    VECTOR_DB_QDRANT_PREFER_GRPC: bool = True
+    VECTOR_DB_QDRANT_GRPC_PORT: int = 6334
+    VECTOR_DB_QDRANT_UPSERT_BATCH_SIZE: int = 256
+    VECTOR_DB_QDRANT_UPSERT_PARALLEL: int = 4
+    VECTOR_DB_QDRANT_UPSERT_WAIT: bool = True
     VECTOR_DB_DISTANCE_METHOD: str = None
+    VECTOR_DB_QUANTIZATION: str = "none"
+    VECTOR_DB_QUANTIZATION_OVERSAMPLE: float = 4.0
     VECTOR_DB_PGVEC_INDEX_THRESHOLD: int = 100
+    VECTOR_DB_PGVEC_LAYOUT: str = "table"
+    VECTOR_DB_COLLECTION_CACHE_TTL: float = 60
+    VECTOR_DB_PGVEC_INDEX_TYPE: str = "hnsw"
+    VECTOR_DB_PGVEC_HNSW_M: int = 16
+    VECTOR_DB_PGVEC_HNSW_EF_CONSTRUCTION: int = 64
+    VECTOR_DB_PGVEC_HNSW_EF_SEARCH: int = 40
+    VECTOR_DB_PGVEC_IVFFLAT_LISTS: int = None
+    VECTOR_DB_PGVEC_IVFFLAT_PROBES: int = 1
+    VECTOR_DB_PGVEC_INSERT_MODE: str = "insert"
+    VECTOR_DB_PGVEC_COPY_BATCH_SIZE: int = 1000
+    VECTOR_DB_PGVEC_MAINTENANCE_WORK_MEM: str = "512MB"
+    VECTOR_DB_PGVEC_MAINTENANCE_WORKERS: int = 2
+    VECTOR_DB_PGVEC_TEXT_SEARCH_CONFIG: str = "simple"
+    VECTOR_DB_HYBRID_CANDIDATES: int = 50
+    VECTOR_DB_HYBRID_RRF_K: int = 60
+    VECTOR_DB_FEDERATED_SEARCH_TIMEOUT: float = 2.0
+    VECTOR_DB_FEDERATED_SEARCH_MAX_PROJECTS: int = 20
+    VECTOR_DB_METADATA_RANGE_FIELDS: list = ["page"]
+    VECTOR_DB_PGVEC_ITERATIVE_SCAN: str = None
+
+    INDEX_CHUNKS_PAGE_SIZE: int = 50
+    INDEX_PIPELINE_QUEUE_SIZE: int = 4
+    INDEX_PIPELINE_EMBEDDING_WORKERS: int = 2
+    INDEX_PIPELINE_INSERT_WORKERS: int = 2
 
     PRIMARY_LANG: str = "en"
     DEFAULT_LANG: str = "en"
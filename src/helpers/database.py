@@ -0,0 +1,11 @@
+from fastapi import Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+async def get_db_client(request: Request):
+    # request-scoped drop-in for app.db_client: every model session opened while handling the
+    # request is bound to the same pooled connection, checked out once and returned at the end
+    async with request.app.db_engine.connect() as connection:
+        yield sessionmaker(
+            bind=connection, class_=AsyncSession, expire_on_commit=False
+        )
@@ -1,11 +1,20 @@
 from fastapi import FastAPI
-from routes import base, data, nlp
+from routes import base, data, nlp, jobs
 from helpers.config import get_settings
 from stores.llm.LLMProviderFactory import LLMProviderFactory
+from stores.llm.CachedEmbeddingClient import CachedEmbeddingClient
+from stores.llm.EmbeddingBatcher import EmbeddingBatcher
+from stores.llm.QueryEmbeddingClient import QueryEmbeddingClient
+from stores.llm.AnswerCache import AnswerCache
+from stores.llm.CrossEncoderReranker import CrossEncoderReranker
 from stores.vectordb.VectorDBProviderFactory import VectorDBProviderFactory
+from stores.vectordb.CollectionChangeNotifier import CollectionChangeNotifier
 from stores.llm.templates.template_parser import TemplateParser
+from controllers import JobController
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
 
 app = FastAPI()
 
@@ -14,7 +23,16 @@ async def startup_span():
 
     postgres_conn = f"postgresql+asyncpg://{settings.POSTGRES_USERNAME}:{settings.POSTGRES_PASSWORD}@{settings.POSTGRES_HOST}:{settings.POSTGRES_PORT}/{settings.POSTGRES_MAIN_DATABASE}"
 
-    app.db_engine = create_async_engine(postgres_conn)
+    # routes check out one connection per request (helpers.database.get_db_client), the vector db
+    # client and background jobs share the same pool through app.db_client
+    app.db_engine = create_async_engine(
+        f"{postgres_conn}?prepared_statement_cache_size={settings.POSTGRES_STATEMENT_CACHE_SIZE}",
+        pool_size=settings.POSTGRES_POOL_SIZE,
+        max_overflow=settings.POSTGRES_MAX_OVERFLOW,
+        pool_pre_ping=settings.POSTGRES_POOL_PRE_PING,
+        pool_recycle=settings.POSTGRES_POOL_RECYCLE,
+        connect_args={"statement_cache_size": settings.POSTGRES_STATEMENT_CACHE_SIZE},
+    )
     app.db_client = sessionmaker(
         app.db_engine, class_=AsyncSession, expire_on_commit=False
     )
@@ -30,6 +48,30 @@ async def startup_span():
     app.embedding_client = llm_provider_factory.create(provider=settings.EMBEDDING_BACKEND)
     app.embedding_client.set_embedding_model(model_id=settings.EMBEDDING_MODEL_ID,
                                              embedding_size=settings.EMBEDDING_MODEL_SIZE)
+
+    app.embedding_client = EmbeddingBatcher(
+        client=app.embedding_client,
+        max_batch_items=settings.EMBEDDING_BATCH_MAX_ITEMS,
+        max_batch_tokens=settings.EMBEDDING_BATCH_MAX_TOKENS,
+        max_concurrency=settings.EMBEDDING_BATCH_MAX_CONCURRENCY,
+        chars_per_token=settings.EMBEDDING_BATCH_CHARS_PER_TOKEN,
+    )
+
+    if settings.EMBEDDING_CACHE_ENABLED:
+        app.embedding_client = CachedEmbeddingClient(
+            client=app.embedding_client,
+            provider=settings.EMBEDDING_BACKEND,
+            db_client=app.db_client,
+            max_entries=settings.EMBEDDING_CACHE_MAX_ENTRIES,
+        )
+
+    app.embedding_client = QueryEmbeddingClient(
+        client=app.embedding_client,
+        cache_size=settings.QUERY_EMBEDDING_CACHE_SIZE,
+        cache_ttl=settings.QUERY_EMBEDDING_CACHE_TTL,
+        batch_window_ms=settings.QUERY_EMBEDDING_BATCH_WINDOW_MS,
+        max_batch_size=settings.QUERY_EMBEDDING_MAX_BATCH_SIZE,
+    )
     
     # vector db client
     app.vectordb_client = vectordb_provider_factory.create(
@@ -37,19 +79,71 @@ async def startup_span():
     )
     await app.vectordb_client.connect()
 
+    # semantic answer cache, dropped for a collection on every write that goes through the client
+    app.answer_cache = None
+    if settings.ANSWER_CACHE_ENABLED:
+        app.answer_cache = AnswerCache(
+            similarity_threshold=settings.ANSWER_CACHE_SIMILARITY_THRESHOLD,
+            max_entries=settings.ANSWER_CACHE_MAX_ENTRIES,
+            ttl=settings.ANSWER_CACHE_TTL,
+            chars_per_token=settings.EMBEDDING_BATCH_CHARS_PER_TOKEN,
+        )
+        app.vectordb_client = CollectionChangeNotifier(
+            client=app.vectordb_client,
+            on_change=app.answer_cache.invalidate,
+        )
+
+    # optional cross-encoder re-rank of the vector search candidates
+    app.reranker = None
+    if settings.RERANK_ENABLED:
+        app.reranker = CrossEncoderReranker(
+            model_id=settings.RERANK_MODEL_ID,
+            batch_size=settings.RERANK_BATCH_SIZE,
+            max_workers=settings.RERANK_MAX_WORKERS,
+            max_length=settings.RERANK_MAX_LENGTH,
+        )
+
     app.template_parser = TemplateParser(
         language=settings.PRIMARY_LANG,
         default_language=settings.DEFAULT_LANG,
     )
 
+    # file parsing pool, spawned so workers don't inherit loaded models and event loop state
+    app.process_pool = None
+    if settings.PROCESSING_MAX_WORKERS > 0:
+        app.process_pool = ProcessPoolExecutor(
+            max_workers=settings.PROCESSING_MAX_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+
+    # background process/index jobs
+    app.job_controller = JobController(
+        db_client=app.db_client,
+        vectordb_client=app.vectordb_client,
+        generation_client=app.generation_client,
+        embedding_client=app.embedding_client,
+        template_parser=app.template_parser,
+        process_pool=app.process_pool,
+    )
+    await app.job_controller.start()
+
 
 async def shutdown_span():
-    app.db_engine.dispose()
+    await app.job_controller.stop()
+    await app.embedding_client.close()
+    await app.db_engine.dispose()
     await app.vectordb_client.disconnect()
 
+    if app.process_pool:
+        app.process_pool.shutdown(wait=False, cancel_futures=True)
+
+    if app.reranker:
+        app.reranker.shutdown()
+
 app.on_event("startup")(startup_span)
 app.on_event("shutdown")(shutdown_span)
 
 app.include_router(base.base_router)
 app.include_router(data.data_router)
-app.include_router(nlp.nlp_router)
\ No newline at end of file
+app.include_router(nlp.nlp_router)
+app.include_router(jobs.jobs_router)
\ No newline at end of file
@@ -0,0 +1,66 @@
+from helpers.config import get_settings
+from stores.vectordb.VectorDBProviderFactory import VectorDBProviderFactory
+from stores.vectordb.VectorDBEnums import VectorDBEnums, PgVectorLayoutEnums
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+import argparse
+import asyncio
+import logging
+
+logger = logging.getLogger("uvicorn")
+
+# Moves standalone pgvector collection tables (collection_<size>_<project_id>) into their
+# partition of the shared collection_<size> table. Run from src with VECTOR_DB_PGVEC_LAYOUT=partitioned:
+#   python migrate_vectordb_layout.py [--dry-run] [collection_name ...]
+# Collections keep their names, so the app can keep serving while each one is moved.
+
+async def migrate(collection_names: list, dry_run: bool = False):
+    settings = get_settings()
+
+    if settings.VECTOR_DB_BACKEND != VectorDBEnums.PGVECTOR.value:
+        raise SystemExit("Only the PGVECTOR backend has a partitioned layout")
+
+    if settings.VECTOR_DB_PGVEC_LAYOUT != PgVectorLayoutEnums.PARTITIONED.value:
+        raise SystemExit("Set VECTOR_DB_PGVEC_LAYOUT=partitioned before migrating")
+
+    postgres_conn = f"postgresql+asyncpg://{settings.POSTGRES_USERNAME}:{settings.POSTGRES_PASSWORD}@{settings.POSTGRES_HOST}:{settings.POSTGRES_PORT}/{settings.POSTGRES_MAIN_DATABASE}"
+
+    db_engine = create_async_engine(postgres_conn)
+    db_client = sessionmaker(
+        db_engine, class_=AsyncSession, expire_on_commit=False
+    )
+
+    vectordb_client = VectorDBProviderFactory(config=settings, db_client=db_client).create(
+        provider=settings.VECTOR_DB_BACKEND
+    )
+    await vectordb_client.connect()
+
+    try:
+        unpartitioned_collections = await vectordb_client.list_unpartitioned_collections()
+        if collection_names:
+            unpartitioned_collections = [ c for c in unpartitioned_collections if c in collection_names ]
+
+        logger.info(f"{len(unpartitioned_collections)} collections to migrate")
+
+        for collection_name in unpartitioned_collections:
+            if dry_run:
+                logger.info(f"Would migrate: {collection_name}")
+                continue
+
+            records_count = await vectordb_client.migrate_collection_to_partition(collection_name=collection_name)
+            if records_count is None:
+                logger.warning(f"Skipped: {collection_name}")
+    finally:
+        await vectordb_client.disconnect()
+        await db_engine.dispose()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description="Move pgvector collection tables into the partitioned layout")
+    parser.add_argument("collection_names", nargs="*", help="only migrate these collections")
+    parser.add_argument("--dry-run", action="store_true", help="list the collections that would be migrated")
+    args = parser.parse_args()
+
+    asyncio.run(migrate(collection_names=args.collection_names, dry_run=args.dry_run))
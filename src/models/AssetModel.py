@@ -35,6 +35,30 @@ class AssetModel(BaseDataModel):
             records = result.scalars().all()
         return records
 
+    async def update_asset_config(self, asset_id: int, asset_config: dict):
+
+        async with self.db_client() as session:
+            async with session.begin():
+                asset = await session.get(Asset, asset_id)
+                if asset is None:
+                    return None
+
+                # reassign so the JSONB column is flagged as modified
+                asset.asset_config = { **(asset.asset_config or {}), **asset_config }
+            await session.refresh(asset)
+        return asset
+
+    async def get_assets_by_ids(self, asset_project_id: str, asset_ids: list):
+
+        async with self.db_client() as session:
+            stmt = select(Asset).where(Asset.asset_id.in_(asset_ids))
+            # asset ids are global, federated searches look them up across projects
+            if asset_project_id is not None:
+                stmt = stmt.where(Asset.asset_project_id == asset_project_id)
+            result = await session.execute(stmt)
+            records = result.scalars().all()
+        return records
+
     async def get_asset_record(self, asset_project_id: str, asset_name: str):
 
         async with self.db_client() as session:
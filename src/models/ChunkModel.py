@@ -50,17 +50,71 @@ class ChunkModel(BaseDataModel):
             await session.commit()
         return result.rowcount
     
+    async def delete_chunks_by_asset_id(self, asset_id: int, created_after=None):
+        async with self.db_client() as session:
+            stmt = delete(DataChunk).where(DataChunk.chunk_asset_id == asset_id)
+            if created_after is not None:
+                stmt = stmt.where(DataChunk.created_at >= created_after)
+            result = await session.execute(stmt)
+            await session.commit()
+        return result.rowcount
+    
+    async def get_asset_chunks_hashes(self, asset_id: int):
+        async with self.db_client() as session:
+            stmt = select(DataChunk.chunk_id, DataChunk.chunk_hash).where(
+                DataChunk.chunk_asset_id == asset_id
+            ).order_by(DataChunk.chunk_id)
+            result = await session.execute(stmt)
+            records = result.all()
+        return records
+
+    async def delete_chunks_by_ids(self, chunks_ids: list, batch_size: int=1000):
+        deleted_count = 0
+        async with self.db_client() as session:
+            async with session.begin():
+                for i in range(0, len(chunks_ids), batch_size):
+                    stmt = delete(DataChunk).where(DataChunk.chunk_id.in_(chunks_ids[i:i+batch_size]))
+                    result = await session.execute(stmt)
+                    deleted_count += result.rowcount
+        return deleted_count
+
     async def get_poject_chunks(self, project_id: ObjectId, page_no: int=1, page_size: int=50):
         async with self.db_client() as session:
-            stmt = select(DataChunk).where(DataChunk.chunk_project_id == project_id).offset((page_no - 1) * page_size).limit(page_size)
+            stmt = select(DataChunk).where(DataChunk.chunk_project_id == project_id).order_by(DataChunk.chunk_id).offset((page_no - 1) * page_size).limit(page_size)
             result = await session.execute(stmt)
             records = result.scalars().all()
         return records
+
+    async def iter_project_chunks(self, project_id: ObjectId, page_size: int=None, after_chunk_id: int=0):
+        # keyset pagination: every page is an index range scan on the primary key,
+        # so reading the whole project stays linear in the number of chunks
+        page_size = page_size if page_size else self.app_setting.INDEX_CHUNKS_PAGE_SIZE
+        last_chunk_id = after_chunk_id
+
+        while True:
+            async with self.db_client() as session:
+                stmt = select(DataChunk).where(
+                    DataChunk.chunk_project_id == project_id,
+                    DataChunk.chunk_id > last_chunk_id
+                ).order_by(DataChunk.chunk_id).limit(page_size)
+                result = await session.execute(stmt)
+                records = result.scalars().all()
+
+            if len(records) == 0:
+                break
+
+            last_chunk_id = records[-1].chunk_id
+            yield records
+
+            if len(records) < page_size:
+                break
     
-    async def get_total_chunks_count(self, project_id: ObjectId):
+    async def get_total_chunks_count(self, project_id: ObjectId, max_chunk_id: int = None):
         total_count = 0
         async with self.db_client() as session:
             count_sql = select(func.count(DataChunk.chunk_id)).where(DataChunk.chunk_project_id == project_id)
+            if max_chunk_id is not None:
+                count_sql = count_sql.where(DataChunk.chunk_id <= max_chunk_id)
             records_count = await session.execute(count_sql)
             total_count = records_count.scalar()
         
@@ -0,0 +1,90 @@
+from .BaseDataModel import BaseDataModel
+from .db_schemas import EmbeddingCache
+from sqlalchemy.future import select
+from sqlalchemy import func, delete, update
+from sqlalchemy.dialects.postgresql import insert
+import numpy as np
+
+class EmbeddingCacheModel(BaseDataModel):
+
+    def __init__(self, db_client: object):
+        super().__init__(db_client=db_client)
+        self.db_client = db_client
+
+    @classmethod
+    async def create_instance(cls, db_client: object):
+        instance = cls(db_client)
+        return instance
+
+    async def get_vectors(self, cache_keys: list):
+
+        if len(cache_keys) == 0:
+            return {}
+
+        async with self.db_client() as session:
+            async with session.begin():
+                stmt = select(EmbeddingCache.cache_key, EmbeddingCache.cache_vector).where(
+                    EmbeddingCache.cache_key.in_(cache_keys)
+                )
+                result = await session.execute(stmt)
+                records = result.all()
+
+                if len(records):
+                    # keep recently used entries away from eviction
+                    await session.execute(
+                        update(EmbeddingCache)
+                        .where(EmbeddingCache.cache_key.in_([ r.cache_key for r in records ]))
+                        .values(last_accessed_at=func.now())
+                    )
+
+        return {
+            record.cache_key: np.frombuffer(record.cache_vector, dtype="<f4").tolist()
+            for record in records
+        }
+
+    async def insert_vectors(self, entries: list):
+
+        if len(entries) == 0:
+            return 0
+
+        values = [
+            {
+                "cache_key": entry["cache_key"],
+                "cache_provider": entry["cache_provider"],
+                "cache_model_id": entry["cache_model_id"],
+                "cache_document_type": entry["cache_document_type"],
+                "cache_text_hash": entry["cache_text_hash"],
+                "cache_vector": np.asarray(entry["cache_vector"], dtype="<f4").tobytes(),
+                "cache_vector_size": len(entry["cache_vector"]),
+            }
+            for entry in entries
+        ]
+
+        async with self.db_client() as session:
+            async with session.begin():
+                stmt = insert(EmbeddingCache).values(values).on_conflict_do_nothing(
+                    index_elements=[EmbeddingCache.cache_key]
+                )
+                result = await session.execute(stmt)
+
+        return result.rowcount
+
+    async def get_total_entries_count(self):
+        async with self.db_client() as session:
+            result = await session.execute(select(func.count(EmbeddingCache.cache_key)))
+            total_count = result.scalar()
+
+        return total_count
+
+    async def evict_entries(self, max_entries: int):
+        # drop the least recently used entries beyond max_entries
+        async with self.db_client() as session:
+            async with session.begin():
+                keep_keys = select(EmbeddingCache.cache_key).order_by(
+                    EmbeddingCache.last_accessed_at.desc()
+                ).limit(max_entries)
+
+                stmt = delete(EmbeddingCache).where(EmbeddingCache.cache_key.not_in(keep_keys))
+                result = await session.execute(stmt)
+
+        return result.rowcount
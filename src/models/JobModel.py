@@ -0,0 +1,71 @@
+from .BaseDataModel import BaseDataModel
+from .db_schemas import Job
+from .enums.JobEnums import JobStatusEnum
+from sqlalchemy.future import select
+from sqlalchemy import func, update, or_, and_
+from datetime import datetime, timedelta, timezone
+
+class JobModel(BaseDataModel):
+
+    def __init__(self, db_client: object):
+        super().__init__(db_client=db_client)
+        self.db_client = db_client
+
+    @classmethod
+    async def create_instance(cls, db_client: object):
+        instance = cls(db_client)
+        return instance
+
+    async def create_job(self, job: Job):
+
+        async with self.db_client() as session:
+            async with session.begin():
+                session.add(job)
+            await session.commit()
+            await session.refresh(job)
+        return job
+
+    async def get_job(self, job_id: int):
+
+        async with self.db_client() as session:
+            result = await session.execute(select(Job).where(Job.job_id == job_id))
+            job = result.scalar_one_or_none()
+        return job
+
+    async def claim_next_job(self, stale_after_seconds: int):
+        # queued jobs, or running jobs whose worker stopped sending heartbeats;
+        # SKIP LOCKED lets every app worker poll the same table safely
+        stale_before = datetime.now(timezone.utc) - timedelta(seconds=stale_after_seconds)
+
+        async with self.db_client() as session:
+            async with session.begin():
+                stmt = select(Job).where(
+                    or_(
+                        Job.job_status == JobStatusEnum.QUEUED.value,
+                        and_(
+                            Job.job_status == JobStatusEnum.RUNNING.value,
+                            Job.job_heartbeat_at < stale_before
+                        )
+                    )
+                ).order_by(Job.job_id).limit(1).with_for_update(skip_locked=True)
+
+                result = await session.execute(stmt)
+                job = result.scalar_one_or_none()
+                if job is None:
+                    return None
+
+                job.job_status = JobStatusEnum.RUNNING.value
+                job.job_attempts += 1
+                job.job_run_processed = job.job_processed
+                job.job_run_started_at = func.now()
+                job.job_heartbeat_at = func.now()
+
+            await session.refresh(job)
+        return job
+
+    async def update_job(self, job_id: int, **values):
+
+        async with self.db_client() as session:
+            async with session.begin():
+                stmt = update(Job).where(Job.job_id == job_id).values(job_heartbeat_at=func.now(), **values)
+                await session.execute(stmt)
@@ -40,6 +40,15 @@ class ProjectModel(BaseDataModel):
                 else:
                     return project
 
+    async def get_projects_by_ids(self, project_ids: list):
+        async with self.db_client() as session:
+            async with session.begin():
+                query = select(Project).where(Project.project_id.in_(project_ids))
+                result = await session.execute(query)
+                projects = result.scalars().all()
+
+        return projects
+
     async def get_all_projects(self, page: int=1, page_size: int=10):
 
         async with self.db_client() as session:
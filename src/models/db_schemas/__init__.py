@@ -1 +1 @@
-from models.db_schemas.misrlex.schemas import Asset, DataChunk, Project, RetrievedDocument, SQLAlchemyBase
\ No newline at end of file
+from models.db_schemas.misrlex.schemas import Asset, DataChunk, Project, RetrievedDocument, SQLAlchemyBase, EmbeddingCache, Job
\ No newline at end of file
@@ -4,6 +4,7 @@ from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy import Index
 from pydantic import BaseModel
+from typing import Optional
 
 
 class DataChunk(SQLAlchemyBase):
@@ -16,6 +17,8 @@ class DataChunk(SQLAlchemyBase):
     chunk_text = Column(String, nullable=False)
     chunk_metadata = Column(JSONB, nullable=True)
     chunk_order = Column(Integer, nullable=False)
+    # sha256 of chunk_text, lets re-processing keep unchanged chunks and their vectors
+    chunk_hash = Column(String(64), nullable=True)
 
     chunk_project_id = Column(Integer, ForeignKey("projects.project_id"), nullable=False)
     chunk_asset_id = Column(Integer, ForeignKey("assets.asset_id"), nullable=False)
@@ -29,8 +32,15 @@ class DataChunk(SQLAlchemyBase):
     __table_args__ = (
         Index('ix_chunk_project_id', chunk_project_id),
         Index('ix_chunk_asset_id', chunk_asset_id),
+        Index('ix_chunk_project_id_chunk_id', chunk_project_id, chunk_id),
     )
 
 class RetrievedDocument(BaseModel):
     text: str
-    score: float
\ No newline at end of file
+    score: float
+    chunk_id: Optional[int] = None
+    asset_id: Optional[int] = None
+    metadata: Optional[dict] = None
+    project_id: Optional[int] = None
+    # vector search score when score holds the re-rank score
+    retrieval_score: Optional[float] = None
\ No newline at end of file
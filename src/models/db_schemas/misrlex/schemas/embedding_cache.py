@@ -0,0 +1,27 @@
+from .misrlex_base import SQLAlchemyBase
+from sqlalchemy import Column, Integer, DateTime, func, String, LargeBinary
+from sqlalchemy import Index
+
+
+class EmbeddingCache(SQLAlchemyBase):
+
+    __tablename__ = "embedding_cache"
+
+    # sha256 over (provider, model id, document type, sha256 of the processed text)
+    cache_key = Column(String(64), primary_key=True)
+
+    cache_provider = Column(String, nullable=False)
+    cache_model_id = Column(String, nullable=False)
+    cache_document_type = Column(String, nullable=False)
+    cache_text_hash = Column(String(64), nullable=False)
+
+    # float32 little-endian bytes
+    cache_vector = Column(LargeBinary, nullable=False)
+    cache_vector_size = Column(Integer, nullable=False)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    last_accessed_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index('ix_embedding_cache_last_accessed_at', last_accessed_at),
+    )
@@ -0,0 +1,37 @@
+from .misrlex_base import SQLAlchemyBase
+from sqlalchemy import Column, Integer, DateTime, func, String, ForeignKey
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import Index
+
+
+class Job(SQLAlchemyBase):
+
+    __tablename__ = "jobs"
+
+    job_id = Column(Integer, primary_key=True, autoincrement=True)
+
+    job_type = Column(String, nullable=False)
+    job_status = Column(String, nullable=False)
+    job_params = Column(JSONB, nullable=True)
+    job_project_id = Column(Integer, ForeignKey("projects.project_id"), nullable=False)
+
+    # last committed unit of work, a resumed job continues from here
+    job_checkpoint = Column(JSONB, nullable=True)
+    job_processed = Column(Integer, nullable=False, default=0)
+    job_total = Column(Integer, nullable=True)
+    job_error = Column(String, nullable=True)
+    job_attempts = Column(Integer, nullable=False, default=0)
+
+    # job_processed when the current run started, used for throughput and ETA
+    job_run_processed = Column(Integer, nullable=False, default=0)
+    job_run_started_at = Column(DateTime(timezone=True), nullable=True)
+    job_heartbeat_at = Column(DateTime(timezone=True), nullable=True)
+    job_finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now(), nullable=True)
+
+    __table_args__ = (
+        Index('ix_job_status', job_status),
+        Index('ix_job_project_id', job_project_id),
+    )
@@ -21,7 +21,24 @@ class ResponseSignal(Enum):
     VECTORDB_COLLECTION_RETRIEVED = "vectordb_collection_retrieved"
     VECTORDB_SEARCH_ERROR = "vectordb_search_error"
     VECTORDB_SEARCH_SUCCESS = "vectordb_search_success"
+    VECTORDB_INVALID_FILTER_ERROR = "vectordb_invalid_filter_error"
+    VECTORDB_FEDERATED_SEARCH_TOO_MANY_PROJECTS = "vectordb_federated_search_too_many_projects"
+    VECTORDB_INDEX_CONFIG_RETRIEVED = "vectordb_index_config_retrieved"
+    VECTORDB_INDEX_CONFIG_UPDATED = "vectordb_index_config_updated"
+    VECTORDB_INDEX_CONFIG_ERROR = "vectordb_index_config_error"
+    VECTORDB_INDEX_BUILD_PROGRESS_RETRIEVED = "vectordb_index_build_progress_retrieved"
+    VECTORDB_QUANTIZATION_EVALUATED = "vectordb_quantization_evaluated"
+    VECTORDB_QUANTIZATION_EVALUATION_ERROR = "vectordb_quantization_evaluation_error"
     
     RAG_ANSWER_ERROR = "rag_answer_error"
     RAG_ANSWER_SUCCESS = "rag_answer_success"
+
+    EMBEDDING_CACHE_STATS_RETRIEVED = "embedding_cache_stats_retrieved"
+    EMBEDDING_CACHE_DISABLED = "embedding_cache_disabled"
+    ANSWER_CACHE_STATS_RETRIEVED = "answer_cache_stats_retrieved"
+    ANSWER_CACHE_DISABLED = "answer_cache_disabled"
+
+    JOB_SUBMITTED = "job_submitted"
+    JOB_RETRIEVED = "job_retrieved"
+    JOB_NOT_FOUND_ERROR = "job_not_found"
     
\ No newline at end of file
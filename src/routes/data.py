@@ -13,6 +13,8 @@ from models.AssetModel import AssetModel
 from models.db_schemas import DataChunk, Asset
 from models.enums.AssetTypeEnum import AssetTypeEnum
 from controllers import NLPController
+from helpers.database import get_db_client
+from sqlalchemy.orm import sessionmaker
 
 logger = logging.getLogger('uvicorn.error')
 
@@ -23,11 +25,12 @@ data_router = APIRouter(
 
 @data_router.post("/upload/{project_id}")
 async def upload_data(request: Request, project_id: int, file: UploadFile,
-                      app_settings: Settings = Depends(get_settings)):
+                      app_settings: Settings = Depends(get_settings),
+                      db_client: sessionmaker = Depends(get_db_client)):
         
     
     project_model = await ProjectModel.create_instance(
-        db_client=request.app.db_client
+        db_client=db_client
     )
 
     project = await project_model.get_project_or_create_one(
@@ -70,7 +73,7 @@ async def upload_data(request: Request, project_id: int, file: UploadFile,
 
     # store the assets into the database
     asset_model = await AssetModel.create_instance(
-        db_client=request.app.db_client
+        db_client=db_client
     )
 
     asset_resource = Asset(
@@ -90,14 +93,17 @@ async def upload_data(request: Request, project_id: int, file: UploadFile,
         )
 
 @data_router.post("/process/{project_id}")
-async def process_endpoint(request: Request, project_id: int, process_request: ProcessRequest):
+async def process_endpoint(request: Request, project_id: int, process_request: ProcessRequest,
+                           app_settings: Settings = Depends(get_settings),
+                           db_client: sessionmaker = Depends(get_db_client)):
 
     chunk_size = process_request.chunk_size
     overlap_size = process_request.overlap_size
     do_reset = process_request.do_reset
+    do_incremental = process_request.do_incremental
 
     project_model = await ProjectModel.create_instance(
-        db_client=request.app.db_client
+        db_client=db_client
     )
 
     project = await project_model.get_project_or_create_one(
@@ -112,7 +118,7 @@ async def process_endpoint(request: Request, project_id: int, process_request: P
     )
 
     asset_model = await AssetModel.create_instance(
-            db_client=request.app.db_client
+            db_client=db_client
         )
 
     project_files_ids = {}
@@ -133,6 +139,9 @@ async def process_endpoint(request: Request, project_id: int, process_request: P
         project_files_ids = {
             asset_record.asset_id: asset_record.asset_name
         }
+        project_assets = {
+            asset_record.asset_id: asset_record
+        }
     
     else:
         
@@ -146,6 +155,10 @@ async def process_endpoint(request: Request, project_id: int, process_request: P
             record.asset_id: record.asset_name
             for record in project_files
         }
+        project_assets = {
+            record.asset_id: record
+            for record in project_files
+        }
 
     if len(project_files_ids) == 0:
         return JSONResponse(
@@ -159,9 +172,11 @@ async def process_endpoint(request: Request, project_id: int, process_request: P
 
     no_records = 0
     no_files = 0
+    no_skipped_files = 0
+    no_deleted_records = 0
 
     chunk_model = await ChunkModel.create_instance(
-                        db_client=request.app.db_client
+                        db_client=db_client
                     )
 
     if do_reset == 1:
@@ -174,47 +189,85 @@ async def process_endpoint(request: Request, project_id: int, process_request: P
             project_id=project.project_id
         )
 
-    for asset_id, file_id in project_files_ids.items():
-
-        file_content = process_controller.get_file_content(file_id=file_id)
-
-        if file_content is None:
-            logger.error(f"Error while processing file: {file_id}")
+    # remember what each file was chunked from, so incremental runs can skip it
+    processing_signatures = {}
+    for asset_id, file_id in list(project_files_ids.items()):
+
+        if not process_controller.is_file_existed(file_id=file_id):
+            if do_incremental == 1:
+                # file removed, drop its chunks and vectors
+                no_deleted_records += await process_controller.remove_asset_chunks(
+                    asset_id=asset_id, chunk_model=chunk_model,
+                    nlp_controller=nlp_controller, project=project
+                )
+                _ = await asset_model.update_asset_config(asset_id=asset_id, asset_config={"processing": None})
+                del project_files_ids[asset_id]
             continue
 
-        file_chunks = process_controller.process_file_content(
-            file_content=file_content,
-            file_id=file_id,
-            chunk_size=chunk_size,
-            overlap_size=overlap_size
+        processing_signatures[asset_id] = await process_controller.get_processing_signature(
+            file_id=file_id, chunk_size=chunk_size, overlap_size=overlap_size
         )
 
-        if file_chunks is None or len(file_chunks) == 0:
-            return JSONResponse(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                content={
-                    "signal": ResponseSignal.PROCESSING_FAILED.value
-                }
-            )
+        if do_incremental == 1 and process_controller.is_asset_unchanged(
+            asset=project_assets[asset_id], signature=processing_signatures[asset_id]
+        ):
+            del project_files_ids[asset_id]
+            no_skipped_files += 1
+
+    files_chunks = process_controller.iter_files_chunks(
+        files=project_files_ids,
+        chunk_size=chunk_size,
+        overlap_size=overlap_size,
+        executor=request.app.process_pool,
+        max_pending=app_settings.PROCESSING_MAX_PENDING_FILES,
+    )
 
-        file_chunks_records = [
-            DataChunk(
-                chunk_text=chunk.page_content,
-                chunk_metadata=chunk.metadata,
-                chunk_order=i+1,
-                chunk_project_id=project.project_id,
-                chunk_asset_id=asset_id
+    try:
+        async for asset_id, file_id, file_chunks in files_chunks:
+
+            if file_chunks is None:
+                logger.error(f"Error while processing file: {file_id}")
+                continue
+
+            if len(file_chunks) == 0:
+                return JSONResponse(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    content={
+                        "signal": ResponseSignal.PROCESSING_FAILED.value
+                    }
+                )
+
+            file_chunks_records = process_controller.build_chunks_records(
+                file_chunks=file_chunks,
+                project_id=project.project_id,
+                asset_id=asset_id
             )
-            for i, chunk in enumerate(file_chunks)
-        ]
 
-        no_records += await chunk_model.insert_many_chunks(chunks=file_chunks_records)
-        no_files += 1
+            if do_incremental == 1:
+                inserted_count, deleted_count = await process_controller.sync_asset_chunks(
+                    asset_id=asset_id, chunks_records=file_chunks_records,
+                    chunk_model=chunk_model, nlp_controller=nlp_controller, project=project
+                )
+                no_records += inserted_count
+                no_deleted_records += deleted_count
+            else:
+                no_records += await chunk_model.insert_many_chunks(chunks=file_chunks_records)
+
+            if asset_id in processing_signatures:
+                _ = await asset_model.update_asset_config(
+                    asset_id=asset_id, asset_config={"processing": processing_signatures[asset_id]}
+                )
+            no_files += 1
+    finally:
+        # an early return must not leave files queued in the process pool
+        await files_chunks.aclose()
 
     return JSONResponse(
         content={
             "signal": ResponseSignal.PROCESSING_SUCCESS.value,
             "inserted_chunks": no_records,
-            "processed_files": no_files
+            "processed_files": no_files,
+            "skipped_files": no_skipped_files,
+            "deleted_chunks": no_deleted_records
         }
     )
\ No newline at end of file
@@ -0,0 +1,90 @@
+from fastapi import APIRouter, Depends, status, Request
+from fastapi.responses import JSONResponse
+from routes.schemas.data import ProcessRequest
+from routes.schemas.nlp import PushRequest
+from models.ProjectModel import ProjectModel
+from models.enums.JobEnums import JobTypeEnum
+from models import ResponseSignal
+from helpers.database import get_db_client
+from sqlalchemy.orm import sessionmaker
+
+import logging
+
+logger = logging.getLogger('uvicorn.error')
+
+jobs_router = APIRouter(
+    prefix="/api/v1/jobs",
+    tags=["api_v1", "jobs"],
+)
+
+@jobs_router.post("/process/{project_id}")
+async def submit_process_job(request: Request, project_id: int, process_request: ProcessRequest,
+                             db_client: sessionmaker = Depends(get_db_client)):
+
+    project_model = await ProjectModel.create_instance(
+        db_client=db_client
+    )
+
+    project = await project_model.get_project_or_create_one(
+        project_id=project_id
+    )
+
+    job = await request.app.job_controller.submit_job(
+        job_type=JobTypeEnum.PROCESS.value,
+        project_id=project.project_id,
+        params=process_request.dict(),
+    )
+
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content={
+            "signal": ResponseSignal.JOB_SUBMITTED.value,
+            "job_id": job.job_id
+        }
+    )
+
+@jobs_router.post("/index/{project_id}")
+async def submit_index_job(request: Request, project_id: int, push_request: PushRequest,
+                           db_client: sessionmaker = Depends(get_db_client)):
+
+    project_model = await ProjectModel.create_instance(
+        db_client=db_client
+    )
+
+    project = await project_model.get_project_or_create_one(
+        project_id=project_id
+    )
+
+    job = await request.app.job_controller.submit_job(
+        job_type=JobTypeEnum.INDEX.value,
+        project_id=project.project_id,
+        params=push_request.dict(),
+    )
+
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content={
+            "signal": ResponseSignal.JOB_SUBMITTED.value,
+            "job_id": job.job_id
+        }
+    )
+
+@jobs_router.get("/{job_id}")
+async def get_job_status(request: Request, job_id: int):
+
+    job_status = await request.app.job_controller.get_job_status(job_id=job_id)
+
+    if job_status is None:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={
+                "signal": ResponseSignal.JOB_NOT_FOUND_ERROR.value
+            }
+        )
+
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.JOB_RETRIEVED.value,
+            "job": job_status
+        }
+    )
@@ -1,13 +1,18 @@
-from fastapi import FastAPI, APIRouter, status, Request
-from fastapi.responses import JSONResponse
-from routes.schemas.nlp import PushRequest, SearchRequest
+from fastapi import FastAPI, APIRouter, Depends, status, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from routes.schemas.nlp import PushRequest, SearchRequest, IndexConfigRequest, FederatedSearchRequest
 from models.ProjectModel import ProjectModel
 from models.ChunkModel import ChunkModel
+from models.AssetModel import AssetModel
 from controllers import NLPController
 from models import ResponseSignal
+from helpers.config import get_settings, Settings
+from helpers.database import get_db_client
+from sqlalchemy.orm import sessionmaker
 from tqdm.auto import tqdm
 
 import logging
+import json
 
 logger = logging.getLogger('uvicorn.error')
 
@@ -17,14 +22,15 @@ nlp_router = APIRouter(
 )
 
 @nlp_router.post("/index/push/{project_id}")
-async def index_project(request: Request, project_id: int, push_request: PushRequest):
+async def index_project(request: Request, project_id: int, push_request: PushRequest,
+                        db_client: sessionmaker = Depends(get_db_client)):
 
     project_model = await ProjectModel.create_instance(
-        db_client=request.app.db_client
+        db_client=db_client
     )
 
     chunk_model = await ChunkModel.create_instance(
-        db_client=request.app.db_client
+        db_client=db_client
     )
 
     project = await project_model.get_project_or_create_one(
@@ -46,11 +52,6 @@ async def index_project(request: Request, project_id: int, push_request: PushReq
         template_parser=request.app.template_parser,
     )
 
-    has_records = True
-    page_no = 1
-    inserted_items_count = 0
-    idx = 0
-
     # create collection if not exists
     collection_name = nlp_controller.create_collection_name(project_id=project.project_id)
 
@@ -58,40 +59,37 @@ async def index_project(request: Request, project_id: int, push_request: PushReq
         collection_name=collection_name,
         embedding_size=request.app.embedding_client.embedding_size,
         do_reset=push_request.do_reset,
+        quantization=push_request.quantization,
     )
 
+    # incremental push only indexes chunks created after the last indexed one;
+    # it commits in chunk_id order so that point is always a complete prefix
+    last_chunk_id = 0
+    if push_request.do_incremental == 1:
+        last_chunk_id = await nlp_controller.get_vector_db_last_record_id(project=project)
+
     # setup batching
     total_chunks_count = await chunk_model.get_total_chunks_count(project_id=project.project_id)
     pbar = tqdm(total=total_chunks_count, desc="Vector Indexing", position=0)
 
-    while has_records:
-        page_chunks = await chunk_model.get_poject_chunks(project_id=project.project_id, page_no=page_no)
-        if len(page_chunks):
-            page_no += 1
-        
-        if not page_chunks or len(page_chunks) == 0:
-            has_records = False
-            break
+    inserted_items_count = await nlp_controller.index_chunks_pipeline(
+        project=project,
+        chunks_pages=chunk_model.iter_project_chunks(project_id=project.project_id,
+                                                     page_size=push_request.page_size,
+                                                     after_chunk_id=last_chunk_id),
+        on_progress=pbar.update,
+        ordered=push_request.do_incremental == 1,
+        bulk_load=push_request.do_bulk_load == 1,
+    )
+    pbar.close()
 
-        chunks_ids =  [ c.chunk_id for c in page_chunks ]
-        idx += len(page_chunks)
-        
-        is_inserted = await nlp_controller.index_into_vector_db(
-            project=project,
-            chunks=page_chunks,
-            chunks_ids=chunks_ids
+    if inserted_items_count is None:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": ResponseSignal.INSERT_INTO_VECTORDB_ERROR.value
+            }
         )
-
-        if not is_inserted:
-            return JSONResponse(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                content={
-                    "signal": ResponseSignal.INSERT_INTO_VECTORDB_ERROR.value
-                }
-            )
-
-        pbar.update(len(page_chunks))
-        inserted_items_count += len(page_chunks)
         
     return JSONResponse(
         content={
@@ -101,10 +99,11 @@ async def index_project(request: Request, project_id: int, push_request: PushReq
     )
 
 @nlp_router.get("/index/info/{project_id}")
-async def get_project_index_info(request: Request, project_id: int):
+async def get_project_index_info(request: Request, project_id: int, exact: bool = False,
+                                 db_client: sessionmaker = Depends(get_db_client)):
     
     project_model = await ProjectModel.create_instance(
-        db_client=request.app.db_client
+        db_client=db_client
     )
 
     project = await project_model.get_project_or_create_one(
@@ -118,7 +117,8 @@ async def get_project_index_info(request: Request, project_id: int):
         template_parser=request.app.template_parser,
     )
 
-    collection_info = await nlp_controller.get_vector_db_collection_info(project=project)
+    # record_count is the planner estimate unless exact=true asks for a COUNT(*)
+    collection_info = await nlp_controller.get_vector_db_collection_info(project=project, exact=exact)
 
     return JSONResponse(
         content={
@@ -127,11 +127,186 @@ async def get_project_index_info(request: Request, project_id: int):
         }
     )
 
+@nlp_router.get("/index/build/{project_id}")
+async def get_index_build_progress(request: Request, project_id: int,
+                                   db_client: sessionmaker = Depends(get_db_client)):
+
+    project_model = await ProjectModel.create_instance(
+        db_client=db_client
+    )
+
+    project = await project_model.get_project_or_create_one(
+        project_id=project_id
+    )
+
+    nlp_controller = NLPController(
+        vectordb_client=request.app.vectordb_client,
+        generation_client=request.app.generation_client,
+        embedding_client=request.app.embedding_client,
+        template_parser=request.app.template_parser,
+    )
+
+    build_progress = await nlp_controller.get_vector_db_index_build_progress(project=project)
+
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.VECTORDB_INDEX_BUILD_PROGRESS_RETRIEVED.value,
+            "build_progress": build_progress
+        }
+    )
+
+@nlp_router.get("/index/quantization/{project_id}")
+async def evaluate_index_quantization(request: Request, project_id: int, sample_size: int = 20, limit: int = 10,
+                                      db_client: sessionmaker = Depends(get_db_client)):
+
+    project_model = await ProjectModel.create_instance(
+        db_client=db_client
+    )
+
+    project = await project_model.get_project_or_create_one(
+        project_id=project_id
+    )
+
+    nlp_controller = NLPController(
+        vectordb_client=request.app.vectordb_client,
+        generation_client=request.app.generation_client,
+        embedding_client=request.app.embedding_client,
+        template_parser=request.app.template_parser,
+    )
+
+    # recall of the (quantized) search path against exact search, and the vector memory saved
+    evaluation = await nlp_controller.evaluate_vector_db_quantization(project=project,
+                                                                     sample_size=sample_size,
+                                                                     limit=limit)
+
+    if evaluation is None:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": ResponseSignal.VECTORDB_QUANTIZATION_EVALUATION_ERROR.value
+            }
+        )
+
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.VECTORDB_QUANTIZATION_EVALUATED.value,
+            "evaluation": evaluation
+        }
+    )
+
+@nlp_router.get("/index/config/{project_id}")
+async def get_index_config(request: Request, project_id: int,
+                           db_client: sessionmaker = Depends(get_db_client)):
+
+    project_model = await ProjectModel.create_instance(
+        db_client=db_client
+    )
+
+    project = await project_model.get_project_or_create_one(
+        project_id=project_id
+    )
+
+    nlp_controller = NLPController(
+        vectordb_client=request.app.vectordb_client,
+        generation_client=request.app.generation_client,
+        embedding_client=request.app.embedding_client,
+        template_parser=request.app.template_parser,
+    )
+
+    index_config = await nlp_controller.get_vector_db_index_config(project=project)
+
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.VECTORDB_INDEX_CONFIG_RETRIEVED.value,
+            "index_config": index_config
+        }
+    )
+
+@nlp_router.post("/index/config/{project_id}")
+async def set_index_config(request: Request, project_id: int, index_config_request: IndexConfigRequest,
+                           db_client: sessionmaker = Depends(get_db_client)):
+
+    project_model = await ProjectModel.create_instance(
+        db_client=db_client
+    )
+
+    project = await project_model.get_project_or_create_one(
+        project_id=project_id
+    )
+
+    nlp_controller = NLPController(
+        vectordb_client=request.app.vectordb_client,
+        generation_client=request.app.generation_client,
+        embedding_client=request.app.embedding_client,
+        template_parser=request.app.template_parser,
+    )
+
+    is_updated = await nlp_controller.set_vector_db_index_config(
+        project=project,
+        index_config=index_config_request.dict(exclude_none=True)
+    )
+
+    if not is_updated:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": ResponseSignal.VECTORDB_INDEX_CONFIG_ERROR.value
+            }
+        )
+
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.VECTORDB_INDEX_CONFIG_UPDATED.value,
+            "index_config": await nlp_controller.get_vector_db_index_config(project=project)
+        }
+    )
+
+@nlp_router.get("/embedding-cache/stats")
+async def get_embedding_cache_stats(request: Request):
+
+    embedding_client = request.app.embedding_client
+    if not hasattr(embedding_client, "get_stats"):
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": ResponseSignal.EMBEDDING_CACHE_DISABLED.value
+            }
+        )
+
+    stats = embedding_client.get_stats()
+    stats["entries"] = await embedding_client.cache_model.get_total_entries_count()
+
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.EMBEDDING_CACHE_STATS_RETRIEVED.value,
+            "stats": stats
+        }
+    )
+
+@nlp_router.get("/answer-cache/stats")
+async def get_answer_cache_stats(request: Request):
+
+    if not request.app.answer_cache:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": ResponseSignal.ANSWER_CACHE_DISABLED.value
+            }
+        )
+
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.ANSWER_CACHE_STATS_RETRIEVED.value,
+            "stats": request.app.answer_cache.get_stats()
+        }
+    )
+
 @nlp_router.post("/index/search/{project_id}")
-async def search_index(request: Request, project_id: int, search_request: SearchRequest):
+async def search_index(request: Request, project_id: int, search_request: SearchRequest,
+                       db_client: sessionmaker = Depends(get_db_client)):
     
     project_model = await ProjectModel.create_instance(
-        db_client=request.app.db_client
+        db_client=db_client
     )
 
     project = await project_model.get_project_or_create_one(
@@ -143,11 +318,25 @@ async def search_index(request: Request, project_id: int, search_request: Search
         generation_client=request.app.generation_client,
         embedding_client=request.app.embedding_client,
         template_parser=request.app.template_parser,
+        reranker=request.app.reranker,
     )
 
-    results = await nlp_controller.search_vector_db_collection(
-        project=project, text=search_request.text, limit=search_request.limit
-    )
+    try:
+        results = await nlp_controller.search_vector_db_collection(
+            project=project, text=search_request.text, limit=search_request.limit,
+            mode=search_request.mode,
+            search_params={"ef_search": search_request.ef_search, "probes": search_request.probes},
+            metadata_filter=search_request.filter,
+            rerank_candidates=search_request.rerank_candidates,
+        )
+    except ValueError as e:
+        return JSONResponse(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                content={
+                    "signal": ResponseSignal.VECTORDB_INVALID_FILTER_ERROR.value,
+                    "detail": str(e)
+                }
+            )
 
     if not results:
         return JSONResponse(
@@ -156,19 +345,112 @@ async def search_index(request: Request, project_id: int, search_request: Search
                     "signal": ResponseSignal.VECTORDB_SEARCH_ERROR.value
                 }
             )
+
+    asset_model = await AssetModel.create_instance(
+        db_client=db_client
+    )
+    asset_ids = list({ result.asset_id for result in results if result.asset_id })
+    assets = await asset_model.get_assets_by_ids(asset_project_id=project.project_id, asset_ids=asset_ids) if asset_ids else []
+    assets_names = { asset.asset_id: asset.asset_name for asset in assets }
     
     return JSONResponse(
         content={
             "signal": ResponseSignal.VECTORDB_SEARCH_SUCCESS.value,
-            "results": [ result.dict()  for result in results ]
+            "results": [
+                { **result.dict(), "asset_name": assets_names.get(result.asset_id) }
+                for result in results
+            ],
+            "stage_timings": nlp_controller.stage_timings
+        }
+    )
+
+@nlp_router.post("/index/search")
+async def federated_search_index(request: Request, search_request: FederatedSearchRequest,
+                                 app_settings: Settings = Depends(get_settings),
+                                 db_client: sessionmaker = Depends(get_db_client)):
+
+    project_ids = list(dict.fromkeys(search_request.project_ids))
+    if not project_ids or len(project_ids) > app_settings.VECTOR_DB_FEDERATED_SEARCH_MAX_PROJECTS:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": ResponseSignal.VECTORDB_FEDERATED_SEARCH_TOO_MANY_PROJECTS.value,
+                "max_projects": app_settings.VECTOR_DB_FEDERATED_SEARCH_MAX_PROJECTS
+            }
+        )
+
+    project_model = await ProjectModel.create_instance(
+        db_client=db_client
+    )
+
+    # unlike the single project routes, federated search never creates projects
+    projects = await project_model.get_projects_by_ids(project_ids=project_ids)
+    missing_project_ids = set(project_ids) - { project.project_id for project in projects }
+    if missing_project_ids:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": ResponseSignal.PROJECT_NOT_FOUND_ERROR.value,
+                "project_ids": sorted(missing_project_ids)
+            }
+        )
+
+    nlp_controller = NLPController(
+        vectordb_client=request.app.vectordb_client,
+        generation_client=request.app.generation_client,
+        embedding_client=request.app.embedding_client,
+        template_parser=request.app.template_parser,
+    )
+
+    try:
+        results, failed_projects = await nlp_controller.federated_search_vector_db_collections(
+            projects=projects, text=search_request.text, limit=search_request.limit,
+            mode=search_request.mode,
+            search_params={"ef_search": search_request.ef_search, "probes": search_request.probes},
+            metadata_filter=search_request.filter,
+            timeout=search_request.timeout,
+        )
+    except ValueError as e:
+        return JSONResponse(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                content={
+                    "signal": ResponseSignal.VECTORDB_INVALID_FILTER_ERROR.value,
+                    "detail": str(e)
+                }
+            )
+
+    if results is False:
+        return JSONResponse(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                content={
+                    "signal": ResponseSignal.VECTORDB_SEARCH_ERROR.value
+                }
+            )
+
+    asset_model = await AssetModel.create_instance(
+        db_client=db_client
+    )
+    asset_ids = list({ result.asset_id for result in results if result.asset_id })
+    assets = await asset_model.get_assets_by_ids(asset_project_id=None, asset_ids=asset_ids) if asset_ids else []
+    assets_names = { asset.asset_id: asset.asset_name for asset in assets }
+
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.VECTORDB_SEARCH_SUCCESS.value,
+            "results": [
+                { **result.dict(), "asset_name": assets_names.get(result.asset_id) }
+                for result in results
+            ],
+            "failed_projects": failed_projects
         }
     )
 
 @nlp_router.post("/index/answer/{project_id}")
-async def answer_rag(request: Request, project_id: int, search_request: SearchRequest):
+async def answer_rag(request: Request, project_id: int, search_request: SearchRequest,
+                     db_client: sessionmaker = Depends(get_db_client)):
     try:
         project_model = await ProjectModel.create_instance(
-            db_client=request.app.db_client
+            db_client=db_client
         )
         project = await project_model.get_project_or_create_one(
             project_id=project_id
@@ -182,11 +464,16 @@ async def answer_rag(request: Request, project_id: int, search_request: SearchRe
             generation_client=request.app.generation_client,
             embedding_client=request.app.embedding_client,
             template_parser=template_parser,
+            answer_cache=request.app.answer_cache,
+            reranker=request.app.reranker,
         )
         answer, full_prompt, chat_history = await nlp_controller.answer_rag_question(
             project=project,
             query=search_request.text,
             limit=search_request.limit,
+            mode=search_request.mode,
+            search_params={"ef_search": search_request.ef_search, "probes": search_request.probes},
+            metadata_filter=search_request.filter,
         )
 
         print("Full prompt used for RAG:\n", full_prompt)
@@ -221,6 +508,15 @@ async def answer_rag(request: Request, project_id: int, search_request: SearchRe
             }
         )
 
+    except ValueError as e:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": ResponseSignal.VECTORDB_INVALID_FILTER_ERROR.value,
+                "detail": str(e)
+            }
+        )
+
     except Exception as e:
         print("Unhandled exception during /index/answer route:")
         import traceback
@@ -232,3 +528,89 @@ async def answer_rag(request: Request, project_id: int, search_request: SearchRe
                 "detail": str(e)
             }
         )
+
+def format_sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+@nlp_router.post("/index/answer/stream/{project_id}")
+async def stream_answer_rag(request: Request, project_id: int, search_request: SearchRequest,
+                            db_client: sessionmaker = Depends(get_db_client)):
+
+    project_model = await ProjectModel.create_instance(
+        db_client=db_client
+    )
+
+    project = await project_model.get_project_or_create_one(
+        project_id=project_id
+    )
+
+    language = search_request.language or request.app.template_parser.default_language
+    template_parser = type(request.app.template_parser)(language=language, default_language=request.app.template_parser.default_language)
+
+    nlp_controller = NLPController(
+        vectordb_client=request.app.vectordb_client,
+        generation_client=request.app.generation_client,
+        embedding_client=request.app.embedding_client,
+        template_parser=template_parser,
+        answer_cache=request.app.answer_cache,
+        reranker=request.app.reranker,
+    )
+
+    cached_answer, cache_context = await nlp_controller.lookup_rag_answer(
+        project=project, query=search_request.text, limit=search_request.limit,
+        mode=search_request.mode,
+        search_params={"ef_search": search_request.ef_search, "probes": search_request.probes},
+        metadata_filter=search_request.filter,
+    )
+    if cached_answer:
+        async def cached_event_stream():
+            yield format_sse("documents", cached_answer["documents"] or [])
+            yield format_sse("done", {
+                "signal": ResponseSignal.RAG_ANSWER_SUCCESS.value,
+                "answer": cached_answer["answer"],
+                "cached": True,
+            })
+
+        return StreamingResponse(
+            cached_event_stream(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    # retrieval runs before the stream opens, so its failures still get a regular status code
+    try:
+        retrieved_documents = await nlp_controller.search_vector_db_collection(
+            project=project, text=search_request.text, limit=search_request.limit,
+            mode=search_request.mode,
+            search_params={"ef_search": search_request.ef_search, "probes": search_request.probes},
+            metadata_filter=search_request.filter,
+        )
+    except ValueError as e:
+        return JSONResponse(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                content={
+                    "signal": ResponseSignal.VECTORDB_INVALID_FILTER_ERROR.value,
+                    "detail": str(e)
+                }
+            )
+
+    if not retrieved_documents:
+        return JSONResponse(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                content={
+                    "signal": ResponseSignal.RAG_ANSWER_ERROR.value
+                }
+            )
+
+    async def event_stream():
+        async for event, data in nlp_controller.astream_rag_answer(query=search_request.text,
+                                                                   retrieved_documents=retrieved_documents,
+                                                                   cache_context=cache_context):
+            yield format_sse(event, data)
+
+    # X-Accel-Buffering keeps nginx from holding the events back until the answer completes
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -5,4 +5,5 @@ class ProcessRequest(BaseModel):
     file_id: str = None
     chunk_size: Optional[int] = 100
     overlap_size: Optional[int] = 20
-    do_reset: Optional[int] = 0
\ No newline at end of file
+    do_reset: Optional[int] = 0
+    do_incremental: Optional[int] = 0
\ No newline at end of file
@@ -1,10 +1,37 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import Optional, List
 
 class PushRequest(BaseModel):
     do_reset: Optional[int] = 0
+    page_size: Optional[int] = None
+    do_incremental: Optional[int] = 0
+    # drop the vector index during the load and build it once at the end
+    do_bulk_load: Optional[int] = 0
+    # applies when the collection gets created: "none", "scalar" or "binary"
+    quantization: Optional[str] = None
 
 class SearchRequest(BaseModel):
     text: str
-    limit: Optional[int] = 5
-    language: Optional[str] = None
\ No newline at end of file
+    limit: Optional[int] = Field(5, ge=1, le=1000)
+    language: Optional[str] = None
+    mode: Optional[str] = "vector"
+    # ANN recall / latency knobs, unset uses the server defaults
+    ef_search: Optional[int] = Field(None, ge=1, le=1000)
+    probes: Optional[int] = Field(None, ge=1, le=32768)
+    # metadata filter, e.g. {"asset_id": 3, "page": {"$gte": 10}}
+    filter: Optional[dict] = None
+    # re-rank over-fetch, unset uses RERANK_CANDIDATES
+    rerank_candidates: Optional[int] = Field(None, ge=1, le=1000)
+
+class FederatedSearchRequest(SearchRequest):
+    project_ids: List[int]
+    # seconds per collection, unset uses VECTOR_DB_FEDERATED_SEARCH_TIMEOUT
+    timeout: Optional[float] = None
+
+class IndexConfigRequest(BaseModel):
+    index_type: Optional[str] = None
+    m: Optional[int] = Field(None, ge=2, le=100)
+    ef_construction: Optional[int] = Field(None, ge=4, le=1000)
+    lists: Optional[int] = Field(None, ge=1, le=32768)
+    quantization: Optional[str] = None
+    oversample: Optional[float] = Field(None, ge=1, le=20)
\ No newline at end of file
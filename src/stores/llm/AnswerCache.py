@@ -0,0 +1,109 @@
+from utils.metrics import ANSWER_CACHE_REQUESTS, ANSWER_CACHE_TOKENS_SAVED
+from collections import OrderedDict
+import numpy as np
+import time
+
+class AnswerCache:
+    """
+    In-memory semantic cache of RAG answers. Entries are grouped by (collection, language,
+    search scope) and matched by cosine similarity of the query embedding, so paraphrases of
+    an answered question skip retrieval and generation. Any write to a collection drops its
+    entries and bumps its version, so answers generated from older data are not stored;
+    entries also expire after ttl seconds to bound staleness from writes made by other workers.
+    """
+
+    def __init__(self, similarity_threshold: float = 0.95, max_entries: int = 256,
+                       ttl: float = 3600, chars_per_token: float = 3.0):
+        self.similarity_threshold = similarity_threshold
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.chars_per_token = chars_per_token
+
+        self.buckets = {}
+        self.versions = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.tokens_saved = 0
+        self.invalidations = 0
+
+    def get_version(self, collection_name: str) -> int:
+        return self.versions.get(collection_name, 0)
+
+    def invalidate(self, collection_name: str):
+        self.versions[collection_name] = self.get_version(collection_name) + 1
+        self.invalidations += 1
+
+        for key in [ k for k in self.buckets if k[0] == collection_name ]:
+            del self.buckets[key]
+
+    @staticmethod
+    def normalize(vector: list):
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def get(self, key: tuple, query_vector: list) -> dict:
+        bucket = self.buckets.get(key)
+
+        entry = None
+        if bucket:
+            now = time.monotonic()
+            for query in [ q for q, e in bucket.items() if e["expires_at"] < now ]:
+                del bucket[query]
+
+        if bucket:
+            queries = list(bucket.keys())
+            similarities = np.stack([ bucket[q]["vector"] for q in queries ]) @ self.normalize(query_vector)
+            best = int(np.argmax(similarities))
+            if similarities[best] >= self.similarity_threshold:
+                bucket.move_to_end(queries[best])
+                entry = bucket[queries[best]]
+
+        if entry is None:
+            self.misses += 1
+            ANSWER_CACHE_REQUESTS.labels(outcome="miss").inc()
+            return None
+
+        self.hits += 1
+        self.tokens_saved += entry["tokens"]
+        ANSWER_CACHE_REQUESTS.labels(outcome="hit").inc()
+        ANSWER_CACHE_TOKENS_SAVED.inc(entry["tokens"])
+
+        return entry
+
+    def set(self, key: tuple, query: str, query_vector: list, version: int,
+                  answer: str, full_prompt: str, chat_history: list, documents: list = None) -> bool:
+
+        # the collection changed while this answer was being generated
+        if version != self.get_version(key[0]):
+            return False
+
+        bucket = self.buckets.setdefault(key, OrderedDict())
+        bucket[query] = {
+            "vector": self.normalize(query_vector),
+            "expires_at": time.monotonic() + self.ttl,
+            "answer": answer,
+            "full_prompt": full_prompt,
+            "chat_history": chat_history,
+            "documents": documents,
+            # providers do not all report usage, estimate prompt + completion tokens
+            "tokens": int((len(full_prompt or "") + len(answer or "")) / self.chars_per_token),
+        }
+        bucket.move_to_end(query)
+
+        while len(bucket) > self.max_entries:
+            bucket.popitem(last=False)
+
+        return True
+
+    def get_stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "tokens_saved": self.tokens_saved,
+            "invalidations": self.invalidations,
+            "entries": sum(len(b) for b in self.buckets.values()),
+        }
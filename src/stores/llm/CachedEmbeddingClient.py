@@ -0,0 +1,114 @@
+from models.EmbeddingCacheModel import EmbeddingCacheModel
+from .LLMEnums import DocumentTypeEnum
+from utils.metrics import EMBEDDING_CACHE_HITS, EMBEDDING_CACHE_MISSES
+from typing import List, Union
+import hashlib
+import logging
+
+class CachedEmbeddingClient:
+    """
+    Content-addressed embedding cache in front of an LLMInterface embedding client.
+    Only async document embeddings are cached; queries are served by the in-memory
+    QueryEmbeddingClient cache, so they skip the database round-trip on the search path.
+    Everything else is delegated to the wrapped client.
+    """
+
+    def __init__(self, client, provider: str, db_client, max_entries: int = 1000000):
+        self.client = client
+        self.provider = provider
+        self.max_entries = max_entries
+
+        self.cache_model = EmbeddingCacheModel(db_client=db_client)
+
+        self.hits = 0
+        self.misses = 0
+        self.inserted_since_eviction = 0
+
+        self.logger = logging.getLogger("uvicorn")
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+    def get_text_hash(self, text: str):
+        # hash exactly what the provider receives, not every provider truncates the same way
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def get_cache_key(self, text_hash: str, document_type: str = None):
+        key_parts = [ self.provider, str(self.client.embedding_model_id), str(document_type), text_hash ]
+        return hashlib.sha256("\x1f".join(key_parts).encode("utf-8")).hexdigest()
+
+    def get_stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    async def aembed_text(self, text: Union[str, List[str]], document_type: str = None):
+
+        if document_type == DocumentTypeEnum.QUERY.value:
+            return await self.client.aembed_text(text=text, document_type=document_type)
+
+        texts = [text] if isinstance(text, str) else list(text)
+
+        text_hashes = [ self.get_text_hash(t) for t in texts ]
+        cache_keys = [ self.get_cache_key(h, document_type) for h in text_hashes ]
+
+        try:
+            vectors = await self.cache_model.get_vectors(list(set(cache_keys)))
+        except Exception as e:
+            self.logger.error(f"Embedding cache lookup failed, falling back to provider: {e}")
+            return await self.client.aembed_text(text=text, document_type=document_type)
+
+        # identical texts in one request are embedded once
+        missing = {}
+        for t, h, k in zip(texts, text_hashes, cache_keys):
+            if k not in vectors and k not in missing:
+                missing[k] = (t, h)
+
+        hits_count = sum(1 for k in cache_keys if k in vectors)
+        self.hits += hits_count
+        self.misses += len(cache_keys) - hits_count
+        EMBEDDING_CACHE_HITS.labels(provider=self.provider).inc(hits_count)
+        EMBEDDING_CACHE_MISSES.labels(provider=self.provider).inc(len(cache_keys) - hits_count)
+
+        if len(missing):
+            missing_keys = list(missing.keys())
+            new_vectors = await self.client.aembed_text(
+                text=[ missing[k][0] for k in missing_keys ],
+                document_type=document_type
+            )
+
+            if not new_vectors or len(new_vectors) != len(missing_keys):
+                return None
+
+            vectors.update(zip(missing_keys, new_vectors))
+            await self.store_vectors(missing_keys=missing_keys, missing=missing,
+                                     new_vectors=new_vectors, document_type=document_type)
+
+        return [ vectors[k] for k in cache_keys ]
+
+    async def store_vectors(self, missing_keys: list, missing: dict, new_vectors: list, document_type: str = None):
+        try:
+            inserted_count = await self.cache_model.insert_vectors([
+                {
+                    "cache_key": k,
+                    "cache_provider": self.provider,
+                    "cache_model_id": str(self.client.embedding_model_id),
+                    "cache_document_type": str(document_type),
+                    "cache_text_hash": missing[k][1],
+                    "cache_vector": v,
+                }
+                for k, v in zip(missing_keys, new_vectors)
+            ])
+
+            # evicting is a table scan, so only run it once a tenth of the budget was added
+            self.inserted_since_eviction += inserted_count
+            if self.inserted_since_eviction >= max(1, self.max_entries // 10):
+                self.inserted_since_eviction = 0
+                evicted_count = await self.cache_model.evict_entries(max_entries=self.max_entries)
+                self.logger.info(f"Embedding cache evicted {evicted_count} entries")
+
+        except Exception as e:
+            self.logger.error(f"Error while storing embeddings in cache: {e}")
@@ -0,0 +1,89 @@
+import math
+import re
+
+class ContextBuilder:
+    """
+    Packs retrieved documents into a RAG prompt under a token budget: documents are taken
+    by descending score, near-duplicates (word shingle overlap) are dropped and documents
+    that do not fit are skipped in favour of smaller ones further down. Only a document
+    that alone exceeds the budget is cut, and then at a sentence boundary.
+    """
+
+    SENTENCE_END_PATTERN = re.compile(r'(?<=[.!?؟۔:;])\s+|\n+')
+
+    def __init__(self, count_tokens=None, chars_per_token: float = 3.0,
+                       dedup_threshold: float = 0.85, shingle_size: int = 3):
+        # count_tokens(text) may return None when the model has no local tokenizer
+        self.count_tokens = count_tokens
+        self.chars_per_token = chars_per_token
+        self.dedup_threshold = dedup_threshold
+        self.shingle_size = shingle_size
+
+    def count(self, text: str) -> int:
+        tokens_count = self.count_tokens(text) if self.count_tokens else None
+        if tokens_count is None:
+            tokens_count = math.ceil(len(text) / self.chars_per_token)
+        return tokens_count
+
+    def get_shingles(self, text: str) -> set:
+        # case and punctuation do not make a chunk different
+        words = re.findall(r'\w+', text.lower())
+        if len(words) <= self.shingle_size:
+            return { " ".join(words) }
+        return { " ".join(words[i:i + self.shingle_size]) for i in range(len(words) - self.shingle_size + 1) }
+
+    def is_near_duplicate(self, shingles: set, kept_shingles: list) -> bool:
+        for other in kept_shingles:
+            union = len(shingles | other)
+            if union and len(shingles & other) / union >= self.dedup_threshold:
+                return True
+        return False
+
+    def trim_to_sentences(self, text: str, max_tokens: int) -> str:
+        trimmed = ""
+        for sentence in self.SENTENCE_END_PATTERN.split(text):
+            candidate = f"{trimmed} {sentence}".strip()
+            if self.count(candidate) > max_tokens:
+                break
+            trimmed = candidate
+        return trimmed
+
+    def build(self, documents: list, render, max_tokens: int):
+        # render(doc_num, text) formats one document prompt; returns (document prompts, stats)
+        ranked_documents = sorted(documents, key=lambda d: d.score, reverse=True)
+
+        prompts, kept_shingles = [], []
+        used_tokens, duplicates_count, skipped_count = 0, 0, 0
+        for document in ranked_documents:
+            shingles = self.get_shingles(document.text)
+            if self.is_near_duplicate(shingles, kept_shingles):
+                duplicates_count += 1
+                continue
+
+            text = document.text
+            prompt = render(len(prompts) + 1, text)
+            prompt_tokens = self.count(prompt)
+
+            if used_tokens + prompt_tokens > max_tokens and not prompts:
+                # even the best document does not fit, keep its leading sentences
+                overhead_tokens = self.count(render(1, ""))
+                text = self.trim_to_sentences(text, max_tokens - overhead_tokens)
+                prompt = render(1, text)
+                prompt_tokens = self.count(prompt)
+
+            if not text or used_tokens + prompt_tokens > max_tokens:
+                skipped_count += 1
+                continue
+
+            prompts.append(prompt)
+            kept_shingles.append(shingles)
+            used_tokens += prompt_tokens
+
+        return prompts, {
+            "documents": len(documents),
+            "packed": len(prompts),
+            "duplicates": duplicates_count,
+            "skipped": skipped_count,
+            "tokens": used_tokens,
+            "budget": max_tokens,
+        }
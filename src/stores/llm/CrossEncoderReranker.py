@@ -0,0 +1,77 @@
+from sentence_transformers import CrossEncoder
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+import asyncio
+import functools
+import logging
+
+class CrossEncoderReranker:
+    """
+    Second retrieval stage: a local cross-encoder scores (query, chunk) pairs on CPU and
+    keeps the best top_k of an over-fetched candidate list. Pairs are split into batches
+    that run concurrently on a bounded thread pool, so the event loop never blocks on
+    inference; torch releases the GIL while a batch runs.
+    """
+
+    def __init__(self, model_id: str, batch_size: int = 16, max_workers: int = 2,
+                       max_length: int = 512, device: str = "cpu"):
+        self.model_id = model_id
+        self.batch_size = batch_size
+        self.max_length = max_length
+        self.device = device
+
+        self.executor = ThreadPoolExecutor(max_workers=max_workers,
+                                           thread_name_prefix="cross-encoder-rerank")
+
+        self.logger = logging.getLogger("uvicorn")
+
+        try:
+            self.client = CrossEncoder(model_name_or_path=self.model_id, max_length=self.max_length,
+                                       device=self.device)
+            self.logger.info(f"Successfully loaded re-rank model: {self.model_id}")
+        except Exception as e:
+            self.logger.error(f"Failed to load re-rank model {self.model_id}: {e}")
+            self.client = None
+
+    def predict(self, pairs: List[tuple]) -> List[float]:
+        scores = self.client.predict(pairs, batch_size=self.batch_size,
+                                     show_progress_bar=False, convert_to_numpy=True)
+        return scores.tolist()
+
+    async def arerank(self, query: str, documents: list, top_k: int) -> list:
+        """
+        Returns the top_k documents by cross-encoder score, with the score in `score`
+        and the first stage score kept in `retrieval_score`. Falls back to the first
+        stage order when the model is not available or inference fails.
+        """
+        if not documents:
+            return documents
+
+        if not self.client:
+            self.logger.warning("Re-rank model is not loaded, keeping the vector search order")
+            return documents[:top_k]
+
+        pairs = [ (query, doc.text) for doc in documents ]
+        batches = [ pairs[i:i + self.batch_size] for i in range(0, len(pairs), self.batch_size) ]
+
+        loop = asyncio.get_running_loop()
+        try:
+            batches_scores = await asyncio.gather(*[
+                loop.run_in_executor(self.executor, functools.partial(self.predict, pairs=batch))
+                for batch in batches
+            ])
+        except Exception as e:
+            self.logger.error(f"Error while re-ranking with {self.model_id}: {e}")
+            return documents[:top_k]
+
+        scores = [ score for batch_scores in batches_scores for score in batch_scores ]
+
+        ranked = sorted(zip(scores, documents), key=lambda item: item[0], reverse=True)[:top_k]
+
+        return [
+            doc.copy(update={ "score": float(score), "retrieval_score": doc.score })
+            for score, doc in ranked
+        ]
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
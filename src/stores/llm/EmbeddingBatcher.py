@@ -0,0 +1,85 @@
+from typing import List, Union
+import asyncio
+import logging
+import math
+
+class EmbeddingBatcher:
+    """
+    Packs embedding inputs into requests that respect the provider's max items and
+    max tokens per request, and runs up to max_concurrency requests at a time.
+    Everything else is delegated to the wrapped embedding client.
+    """
+
+    def __init__(self, client, max_batch_items: int = None, max_batch_tokens: int = None,
+                       max_concurrency: int = 4, chars_per_token: float = 3.0):
+        self.client = client
+
+        self.max_batch_items = max_batch_items if max_batch_items else getattr(client, "embedding_max_batch_items", 64)
+        self.max_batch_tokens = max_batch_tokens if max_batch_tokens else getattr(client, "embedding_max_batch_tokens", 8192)
+        self.chars_per_token = chars_per_token
+
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.logger = logging.getLogger("uvicorn")
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+    def estimate_tokens(self, text: str):
+        return max(1, math.ceil(len(text) / self.chars_per_token))
+
+    def pack_batches(self, texts: List[str]) -> List[List[int]]:
+
+        batches = []
+        current_batch, current_tokens = [], 0
+
+        for idx, text in enumerate(texts):
+            text_tokens = self.estimate_tokens(text)
+
+            is_full = (
+                len(current_batch) >= self.max_batch_items or
+                current_tokens + text_tokens > self.max_batch_tokens
+            )
+
+            # a single text above the token budget still goes alone, the provider truncates it
+            if len(current_batch) and is_full:
+                batches.append(current_batch)
+                current_batch, current_tokens = [], 0
+
+            current_batch.append(idx)
+            current_tokens += text_tokens
+
+        if len(current_batch):
+            batches.append(current_batch)
+
+        return batches
+
+    async def embed_batch(self, texts: List[str], document_type: str = None):
+        async with self.semaphore:
+            return await self.client.aembed_text(text=texts, document_type=document_type)
+
+    async def aembed_text(self, text: Union[str, List[str]], document_type: str = None):
+
+        if isinstance(text, str):
+            return await self.embed_batch(texts=[text], document_type=document_type)
+
+        texts = list(text)
+        batches = self.pack_batches(texts)
+
+        if len(batches) > 1:
+            self.logger.debug(f"Embedding {len(texts)} texts in {len(batches)} batches")
+
+        results = await asyncio.gather(*[
+            self.embed_batch(texts=[ texts[i] for i in batch ], document_type=document_type)
+            for batch in batches
+        ])
+
+        vectors = [None] * len(texts)
+        for batch, batch_vectors in zip(batches, results):
+            if not batch_vectors or len(batch_vectors) != len(batch):
+                self.logger.error(f"Embedding batch of {len(batch)} texts failed")
+                return None
+
+            for i, vector in zip(batch, batch_vectors):
+                vectors[i] = vector
+
+        return vectors
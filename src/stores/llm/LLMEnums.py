@@ -38,6 +38,17 @@ class JinaAIEnums(Enum):
     DOCUMENT = "search_document"
     QUERY = "search_query"
 
+class JinaAIBackendEnums(Enum):
+    TORCH = "torch"
+    ONNX = "onnx"
+
+class JinaAIOnnxQuantizationEnums(Enum):
+    NONE = "none"
+    AVX2 = "avx2"
+    AVX512 = "avx512"
+    AVX512_VNNI = "avx512_vnni"
+    ARM64 = "arm64"
+
 class DocumentTypeEnum(Enum):
     DOCUMENT = "document"
     QUERY = "query"
\ No newline at end of file
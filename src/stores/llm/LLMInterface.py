@@ -15,10 +15,30 @@ class LLMInterface(ABC):
                             temperature: float = None):
         pass
 
+    @abstractmethod
+    def astream_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                           temperature: float = None):
+        # async generator of answer deltas, ends early (logging the error) if the provider fails
+        pass
+
     @abstractmethod
     def embed_text(self, text: str, document_type: str = None):
         pass
 
+    @abstractmethod
+    async def agenerate_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                                   temperature: float = None):
+        pass
+
+    @abstractmethod
+    async def aembed_text(self, text: str, document_type: str = None):
+        pass
+
+    @abstractmethod
+    def count_tokens(self, text: str):
+        # tokens of text for the generation model, None when there is no tokenizer for it
+        pass
+
     @abstractmethod
     def construct_prompt(self, prompt: str, role: str):
         pass
\ No newline at end of file
@@ -29,7 +29,16 @@ class LLMProviderFactory:
                 api_key = self.config.JINAAI_API_KEY,
                 default_input_max_characters=self.config.INPUT_DAFAULT_MAX_CHARACTERS,
                 default_generation_max_output_tokens=self.config.GENERATION_DAFAULT_MAX_TOKENS, 
-                default_generation_temperature=self.config.GENERATION_DAFAULT_TEMPERATURE
+                default_generation_temperature=self.config.GENERATION_DAFAULT_TEMPERATURE,
+                executor_max_workers=self.config.LOCAL_MODEL_MAX_WORKERS,
+                backend=self.config.JINAAI_BACKEND,
+                onnx_file_name=self.config.JINAAI_ONNX_FILE_NAME,
+                onnx_quantization=self.config.JINAAI_ONNX_QUANTIZATION,
+                onnx_export_dir=self.config.JINAAI_ONNX_EXPORT_DIR,
+                intra_op_threads=self.config.JINAAI_INTRA_OP_THREADS,
+                encode_batch_size=self.config.JINAAI_ENCODE_BATCH_SIZE,
+                encode_max_batch_tokens=self.config.JINAAI_ENCODE_MAX_BATCH_TOKENS,
+                chars_per_token=self.config.EMBEDDING_BATCH_CHARS_PER_TOKEN,
             )
 
         if provider == LLMEnums.HUGGINGFACE.value:  # Added HuggingFace provider
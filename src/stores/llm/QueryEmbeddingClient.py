@@ -0,0 +1,144 @@
+from .LLMEnums import DocumentTypeEnum
+from utils.metrics import QUERY_EMBEDDING_REQUESTS
+from collections import OrderedDict
+from typing import List, Union
+import asyncio
+import logging
+import time
+
+class QueryEmbeddingClient:
+    """
+    Query embedding layer in front of the embedding client:
+    an in-memory LRU + TTL cache, single-flight coalescing of identical in-flight
+    queries and a short window that merges distinct concurrent queries into one
+    provider call. Document embeddings are delegated untouched.
+    """
+
+    def __init__(self, client, cache_size: int = 1024, cache_ttl: float = 600,
+                       batch_window_ms: float = 5, max_batch_size: int = 32):
+        self.client = client
+
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self.batch_window = batch_window_ms / 1000
+        self.max_batch_size = max_batch_size
+
+        self.cache = OrderedDict()
+        self.inflight = {}
+        self.pending = []
+        self.flush_handle = None
+        # the event loop only keeps weak references to tasks
+        self.tasks = set()
+
+        self.logger = logging.getLogger("uvicorn")
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+    def get_cached(self, query: str):
+        item = self.cache.get(query)
+        if item is None:
+            return None
+
+        expires_at, vector = item
+        if expires_at < time.monotonic():
+            del self.cache[query]
+            return None
+
+        self.cache.move_to_end(query)
+        return vector
+
+    def set_cached(self, query: str, vector: list):
+        self.cache[query] = (time.monotonic() + self.cache_ttl, vector)
+        self.cache.move_to_end(query)
+
+        while len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+
+    async def aembed_text(self, text: Union[str, List[str]], document_type: str = None):
+
+        if document_type != DocumentTypeEnum.QUERY.value or not isinstance(text, str):
+            return await self.client.aembed_text(text=text, document_type=document_type)
+
+        vector = self.get_cached(text)
+        if vector is not None:
+            QUERY_EMBEDDING_REQUESTS.labels(outcome="hit").inc()
+            return [vector]
+
+        future = self.inflight.get(text)
+        if future is not None:
+            QUERY_EMBEDDING_REQUESTS.labels(outcome="coalesced").inc()
+        else:
+            QUERY_EMBEDDING_REQUESTS.labels(outcome="miss").inc()
+            future = self.enqueue(text)
+
+        # a cancelled caller must not cancel the result other callers are waiting for
+        vector = await asyncio.shield(future)
+        return [vector] if vector is not None else None
+
+    def enqueue(self, query: str):
+        loop = asyncio.get_running_loop()
+
+        future = loop.create_future()
+        self.inflight[query] = future
+        self.pending.append(query)
+
+        if len(self.pending) >= self.max_batch_size:
+            self.flush()
+        elif self.flush_handle is None:
+            self.flush_handle = loop.call_later(self.batch_window, self.flush)
+
+        return future
+
+    def flush(self):
+        if self.flush_handle is not None:
+            self.flush_handle.cancel()
+            self.flush_handle = None
+
+        queries, self.pending = self.pending, []
+        if len(queries):
+            task = asyncio.get_running_loop().create_task(self.embed_queries(queries))
+            self.tasks.add(task)
+            task.add_done_callback(self.on_task_done)
+
+    def on_task_done(self, task: asyncio.Task):
+        self.tasks.discard(task)
+
+        if not task.cancelled() and task.exception() is not None:
+            self.logger.error(f"Query embedding batch failed: {task.exception()}")
+
+    async def close(self):
+        if self.flush_handle is not None:
+            self.flush_handle.cancel()
+            self.flush_handle = None
+        self.pending = []
+
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+
+        # callers still waiting on a batch that never ran
+        for future in self.inflight.values():
+            if not future.done():
+                future.cancel()
+        self.inflight = {}
+
+    async def embed_queries(self, queries: List[str]):
+
+        vectors = None
+        try:
+            vectors = await self.client.aembed_text(text=queries,
+                                                    document_type=DocumentTypeEnum.QUERY.value)
+        except Exception as e:
+            self.logger.error(f"Error while embedding {len(queries)} queries: {e}")
+
+        if not vectors or len(vectors) != len(queries):
+            vectors = [None] * len(queries)
+
+        for query, vector in zip(queries, vectors):
+            if vector is not None:
+                self.set_cached(query, vector)
+
+            future = self.inflight.pop(query, None)
+            if future is not None and not future.done():
+                future.set_result(vector)
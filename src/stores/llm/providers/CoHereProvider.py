@@ -18,17 +18,24 @@ class CoHereProvider(LLMInterface):
         self.default_generation_temperature = default_generation_temperature
 
         self.generation_model_id = None
+        self.tokenizer_available = True
 
         self.embedding_model_id = None
         self.embedding_size = None
 
+        # per-request limits of the embed endpoint
+        self.embedding_max_batch_items = 96
+        self.embedding_max_batch_tokens = 96 * 512
+
         self.client = cohere.Client(api_key=self.api_key)
+        self.async_client = cohere.AsyncClient(api_key=self.api_key)
 
         self.enums = CoHereEnums
         self.logger = logging.getLogger(__name__)
 
     def set_generation_model(self, model_id: str):
         self.generation_model_id = model_id
+        self.tokenizer_available = True
 
     def set_embedding_model(self, model_id: str, embedding_size: int):
         self.embedding_model_id = model_id
@@ -37,6 +44,29 @@ class CoHereProvider(LLMInterface):
     def process_text(self, text: str):
         return text[:self.default_input_max_characters].strip()
 
+    def get_generation_params(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                                    temperature: float = None):
+
+        max_output_tokens = max_output_tokens if max_output_tokens else self.default_generation_max_output_tokens
+        temperature = temperature if temperature else self.default_generation_temperature
+
+        return {
+            "model": self.generation_model_id,
+            "chat_history": chat_history,
+            # the input character limit is for embedding texts, a packed context is bounded by tokens
+            "message": prompt.strip(),
+            "temperature": temperature,
+            "max_tokens": max_output_tokens,
+        }
+
+    def parse_generation_response(self, response):
+
+        if not response or not response.text:
+            self.logger.error("Error while generating text with CoHere")
+            return None
+        
+        return response.text
+
     def generate_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
                             temperature: float = None):
 
@@ -47,53 +77,123 @@ class CoHereProvider(LLMInterface):
         if not self.generation_model_id:
             self.logger.error("Generation model for CoHere was not set")
             return None
-        
-        max_output_tokens = max_output_tokens if max_output_tokens else self.default_generation_max_output_tokens
-        temperature = temperature if temperature else self.default_generation_temperature
 
         response = self.client.chat(
-            model = self.generation_model_id,
-            chat_history = chat_history,
-            message = self.process_text(prompt),
-            temperature = temperature,
-            max_tokens = max_output_tokens
+            **self.get_generation_params(prompt=prompt, chat_history=chat_history,
+                                         max_output_tokens=max_output_tokens,
+                                         temperature=temperature)
         )
 
-        if not response or not response.text:
-            self.logger.error("Error while generating text with CoHere")
+        return self.parse_generation_response(response)
+
+    async def agenerate_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                                   temperature: float = None):
+
+        if not self.async_client:
+            self.logger.error("CoHere async client was not set")
+            return None
+
+        if not self.generation_model_id:
+            self.logger.error("Generation model for CoHere was not set")
+            return None
+
+        response = await self.async_client.chat(
+            **self.get_generation_params(prompt=prompt, chat_history=chat_history,
+                                         max_output_tokens=max_output_tokens,
+                                         temperature=temperature)
+        )
+
+        return self.parse_generation_response(response)
+
+    async def astream_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                                 temperature: float = None):
+
+        if not self.async_client:
+            self.logger.error("CoHere async client was not set")
+            return
+
+        if not self.generation_model_id:
+            self.logger.error("Generation model for CoHere was not set")
+            return
+
+        try:
+            async for event in self.async_client.chat_stream(
+                **self.get_generation_params(prompt=prompt, chat_history=chat_history,
+                                             max_output_tokens=max_output_tokens,
+                                             temperature=temperature)
+            ):
+                if event.event_type == "text-generation" and event.text:
+                    yield event.text
+        except Exception as e:
+            self.logger.error(f"Error while streaming text with CoHere: {e}")
+
+    def get_embedding_params(self, text: Union[str, List[str]], document_type: str = None):
+
+        if isinstance(text, str):
+            text = [text]
+
+        input_type = CoHereEnums.DOCUMENT
+        if document_type == DocumentTypeEnum.QUERY.value:
+            input_type = CoHereEnums.QUERY
+
+        return {
+            "model": self.embedding_model_id,
+            "texts": [ self.process_text(t) for t in text ],
+            "input_type": input_type.value,
+            "embedding_types": ['float'],
+        }
+
+    def parse_embedding_response(self, response):
+
+        if not response or not response.embeddings or not response.embeddings.float:
+            self.logger.error("Error while embedding text with CoHere")
             return None
         
-        return response.text
+        return [ f for f in response.embeddings.float ]
     
     def embed_text(self, text: Union[str, List[str]], document_type: str = None):
         if not self.client:
             self.logger.error("CoHere client was not set")
             return None
         
-        if isinstance(text, str):
-            text = [text]
-        
         if not self.embedding_model_id:
             self.logger.error("Embedding model for CoHere was not set")
             return None
-        
-        input_type = CoHereEnums.DOCUMENT
-        if document_type == DocumentTypeEnum.QUERY:
-            input_type = CoHereEnums.QUERY
 
         response = self.client.embed(
-            model = self.embedding_model_id,
-            texts = [ self.process_text(t) for t in text ],
-            input_type = input_type,
-            embedding_types=['float'],
+            **self.get_embedding_params(text=text, document_type=document_type)
         )
 
-        if not response or not response.embeddings or not response.embeddings.float:
-            self.logger.error("Error while embedding text with CoHere")
+        return self.parse_embedding_response(response)
+
+    async def aembed_text(self, text: Union[str, List[str]], document_type: str = None):
+        if not self.async_client:
+            self.logger.error("CoHere async client was not set")
             return None
-        
-        return [ f for f in response.embeddings.float ]
+
+        if not self.embedding_model_id:
+            self.logger.error("Embedding model for CoHere was not set")
+            return None
+
+        response = await self.async_client.embed(
+            **self.get_embedding_params(text=text, document_type=document_type)
+        )
+
+        return self.parse_embedding_response(response)
     
+    def count_tokens(self, text: str):
+        if not self.generation_model_id or not self.tokenizer_available:
+            return None
+
+        try:
+            # offline: the model tokenizer is downloaded once and cached by the SDK
+            response = self.client.tokenize(text=text, model=self.generation_model_id, offline=True)
+            return len(response.tokens)
+        except Exception as e:
+            self.logger.warning(f"CoHere tokenizer unavailable for {self.generation_model_id}: {e}")
+            self.tokenizer_available = False
+            return None
+
     def construct_prompt(self, prompt: str, role: str):
         return {
             "role": role,
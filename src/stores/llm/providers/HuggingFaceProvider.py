@@ -1,6 +1,8 @@
 from ..LLMInterface import LLMInterface
 from ..LLMEnums import HuggingFaceEnums, DocumentTypeEnum
-from huggingface_hub import InferenceClient
+from huggingface_hub import InferenceClient, AsyncInferenceClient
+from transformers import AutoTokenizer
+import asyncio
 import logging
 from typing import List, Union
 
@@ -18,23 +20,32 @@ class HuggingFaceProvider(LLMInterface):
         self.default_generation_temperature = default_generation_temperature
 
         self.generation_model_id = None
+        self.tokenizer = None
 
         self.embedding_model_id = None
         self.embedding_size = None
 
+        # feature_extraction embeds one text per request
+        self.embedding_max_batch_items = 1
+        self.embedding_max_batch_tokens = 512
+
         self.client = InferenceClient(token=self.api_key)
+        self.async_client = AsyncInferenceClient(token=self.api_key)
 
         self.enums = HuggingFaceEnums
         self.logger = logging.getLogger(__name__)
 
     def set_generation_model(self, model_id: str):
         self.generation_model_id = model_id
+        self.tokenizer = None
 
     def set_embedding_model(self, model_id: str, embedding_size: int):
         self.embedding_model_id = model_id
         self.embedding_size = embedding_size
 
-    def process_text(self, text: str):
+    def process_text(self, text: Union[str, List[str]]):
+        if isinstance(text, list):
+            return [ t[:self.default_input_max_characters].strip() for t in text ]
         return text[:self.default_input_max_characters].strip()
 
     def generate_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
@@ -48,24 +59,11 @@ class HuggingFaceProvider(LLMInterface):
             self.logger.error("Generation model for HuggingFace was not set")
             return None
         
-        max_output_tokens = max_output_tokens if max_output_tokens else self.default_generation_max_output_tokens
-        temperature = temperature if temperature else self.default_generation_temperature
-
-        # Format chat history for HuggingFace models
-        formatted_chat = []
-        for message in chat_history:
-            formatted_chat.append(message)
-
-        # Add the current prompt
-        formatted_chat.append(self.construct_prompt(prompt=prompt, role=HuggingFaceEnums.USER.value))
-
         try:
             # Using text generation API
             response = self.client.text_generation(
-                model=self.generation_model_id,
-                prompt=self.process_text(prompt),
-                max_new_tokens=max_output_tokens,
-                temperature=temperature,
+                **self.get_generation_params(prompt=prompt, max_output_tokens=max_output_tokens,
+                                             temperature=temperature)
             )
 
             if not response:
@@ -77,6 +75,68 @@ class HuggingFaceProvider(LLMInterface):
             self.logger.error(f"Error while generating text with HuggingFace: {e}")
             return None
 
+    async def agenerate_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                                   temperature: float = None):
+
+        if not self.async_client:
+            self.logger.error("HuggingFace async client was not set")
+            return None
+
+        if not self.generation_model_id:
+            self.logger.error("Generation model for HuggingFace was not set")
+            return None
+
+        try:
+            response = await self.async_client.text_generation(
+                **self.get_generation_params(prompt=prompt, max_output_tokens=max_output_tokens,
+                                             temperature=temperature)
+            )
+
+            if not response:
+                self.logger.error("Error while generating text with HuggingFace")
+                return None
+
+            return response
+        except Exception as e:
+            self.logger.error(f"Error while generating text with HuggingFace: {e}")
+            return None
+
+    async def astream_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                                 temperature: float = None):
+
+        if not self.async_client:
+            self.logger.error("HuggingFace async client was not set")
+            return
+
+        if not self.generation_model_id:
+            self.logger.error("Generation model for HuggingFace was not set")
+            return
+
+        try:
+            stream = await self.async_client.text_generation(
+                **self.get_generation_params(prompt=prompt, max_output_tokens=max_output_tokens,
+                                             temperature=temperature),
+                stream=True,
+            )
+
+            async for token in stream:
+                if token:
+                    yield token
+        except Exception as e:
+            self.logger.error(f"Error while streaming text with HuggingFace: {e}")
+
+    def get_generation_params(self, prompt: str, max_output_tokens: int=None, temperature: float = None):
+
+        max_output_tokens = max_output_tokens if max_output_tokens else self.default_generation_max_output_tokens
+        temperature = temperature if temperature else self.default_generation_temperature
+
+        return {
+            "model": self.generation_model_id,
+            "prompt": self.process_text(prompt),
+            "max_new_tokens": max_output_tokens,
+            "temperature": temperature,
+        }
+
     def embed_text(self, text: Union[str, List[str]], document_type: str = None):
         
         if not self.client:
@@ -87,6 +147,14 @@ class HuggingFaceProvider(LLMInterface):
             self.logger.error("Embedding model for HuggingFace was not set")
             return None
         
+        if isinstance(text, list):
+            embeddings = [ self.embed_single_text(text=t) for t in text ]
+            return None if any(e is None for e in embeddings) else embeddings
+
+        return self.embed_single_text(text=text)
+
+    def embed_single_text(self, text: str):
+
         processed_text = self.process_text(text)
         try:
             # Using feature extraction API
@@ -104,6 +172,55 @@ class HuggingFaceProvider(LLMInterface):
             self.logger.error(f"Error while embedding text with HuggingFace: {e}")
             return None
 
+    async def aembed_text(self, text: Union[str, List[str]], document_type: str = None):
+
+        if not self.async_client:
+            self.logger.error("HuggingFace async client was not set")
+            return None
+
+        if not self.embedding_model_id:
+            self.logger.error("Embedding model for HuggingFace was not set")
+            return None
+
+        if isinstance(text, list):
+            embeddings = await asyncio.gather(*[ self.aembed_single_text(text=t) for t in text ])
+            return None if any(e is None for e in embeddings) else list(embeddings)
+
+        return await self.aembed_single_text(text=text)
+
+    async def aembed_single_text(self, text: str):
+
+        processed_text = self.process_text(text)
+        try:
+            embedding = await self.async_client.feature_extraction(
+                model=self.embedding_model_id,
+                text=processed_text
+            )
+
+            if embedding is None:
+                self.logger.error("Error while embedding text with HuggingFace")
+                return None
+
+            return embedding.tolist() if hasattr(embedding, 'tolist') else embedding
+        except Exception as e:
+            self.logger.error(f"Error while embedding text with HuggingFace: {e}")
+            return None
+
+    def count_tokens(self, text: str):
+        if not self.generation_model_id or self.tokenizer is False:
+            return None
+
+        if self.tokenizer is None:
+            try:
+                self.tokenizer = AutoTokenizer.from_pretrained(self.generation_model_id, token=self.api_key)
+            except Exception as e:
+                self.logger.warning(f"HuggingFace tokenizer unavailable for {self.generation_model_id}: {e}")
+                # do not retry the download on every prompt
+                self.tokenizer = False
+                return None
+
+        return len(self.tokenizer.encode(text, add_special_tokens=False))
+
     def construct_prompt(self, prompt: str, role: str):
         return {
             "role": role,
@@ -1,7 +1,12 @@
 from ..LLMInterface import LLMInterface
-from ..LLMEnums import JinaAIEnums, DocumentTypeEnum
-from sentence_transformers import SentenceTransformer
+from ..LLMEnums import JinaAIEnums, DocumentTypeEnum, JinaAIBackendEnums, JinaAIOnnxQuantizationEnums
+from sentence_transformers import SentenceTransformer, export_dynamic_quantized_onnx_model
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import functools
 import logging
+import math
+import os
 from typing import List, Union
 import numpy as np
 class JinaAIProvider(LLMInterface):
@@ -9,7 +14,16 @@ class JinaAIProvider(LLMInterface):
     def __init__(self, api_key: str = None, # API key might not be needed for local model
                        default_input_max_characters: int = 8192, # Jina v3 supports up to 8192 tokens
                        default_generation_max_output_tokens: int = 1000, # Not used for embeddings
-                       default_generation_temperature: float = 0.1): # Not used for embeddings
+                       default_generation_temperature: float = 0.1, # Not used for embeddings
+                       executor_max_workers: int = 2,
+                       backend: str = JinaAIBackendEnums.TORCH.value,
+                       onnx_file_name: str = None,
+                       onnx_quantization: str = JinaAIOnnxQuantizationEnums.NONE.value,
+                       onnx_export_dir: str = "assets/onnx_models",
+                       intra_op_threads: int = None,
+                       encode_batch_size: int = 32,
+                       encode_max_batch_tokens: int = 16384,
+                       chars_per_token: float = 3.0):
         
         self.api_key = api_key
         self.default_input_max_characters = default_input_max_characters
@@ -21,8 +35,28 @@ class JinaAIProvider(LLMInterface):
 
         self.embedding_model_id = None
         self.embedding_size = None
+
+        # local model, limits only bound the size of a single encode() call
+        self.embedding_max_batch_items = 64
+        self.embedding_max_batch_tokens = 64 * 1024
         self.client = None # Will be the SentenceTransformer model
 
+        # torch or onnx runtime (optionally int8 quantized) inference on CPU
+        self.backend = backend
+        self.onnx_file_name = onnx_file_name
+        self.onnx_quantization = onnx_quantization
+        self.onnx_export_dir = onnx_export_dir
+        self.intra_op_threads = intra_op_threads
+
+        # texts of a similar length are encoded together to cut padding
+        self.encode_batch_size = encode_batch_size
+        self.encode_max_batch_tokens = encode_max_batch_tokens
+        self.chars_per_token = chars_per_token
+
+        # the model runs locally, so async callers get a bounded pool instead of blocking the event loop
+        self.executor = ThreadPoolExecutor(max_workers=executor_max_workers,
+                                           thread_name_prefix="jinaai-embedding")
+
         self.enums = JinaAIEnums
         self.logger = logging.getLogger(__name__)
 
@@ -36,17 +70,88 @@ class JinaAIProvider(LLMInterface):
         self.embedding_size = embedding_size
         try:
             # Load the model locally
-            self.client = SentenceTransformer(model_name_or_path=self.embedding_model_id, trust_remote_code=True)
+            self.client = self.load_model(model_id=self.embedding_model_id)
             # Verify embedding dimension if possible, though SentenceTransformer handles it
             # actual_embedding_size = self.client.get_sentence_embedding_dimension()
             # if actual_embedding_size != self.embedding_size:
             #     self.logger.warning(f"Provided embedding_size {self.embedding_size} does not match model's actual size {actual_embedding_size}. Using model's size.")
             #     self.embedding_size = actual_embedding_size
-            self.logger.info(f"Successfully loaded JinaAI embedding model: {self.embedding_model_id} with embedding size: {self.embedding_size}")
+            self.logger.info(f"Successfully loaded JinaAI embedding model: {self.embedding_model_id} ({self.backend} backend) with embedding size: {self.embedding_size}")
         except Exception as e:
             self.logger.error(f"Failed to load JinaAI embedding model {self.embedding_model_id}: {e}")
             self.client = None
 
+    def load_model(self, model_id: str):
+        if self.backend == JinaAIBackendEnums.ONNX.value:
+            return self.load_onnx_model(model_id=model_id)
+
+        if self.intra_op_threads:
+            import torch
+            torch.set_num_threads(self.intra_op_threads)
+
+        return SentenceTransformer(model_name_or_path=model_id, trust_remote_code=True)
+
+    def get_onnx_model_kwargs(self, file_name: str = None):
+        import onnxruntime
+
+        session_options = onnxruntime.SessionOptions()
+        if self.intra_op_threads:
+            session_options.intra_op_num_threads = self.intra_op_threads
+
+        model_kwargs = { "provider": "CPUExecutionProvider", "session_options": session_options }
+        if file_name:
+            model_kwargs["file_name"] = file_name
+
+        return model_kwargs
+
+    def load_onnx_model(self, model_id: str):
+        # the model repo's ONNX file, or an export of the PyTorch weights when none is configured
+        model = SentenceTransformer(model_name_or_path=model_id, backend="onnx", trust_remote_code=True,
+                                    model_kwargs=self.get_onnx_model_kwargs(file_name=self.onnx_file_name))
+
+        if not self.onnx_quantization or self.onnx_quantization == JinaAIOnnxQuantizationEnums.NONE.value:
+            return model
+
+        # dynamic int8 quantization is done once per model and instruction set, then loaded from disk
+        export_dir = os.path.join(self.onnx_export_dir, model_id.replace("/", "__"))
+        file_suffix = f"qint8_{self.onnx_quantization}"
+        quantized_file_name = os.path.join("onnx", f"model_{file_suffix}.onnx")
+
+        if not os.path.exists(os.path.join(export_dir, quantized_file_name)):
+            self.logger.info(f"Quantizing {model_id} to int8 ({self.onnx_quantization}) in {export_dir}")
+            model.save_pretrained(export_dir)
+            export_dynamic_quantized_onnx_model(model, quantization_config=self.onnx_quantization,
+                                                model_name_or_path=export_dir, file_suffix=file_suffix)
+
+        return SentenceTransformer(model_name_or_path=export_dir, backend="onnx", trust_remote_code=True,
+                                   model_kwargs=self.get_onnx_model_kwargs(file_name=quantized_file_name))
+
+    def get_length_buckets(self, texts: List[str]) -> List[List[int]]:
+        # indices sorted by length and cut into batches of at most encode_batch_size texts
+        # and encode_max_batch_tokens padded tokens, so short texts share large batches
+        buckets, bucket = [], []
+        for idx in sorted(range(len(texts)), key=lambda i: len(texts[i])):
+            padded_tokens = (len(bucket) + 1) * math.ceil(len(texts[idx]) / self.chars_per_token)
+            if bucket and (len(bucket) >= self.encode_batch_size or padded_tokens > self.encode_max_batch_tokens):
+                buckets.append(bucket)
+                bucket = []
+            bucket.append(idx)
+
+        if bucket:
+            buckets.append(bucket)
+
+        return buckets
+
+    def encode_texts(self, texts: List[str]) -> list:
+        embeddings = [None] * len(texts)
+        for bucket in self.get_length_buckets(texts):
+            vectors = self.client.encode([ texts[idx] for idx in bucket ], batch_size=len(bucket),
+                                         show_progress_bar=False)
+            for idx, vector in zip(bucket, vectors):
+                embeddings[idx] = vector
+
+        return embeddings
+
     def process_text(self, text: Union[str, List[str]]) -> Union[str, List[str]]:
         if isinstance(text, str):
             return text[:self.default_input_max_characters].strip()
@@ -62,6 +167,17 @@ class JinaAIProvider(LLMInterface):
         self.logger.warning("JinaAIProvider is an embedding provider, generate_text is not applicable.")
         return None
 
+    async def agenerate_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                                   temperature: float = None):
+        return self.generate_text(prompt=prompt, chat_history=chat_history,
+                                  max_output_tokens=max_output_tokens, temperature=temperature)
+
+    async def astream_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                                 temperature: float = None):
+        self.logger.warning("JinaAIProvider is an embedding provider, astream_text is not applicable.")
+        return
+        yield
+
     def embed_text(self, text: Union[str, List[str]], document_type: str = None):
         if not self.client:
             self.logger.error("JinaAI embedding model was not set or failed to load")
@@ -73,7 +189,10 @@ class JinaAIProvider(LLMInterface):
 
         processed_text = self.process_text(text)
         try:
-            embedding = self.client.encode(processed_text)
+            if isinstance(text, str):
+                embedding = self.client.encode(processed_text)
+            else:
+                embedding = self.encode_texts(processed_text)
 
             # If it's a single string, we expect a 1D array
             if isinstance(text, str):
@@ -90,6 +209,17 @@ class JinaAIProvider(LLMInterface):
             self.logger.error(f"Error while embedding text with JinaAI: {e}")
             return None
 
+    async def aembed_text(self, text: Union[str, List[str]], document_type: str = None):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor,
+            functools.partial(self.embed_text, text=text, document_type=document_type)
+        )
+
+
+    def count_tokens(self, text: str):
+        # no generation model behind this provider
+        return None
 
     def construct_prompt(self, prompt: str, role: str):
         # Not applicable for an embedding-only provider using sentence-transformers
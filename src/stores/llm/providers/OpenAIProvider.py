@@ -1,6 +1,7 @@
 from ..LLMInterface import LLMInterface
 from ..LLMEnums import OpenAIEnums
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
+import tiktoken
 import logging
 from typing import List, Union
 
@@ -19,20 +20,31 @@ class OpenAIProvider(LLMInterface):
         self.default_generation_temperature = default_generation_temperature
 
         self.generation_model_id = None
+        self.tokenizer = None
 
         self.embedding_model_id = None
         self.embedding_size = None
 
+        # per-request limits of the embeddings endpoint
+        self.embedding_max_batch_items = 2048
+        self.embedding_max_batch_tokens = 300000
+
         self.client = OpenAI(
             api_key = self.api_key,
             base_url = self.api_url if self.api_url and len(self.api_url) else None
         )
 
+        self.async_client = AsyncOpenAI(
+            api_key = self.api_key,
+            base_url = self.api_url if self.api_url and len(self.api_url) else None
+        )
+
         self.enums = OpenAIEnums
         self.logger = logging.getLogger(__name__)
 
     def set_generation_model(self, model_id: str):
         self.generation_model_id = model_id
+        self.tokenizer = None
 
     def set_embedding_model(self, model_id: str, embedding_size: int):
         self.embedding_model_id = model_id
@@ -41,19 +53,7 @@ class OpenAIProvider(LLMInterface):
     def process_text(self, text: str):
         return text[:self.default_input_max_characters].strip()
 
-    def generate_text(self, prompt: str, chat_history: list = [], max_output_tokens: int = None,
-                  temperature: float = None):
-
-        if not self.client:
-            self.logger.error("OpenAI client was not set")
-            return None
-
-        if not self.generation_model_id:
-            self.logger.error("Generation model for OpenAI was not set")
-            return None
-
-        max_output_tokens = max_output_tokens if max_output_tokens else self.default_generation_max_output_tokens
-        temperature = temperature if temperature is not None else self.default_generation_temperature
+    def construct_chat_messages(self, prompt: str, chat_history: list = []):
 
         # Construct full chat history with system prompt
         full_chat_history = [
@@ -70,38 +70,130 @@ class OpenAIProvider(LLMInterface):
         # Include prior chat history if needed (optional)
         full_chat_history.extend(chat_history)
 
+        return full_chat_history
+
+    def get_generation_params(self, prompt: str, chat_history: list = [], max_output_tokens: int = None,
+                              temperature: float = None):
+
+        max_output_tokens = max_output_tokens if max_output_tokens else self.default_generation_max_output_tokens
+        temperature = temperature if temperature is not None else self.default_generation_temperature
+
+        full_chat_history = self.construct_chat_messages(prompt=prompt, chat_history=chat_history)
+
         # Log what we're about to send
         self.logger.info(f"Sending chat completion request with model: {self.generation_model_id}")
         self.logger.debug(f"Chat history:\n{full_chat_history}")
         self.logger.debug(f"Max tokens: {max_output_tokens}, Temperature: {temperature}")
 
+        return {
+            "model": self.generation_model_id,
+            "messages": full_chat_history,
+            "max_tokens": max_output_tokens,
+            "temperature": temperature,
+        }
+
+    def parse_generation_response(self, response):
+
+        # Log full response for debugging
+        self.logger.debug(f"OpenAI response: {response}")
+
+        if not response or not response.choices:
+            self.logger.error("No choices returned in OpenAI response.")
+            return None
+
+        message = response.choices[0].message
+        if not message or not message.content:
+            self.logger.error("Message content in OpenAI response is empty.")
+            return None
+
+        return message.content.strip()
+
+    def generate_text(self, prompt: str, chat_history: list = [], max_output_tokens: int = None,
+                  temperature: float = None):
+
+        if not self.client:
+            self.logger.error("OpenAI client was not set")
+            return None
+
+        if not self.generation_model_id:
+            self.logger.error("Generation model for OpenAI was not set")
+            return None
+
         try:
             response = self.client.chat.completions.create(
-                model=self.generation_model_id,
-                messages=full_chat_history,
-                max_tokens=max_output_tokens,
-                temperature=temperature
+                **self.get_generation_params(prompt=prompt, chat_history=chat_history,
+                                             max_output_tokens=max_output_tokens,
+                                             temperature=temperature)
             )
 
-            # Log full response for debugging
-            self.logger.debug(f"OpenAI response: {response}")
+            return self.parse_generation_response(response)
+
+        except Exception as e:
+            self.logger.exception("Exception during OpenAI chat completion")
+            return None
+
+    async def agenerate_text(self, prompt: str, chat_history: list = [], max_output_tokens: int = None,
+                             temperature: float = None):
 
-            if not response or not response.choices:
-                self.logger.error("No choices returned in OpenAI response.")
-                return None
+        if not self.async_client:
+            self.logger.error("OpenAI async client was not set")
+            return None
+
+        if not self.generation_model_id:
+            self.logger.error("Generation model for OpenAI was not set")
+            return None
 
-            message = response.choices[0].message
-            if not message or not message.content:
-                self.logger.error("Message content in OpenAI response is empty.")
-                return None
+        try:
+            response = await self.async_client.chat.completions.create(
+                **self.get_generation_params(prompt=prompt, chat_history=chat_history,
+                                             max_output_tokens=max_output_tokens,
+                                             temperature=temperature)
+            )
 
-            return message.content.strip()
+            return self.parse_generation_response(response)
 
         except Exception as e:
             self.logger.exception("Exception during OpenAI chat completion")
             return None
 
+    async def astream_text(self, prompt: str, chat_history: list = [], max_output_tokens: int = None,
+                           temperature: float = None):
+
+        if not self.async_client:
+            self.logger.error("OpenAI async client was not set")
+            return
+
+        if not self.generation_model_id:
+            self.logger.error("Generation model for OpenAI was not set")
+            return
+
+        stream = None
+        try:
+            stream = await self.async_client.chat.completions.create(
+                **self.get_generation_params(prompt=prompt, chat_history=chat_history,
+                                             max_output_tokens=max_output_tokens,
+                                             temperature=temperature),
+                stream=True,
+            )
+
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
 
+        except Exception as e:
+            self.logger.exception("Exception during OpenAI chat completion stream")
+        finally:
+            # the client may disconnect mid-answer, stop pulling tokens
+            if stream is not None:
+                await stream.close()
+
+    def parse_embedding_response(self, response):
+
+        if not response or not response.data or len(response.data) == 0 or not response.data[0].embedding:
+            self.logger.error("Error while embedding text with OpenAI")
+            return None
+
+        return [ rec.embedding for rec in response.data ]
 
     def embed_text(self, text: Union[str, List[str]], document_type: str = None):
         
@@ -121,11 +213,40 @@ class OpenAIProvider(LLMInterface):
             input = text,
         )
 
-        if not response or not response.data or len(response.data) == 0 or not response.data[0].embedding:
-            self.logger.error("Error while embedding text with OpenAI")
+        return self.parse_embedding_response(response)
+
+    async def aembed_text(self, text: Union[str, List[str]], document_type: str = None):
+
+        if not self.async_client:
+            self.logger.error("OpenAI async client was not set")
             return None
 
-        return [ rec.embedding for rec in response.data ]
+        if isinstance(text, str):
+            text = [text]
+
+        if not self.embedding_model_id:
+            self.logger.error("Embedding model for OpenAI was not set")
+            return None
+
+        response = await self.async_client.embeddings.create(
+            model = self.embedding_model_id,
+            input = text,
+        )
+
+        return self.parse_embedding_response(response)
+
+    def count_tokens(self, text: str):
+        if not self.generation_model_id:
+            return None
+
+        if self.tokenizer is None:
+            try:
+                self.tokenizer = tiktoken.encoding_for_model(self.generation_model_id)
+            except KeyError:
+                # OpenAI compatible servers (OPENAI_API_URL) host models tiktoken does not know
+                self.tokenizer = tiktoken.get_encoding("o200k_base")
+
+        return len(self.tokenizer.encode(text))
 
     def construct_prompt(self, prompt: str, role: str):
         return {
@@ -0,0 +1,27 @@
+class CollectionChangeNotifier:
+    """
+    Wraps a vector db client and calls on_change(collection_name) after every call that
+    writes to or drops a collection. Everything else is delegated to the wrapped client.
+    """
+
+    MUTATING_METHODS = ("create_collection", "delete_collection", "insert_one",
+                        "insert_many", "delete_records", "migrate_collection_to_partition")
+
+    def __init__(self, client, on_change):
+        self.client = client
+        self.on_change = on_change
+
+    def __getattr__(self, name):
+        attribute = getattr(self.client, name)
+        if name not in self.MUTATING_METHODS:
+            return attribute
+
+        async def notify_after(*args, **kwargs):
+            try:
+                return await attribute(*args, **kwargs)
+            finally:
+                collection_name = kwargs.get("collection_name", args[0] if args else None)
+                if collection_name:
+                    self.on_change(collection_name)
+
+        return notify_after
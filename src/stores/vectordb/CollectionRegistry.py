@@ -0,0 +1,47 @@
+import time
+
+class CollectionRegistry:
+    """
+    In-process cache of collection metadata (existence, embedding size, index state).
+    Only positive facts are cached, so a collection created by another worker is seen
+    on the next lookup; entries expire after ttl seconds to pick up drops made elsewhere,
+    and create/delete in this process invalidate them right away.
+    """
+
+    def __init__(self, ttl: float = 60):
+        self.ttl = ttl
+        self.collections = {}
+
+    def get(self, collection_name: str) -> dict:
+        item = self.collections.get(collection_name)
+        if item is None:
+            return None
+
+        expires_at, metadata = item
+        if expires_at < time.monotonic():
+            self.collections.pop(collection_name, None)
+            return None
+
+        return metadata
+
+    def set(self, collection_name: str, **metadata):
+        current = self.get(collection_name) or {}
+        current.update(metadata)
+        self.collections[collection_name] = (time.monotonic() + self.ttl, current)
+
+        return current
+
+    def get_field(self, collection_name: str, field: str):
+        metadata = self.get(collection_name)
+        if metadata is None:
+            return None
+
+        return metadata.get(field)
+
+    def unset_field(self, collection_name: str, field: str):
+        metadata = self.get(collection_name)
+        if metadata is not None:
+            metadata.pop(field, None)
+
+    def invalidate(self, collection_name: str):
+        self.collections.pop(collection_name, None)
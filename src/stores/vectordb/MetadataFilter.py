@@ -0,0 +1,57 @@
+import re
+from typing import List, Tuple
+
+class MetadataFilter:
+    """
+    Parses a metadata filter expression into (field, operator, value) conditions that
+    the vector db providers compile into their own predicates. Top level fields are
+    ANDed; a field maps to a value (equality) or to an operator object:
+
+        {"asset_id": 3, "page": {"$gte": 10, "$lt": 20}, "source": {"$in": ["a.pdf", "b.pdf"]}}
+    """
+
+    EQ = "$eq"
+    NE = "$ne"
+    IN = "$in"
+    GT = "$gt"
+    GTE = "$gte"
+    LT = "$lt"
+    LTE = "$lte"
+
+    RANGE_OPERATORS = [GT, GTE, LT, LTE]
+    OPERATORS = [EQ, NE, IN] + RANGE_OPERATORS
+
+    FIELD_PATTERN = re.compile(r'^[A-Za-z_][A-Za-z0-9_]{0,62}$')
+
+    @classmethod
+    def parse(cls, expression: dict) -> List[Tuple[str, str, object]]:
+        if not expression:
+            return []
+
+        if not isinstance(expression, dict):
+            raise ValueError("Filter must be an object of field conditions")
+
+        conditions = []
+        for field, condition in expression.items():
+            if not cls.FIELD_PATTERN.match(field):
+                raise ValueError(f"Invalid filter field: {field}")
+
+            if not isinstance(condition, dict):
+                condition = { cls.EQ: condition }
+
+            for operator, value in condition.items():
+                if operator not in cls.OPERATORS:
+                    raise ValueError(f"Unsupported filter operator: {operator}")
+
+                if operator == cls.IN:
+                    if not isinstance(value, list) or not value:
+                        raise ValueError(f"{cls.IN} expects a non-empty list for field: {field}")
+                elif operator in cls.RANGE_OPERATORS:
+                    if isinstance(value, bool) or not isinstance(value, (int, float)):
+                        raise ValueError(f"{operator} expects a number for field: {field}")
+                elif isinstance(value, (dict, list)):
+                    raise ValueError(f"{operator} expects a scalar value for field: {field}")
+
+                conditions.append((field, operator, value))
+
+        return conditions
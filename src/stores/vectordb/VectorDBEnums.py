@@ -7,17 +7,55 @@ class VectorDBEnums(Enum):
 class DistanceMethodEnums(Enum):
     COSINE = "cosine"
     DOT = "dot"
+    L2 = "l2"
 class PgVectorTableSchemeEnums(Enum):
     ID = "id"
     TEXT = "text"
     VECTOR = "vector"
     CHUNK_ID = "chunk_id"
     METADATA = "metadata"
+    LEXICAL = "lexical"
+    PROJECT_ID = "project_id"
     _PREFIX = "pgvector"
 class PgVectorDistanceMethodEnums(Enum):
     COSINE = "vector_cosine_ops"
-    DOT = "vector_l2_ops"
+    DOT = "vector_ip_ops"
+    L2 = "vector_l2_ops"
+    HAMMING = "bit_hamming_ops"
+
+class PgVectorDistanceOperatorEnums(Enum):
+    COSINE = "<=>"
+    DOT = "<#>"
+    L2 = "<->"
+    HAMMING = "<~>"
+
+class VectorQuantizationEnums(Enum):
+    NONE = "none"
+    SCALAR = "scalar"
+    BINARY = "binary"
 
 class PgVectorIndexTypeEnums(Enum):
     HNSW = "hnsw"
-    IVFFLAT = "ivfflat"
\ No newline at end of file
+    IVFFLAT = "ivfflat"
+
+class SearchModeEnums(Enum):
+    VECTOR = "vector"
+    HYBRID = "hybrid"
+
+class PgVectorLayoutEnums(Enum):
+    TABLE = "table"
+    PARTITIONED = "partitioned"
+
+class PgVectorInsertModeEnums(Enum):
+    INSERT = "insert"
+    COPY = "copy"
+
+class PgVectorIndexLimitEnums(Enum):
+    # ranges pgvector accepts, a build param outside them fails CREATE INDEX
+    MIN_M = 2
+    MAX_M = 100
+    MAX_EF_CONSTRUCTION = 1000
+    MIN_LISTS = 1
+    MAX_LISTS = 32768
+    MAX_EF_SEARCH = 1000
+    MAX_OVERSAMPLE = 20
\ No newline at end of file
@@ -20,7 +20,7 @@ class VectorDBInterface(ABC):
         pass
 
     @abstractmethod
-    def get_collection_info(self, collection_name: str) -> dict:
+    def get_collection_info(self, collection_name: str, exact: bool = False) -> dict:
         pass
 
     @abstractmethod
@@ -30,7 +30,8 @@ class VectorDBInterface(ABC):
     @abstractmethod
     def create_collection(self, collection_name: str, 
                                 embedding_size: int,
-                                do_reset: bool = False):
+                                do_reset: bool = False,
+                                quantization: str = None):
         pass
 
     @abstractmethod
@@ -46,6 +47,44 @@ class VectorDBInterface(ABC):
         pass
 
     @abstractmethod
-    def search_by_vector(self, collection_name: str, vector: list, limit: int):
+    def delete_records(self, collection_name: str, record_ids: list):
+        pass
+
+    @abstractmethod
+    def get_last_record_id(self, collection_name: str) -> int:
+        pass
+
+    @abstractmethod
+    def search_by_vector(self, collection_name: str, vector: list, limit: int,
+                               search_params: dict = None, metadata_filter: list = None):
+        pass
+
+    @abstractmethod
+    def search_hybrid(self, collection_name: str, vector: list, query_text: str, limit: int,
+                            search_params: dict = None, metadata_filter: list = None):
+        pass
+
+    @abstractmethod
+    def defer_vector_index(self, collection_name: str) -> bool:
+        pass
+
+    @abstractmethod
+    def build_vector_index(self, collection_name: str) -> bool:
+        pass
+
+    @abstractmethod
+    def get_index_build_progress(self, collection_name: str) -> dict:
+        pass
+
+    @abstractmethod
+    def evaluate_quantization(self, collection_name: str, sample_size: int = 20, limit: int = 10) -> dict:
+        pass
+
+    @abstractmethod
+    def get_index_config(self, collection_name: str) -> dict:
+        pass
+
+    @abstractmethod
+    def set_index_config(self, collection_name: str, index_config: dict) -> bool:
         pass
     
\ No newline at end of file
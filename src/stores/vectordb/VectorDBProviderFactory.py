@@ -18,6 +18,18 @@ class VectorDBProviderFactory:
                 distance_method=self.config.VECTOR_DB_DISTANCE_METHOD,
                 default_vector_size=self.config.EMBEDDING_MODEL_SIZE,
                 index_threshold=self.config.VECTOR_DB_PGVEC_INDEX_THRESHOLD,
+                hybrid_candidates=self.config.VECTOR_DB_HYBRID_CANDIDATES,
+                hybrid_rrf_k=self.config.VECTOR_DB_HYBRID_RRF_K,
+                url=self.config.VECTOR_DB_QDRANT_URL,
+                api_key=self.config.VECTOR_DB_QDRANT_API_KEY,
+                prefer_grpc=self.config.VECTOR_DB_QDRANT_PREFER_GRPC,
+                grpc_port=self.config.VECTOR_DB_QDRANT_GRPC_PORT,
+                upsert_batch_size=self.config.VECTOR_DB_QDRANT_UPSERT_BATCH_SIZE,
+                upsert_parallel=self.config.VECTOR_DB_QDRANT_UPSERT_PARALLEL,
+                upsert_wait=self.config.VECTOR_DB_QDRANT_UPSERT_WAIT,
+                metadata_range_fields=self.config.VECTOR_DB_METADATA_RANGE_FIELDS,
+                quantization=self.config.VECTOR_DB_QUANTIZATION,
+                quantization_oversample=self.config.VECTOR_DB_QUANTIZATION_OVERSAMPLE,
             )
         
         if provider == VectorDBEnums.PGVECTOR.value:
@@ -26,6 +38,25 @@ class VectorDBProviderFactory:
                 distance_method=self.config.VECTOR_DB_DISTANCE_METHOD,
                 default_vector_size=self.config.EMBEDDING_MODEL_SIZE,
                 index_threshold=self.config.VECTOR_DB_PGVEC_INDEX_THRESHOLD,
+                insert_mode=self.config.VECTOR_DB_PGVEC_INSERT_MODE,
+                layout=self.config.VECTOR_DB_PGVEC_LAYOUT,
+                copy_batch_size=self.config.VECTOR_DB_PGVEC_COPY_BATCH_SIZE,
+                index_type=self.config.VECTOR_DB_PGVEC_INDEX_TYPE,
+                collection_cache_ttl=self.config.VECTOR_DB_COLLECTION_CACHE_TTL,
+                metadata_range_fields=self.config.VECTOR_DB_METADATA_RANGE_FIELDS,
+                iterative_scan=self.config.VECTOR_DB_PGVEC_ITERATIVE_SCAN,
+                quantization=self.config.VECTOR_DB_QUANTIZATION,
+                quantization_oversample=self.config.VECTOR_DB_QUANTIZATION_OVERSAMPLE,
+                maintenance_work_mem=self.config.VECTOR_DB_PGVEC_MAINTENANCE_WORK_MEM,
+                maintenance_workers=self.config.VECTOR_DB_PGVEC_MAINTENANCE_WORKERS,
+                hnsw_m=self.config.VECTOR_DB_PGVEC_HNSW_M,
+                hnsw_ef_construction=self.config.VECTOR_DB_PGVEC_HNSW_EF_CONSTRUCTION,
+                hnsw_ef_search=self.config.VECTOR_DB_PGVEC_HNSW_EF_SEARCH,
+                ivfflat_lists=self.config.VECTOR_DB_PGVEC_IVFFLAT_LISTS,
+                ivfflat_probes=self.config.VECTOR_DB_PGVEC_IVFFLAT_PROBES,
+                text_search_config=self.config.VECTOR_DB_PGVEC_TEXT_SEARCH_CONFIG,
+                hybrid_candidates=self.config.VECTOR_DB_HYBRID_CANDIDATES,
+                hybrid_rrf_k=self.config.VECTOR_DB_HYBRID_RRF_K,
             )
         
         return None
\ No newline at end of file
@@ -4,7 +4,15 @@ from .VectorDBEnums import (
     DistanceMethodEnums,
     PgVectorTableSchemeEnums,
     PgVectorDistanceMethodEnums,
-    PgVectorIndexTypeEnums
+    PgVectorIndexTypeEnums,
+    PgVectorInsertModeEnums,
+    PgVectorLayoutEnums,
+    PgVectorDistanceOperatorEnums,
+    SearchModeEnums,
+    VectorQuantizationEnums
 )
+from .CollectionRegistry import CollectionRegistry
+from .CollectionChangeNotifier import CollectionChangeNotifier
+from .MetadataFilter import MetadataFilter
 from .VectorDBProviderFactory import VectorDBProviderFactory
 from .providers import QdrantDBProvider, PGVectorProvider
\ No newline at end of file
@@ -1,26 +1,94 @@
 from ..VectorDBInterface import VectorDBInterface
+from ..CollectionRegistry import CollectionRegistry
+from ..MetadataFilter import MetadataFilter
 from ..VectorDBEnums import (DistanceMethodEnums, PgVectorTableSchemeEnums, 
-                             PgVectorDistanceMethodEnums, PgVectorIndexTypeEnums)
+                             PgVectorDistanceMethodEnums, PgVectorIndexTypeEnums,
+                             PgVectorInsertModeEnums, PgVectorDistanceOperatorEnums,
+                             VectorQuantizationEnums, PgVectorLayoutEnums,
+                             PgVectorIndexLimitEnums)
 import logging
 from typing import List
 from models.db_schemas import RetrievedDocument
 from sqlalchemy.sql import text as sql_text
+import numpy as np
+import asyncio
+import re
+import struct
+import time
 import json
 
 class PGVectorProvider(VectorDBInterface):
 
     def __init__(self, db_client, default_vector_size: int = 786,
-                       distance_method: str = None, index_threshold: int=100):
+                       distance_method: str = None, index_threshold: int=100,
+                       insert_mode: str = PgVectorInsertModeEnums.INSERT.value,
+                       copy_batch_size: int = 1000,
+                       layout: str = PgVectorLayoutEnums.TABLE.value,
+                       index_type: str = PgVectorIndexTypeEnums.HNSW.value,
+                       collection_cache_ttl: float = 60,
+                       quantization: str = VectorQuantizationEnums.NONE.value,
+                       quantization_oversample: float = 4.0,
+                       metadata_range_fields: list = None, iterative_scan: str = None,
+                       hnsw_m: int = 16, hnsw_ef_construction: int = 64, hnsw_ef_search: int = 40,
+                       ivfflat_lists: int = None, ivfflat_probes: int = 1,
+                       maintenance_work_mem: str = "512MB", maintenance_workers: int = 2,
+                       text_search_config: str = "simple",
+                       hybrid_candidates: int = 50, hybrid_rrf_k: int = 60):
         
         self.db_client = db_client
         self.default_vector_size = default_vector_size
         
         self.index_threshold = index_threshold
 
+        self.insert_mode = insert_mode
+        self.copy_batch_size = copy_batch_size
+
+        # partitioned: collections are partitions of a shared table per embedding size
+        self.layout = layout if layout in [ l.value for l in PgVectorLayoutEnums ] else PgVectorLayoutEnums.TABLE.value
+
+        # only used inside generated SQL, keep it to a plain identifier
+        self.text_search_config = re.sub(r'[^a-z_]', '', text_search_config.lower())
+        self.hybrid_candidates = hybrid_candidates
+        self.hybrid_rrf_k = hybrid_rrf_k
+
+        # existence / embedding size / index state lookups skip the catalog queries when cached
+        self.collection_registry = CollectionRegistry(ttl=collection_cache_ttl)
+
+        # defaults for collections without their own index config
+        self.default_index_config = {
+            "index_type": index_type,
+            "m": hnsw_m,
+            "ef_construction": hnsw_ef_construction,
+            "lists": ivfflat_lists,
+            "quantization": quantization,
+            "oversample": quantization_oversample,
+        }
+        self.default_search_params = {
+            "ef_search": hnsw_ef_search,
+            "probes": ivfflat_probes,
+        }
+
+        # SET does not take bind parameters, only accept plain memory sizes like "512MB"
+        if not re.fullmatch(r'\d+\s*(kB|MB|GB)?', str(maintenance_work_mem)):
+            raise ValueError(f"Invalid maintenance_work_mem: {maintenance_work_mem}")
+        self.maintenance_work_mem = maintenance_work_mem
+        self.maintenance_workers = int(maintenance_workers)
+
+        # numeric metadata fields with a range filter expression index
+        self.metadata_range_fields = [ f for f in (metadata_range_fields or [])
+                                       if MetadataFilter.FIELD_PATTERN.match(f) ]
+        self.iterative_scan = iterative_scan if iterative_scan in ("relaxed_order", "strict_order") else None
+
+        # opclass used to build the index and the operator that can use it
+        self.distance_operator = PgVectorDistanceOperatorEnums.COSINE.value
         if distance_method == DistanceMethodEnums.COSINE.value:
             distance_method = PgVectorDistanceMethodEnums.COSINE.value
         elif distance_method == DistanceMethodEnums.DOT.value:
             distance_method = PgVectorDistanceMethodEnums.DOT.value
+            self.distance_operator = PgVectorDistanceOperatorEnums.DOT.value
+        elif distance_method == DistanceMethodEnums.L2.value:
+            distance_method = PgVectorDistanceMethodEnums.L2.value
+            self.distance_operator = PgVectorDistanceOperatorEnums.L2.value
 
         self.pgvector_table_prefix = PgVectorTableSchemeEnums._PREFIX.value
         self.distance_method = distance_method
@@ -35,6 +103,31 @@ class PGVectorProvider(VectorDBInterface):
                 await session.execute(sql_text(
                     "CREATE EXTENSION IF NOT EXISTS vector"
                 ))
+
+                # Arabic normalization for lexical search: drop diacritics and tatweel, unify
+                # alef/yaa/taa marbuta forms and map Arabic-Indic digits ("المادة ٥٢" == "المادة 52")
+                await session.execute(sql_text(
+                    r"""
+                    CREATE OR REPLACE FUNCTION misrlex_normalize_ar(input text) RETURNS text
+                    LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+                        SELECT translate(
+                            regexp_replace(input, '[\u064B-\u065F\u0670\u0640]', '', 'g'),
+                            'أإآٱىة٠١٢٣٤٥٦٧٨٩۰۱۲۳۴۵۶۷۸۹',
+                            'اااايه01234567890123456789'
+                        )
+                    $$
+                    """
+                ))
+
+                # numeric view of a metadata value for range filters, NULL instead of a cast error
+                await session.execute(sql_text(
+                    """
+                    CREATE OR REPLACE FUNCTION misrlex_jsonb_numeric(input jsonb) RETURNS numeric
+                    LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+                        SELECT CASE WHEN jsonb_typeof(input) = 'number' THEN (input #>> '{}')::numeric END
+                    $$
+                    """
+                ))
                 await session.commit()
 
     async def disconnect(self):
@@ -42,14 +135,46 @@ class PGVectorProvider(VectorDBInterface):
 
     async def is_collection_existed(self, collection_name: str) -> bool:
 
-        record = None
+        if self.collection_registry.get_field(collection_name, "existed"):
+            return True
+
+        # for vector columns atttypmod holds the dimension
         async with self.db_client() as session:
             async with session.begin():
-                list_tbl = sql_text(f'SELECT * FROM pg_tables WHERE tablename = :collection_name')
-                results = await session.execute(list_tbl, {"collection_name": collection_name})
-                record = results.scalar_one_or_none()
+                check_sql = sql_text('SELECT atttypmod FROM pg_attribute '
+                                     'WHERE attrelid = to_regclass(:collection_name) '
+                                     'AND attname = :column_name AND NOT attisdropped')
+                results = await session.execute(check_sql, {"collection_name": collection_name,
+                                                            "column_name": PgVectorTableSchemeEnums.VECTOR.value})
+                embedding_size = results.scalar_one_or_none()
+
+        if embedding_size is None:
+            return False
+
+        self.collection_registry.set(collection_name, existed=True, embedding_size=embedding_size)
 
-        return record
+        return True
+
+    async def get_collection_embedding_size(self, collection_name: str) -> int:
+        if not await self.is_collection_existed(collection_name=collection_name):
+            return None
+
+        return self.collection_registry.get_field(collection_name, "embedding_size")
+
+    async def get_estimated_records_count(self, collection_name: str, at_least: int = None) -> int:
+        # planner estimate; below at_least (or never analyzed) fall back to a bounded count
+        async with self.db_client() as session:
+            async with session.begin():
+                estimate_sql = sql_text('SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:collection_name)')
+                result = await session.execute(estimate_sql, {"collection_name": collection_name})
+                records_count = result.scalar_one_or_none() or 0
+
+                if at_least and records_count < at_least:
+                    count_sql = sql_text(f'SELECT COUNT(*) FROM (SELECT 1 FROM {collection_name} LIMIT :at_least) s')
+                    result = await session.execute(count_sql, {"at_least": at_least})
+                    records_count = result.scalar_one()
+
+        return max(records_count, 0)
     
     async def list_all_collections(self) -> List:
         records = []
@@ -61,24 +186,29 @@ class PGVectorProvider(VectorDBInterface):
         
         return records
     
-    async def get_collection_info(self, collection_name: str) -> dict:
+    async def get_collection_info(self, collection_name: str, exact: bool = False) -> dict:
         async with self.db_client() as session:
             async with session.begin():
                 
                 table_info_sql = sql_text(f'''
-                    SELECT schemaname, tablename, tableowner, tablespace, hasindexes 
-                    FROM pg_tables 
-                    WHERE tablename = :collection_name
+                    SELECT t.schemaname, t.tablename, t.tableowner, t.tablespace, t.hasindexes,
+                           c.reltuples::bigint AS estimated_count
+                    FROM pg_tables t
+                    JOIN pg_class c ON c.oid = to_regclass(t.schemaname || '.' || t.tablename)
+                    WHERE t.tablename = :collection_name
                 ''')
 
-                count_sql = sql_text(f'SELECT COUNT(*) FROM {collection_name}')
-
                 table_info = await session.execute(table_info_sql, {"collection_name": collection_name})
-                record_count = await session.execute(count_sql)
 
                 table_data = table_info.fetchone()
                 if not table_data:
                     return None
+
+                # reltuples is -1 until the table is first vacuumed / analyzed
+                record_count = max(table_data[5], 0)
+                if exact:
+                    count_sql = sql_text(f'SELECT COUNT(*) FROM {collection_name}')
+                    record_count = (await session.execute(count_sql)).scalar_one()
                 
                 return {
                     "table_info": {
@@ -88,7 +218,8 @@ class PGVectorProvider(VectorDBInterface):
                         "tablespace": table_data[3],
                         "hasindexes": table_data[4],
                     },
-                    "record_count": record_count.scalar_one(),
+                    "record_count": record_count,
+                    "record_count_exact": exact,
                 }
             
     async def delete_collection(self, collection_name: str):
@@ -99,90 +230,687 @@ class PGVectorProvider(VectorDBInterface):
                 delete_sql = sql_text(f'DROP TABLE IF EXISTS {collection_name}')
                 await session.execute(delete_sql)
                 await session.commit()
+
+        self.collection_registry.invalidate(collection_name)
         
         return True
 
     async def create_collection(self, collection_name: str,
                                       embedding_size: int,
-                                      do_reset: bool = False):
+                                      do_reset: bool = False,
+                                      quantization: str = None):
         
+        index_config = None
         if do_reset:
+            if await self.is_collection_existed(collection_name=collection_name):
+                index_config = await self.get_stored_index_config(collection_name=collection_name)
             _ = await self.delete_collection(collection_name=collection_name)
 
+        if quantization:
+            index_config = { **(index_config or {}), "quantization": quantization }
+
         is_collection_existed = await self.is_collection_existed(collection_name=collection_name)
         if not is_collection_existed:
             self.logger.info(f"Creating collection: {collection_name}")
+            parent_name, project_id = self.get_partition_spec(collection_name)
             async with self.db_client() as session:
                 async with session.begin():
-                    create_sql = sql_text(
-                        f'CREATE TABLE {collection_name} ('
-                            f'{PgVectorTableSchemeEnums.ID.value} bigserial PRIMARY KEY,'
-                            f'{PgVectorTableSchemeEnums.TEXT.value} text, '
-                            f'{PgVectorTableSchemeEnums.VECTOR.value} vector({embedding_size}), '
-                            f'{PgVectorTableSchemeEnums.METADATA.value} jsonb DEFAULT \'{{}}\', '
-                            f'{PgVectorTableSchemeEnums.CHUNK_ID.value} integer, '
-                            f'FOREIGN KEY ({PgVectorTableSchemeEnums.CHUNK_ID.value}) REFERENCES chunks(chunk_id)'
-                        ')'
-                    )
-                    await session.execute(create_sql)
+                    if parent_name:
+                        await session.execute(sql_text(self.get_partitioned_table_sql(parent_name, embedding_size)))
+                        for partition_sql in self.get_partition_sql(collection_name, parent_name, project_id):
+                            await session.execute(sql_text(partition_sql))
+                    else:
+                        create_sql = sql_text(
+                            f'CREATE TABLE {collection_name} ('
+                                f'{PgVectorTableSchemeEnums.ID.value} bigserial PRIMARY KEY,'
+                                f'{self.get_columns_sql(embedding_size)}, '
+                                f'FOREIGN KEY ({PgVectorTableSchemeEnums.CHUNK_ID.value}) REFERENCES chunks(chunk_id)'
+                            ')'
+                        )
+                        await session.execute(create_sql)
+
+                    # per-collection (per-partition) indexes
+                    for index_sql in self.get_secondary_indexes_sql(collection_name):
+                        await session.execute(sql_text(index_sql))
                     await session.commit()
+
+            self.collection_registry.set(collection_name, existed=True,
+                                         embedding_size=embedding_size, lexical=True,
+                                         metadata_indexes=True)
+
+            if index_config:
+                await self.store_index_config(collection_name=collection_name, index_config=index_config)
             
             return True
 
         return False
     
-    async def is_index_existed(self, collection_name: str) -> bool:
+    async def list_unpartitioned_collections(self) -> List:
+        # standalone collection tables the partitioned layout would place under a shared table
+        async with self.db_client() as session:
+            async with session.begin():
+                list_sql = sql_text("""
+                                    SELECT c.relname FROM pg_class c
+                                    WHERE c.relkind = 'r' AND NOT c.relispartition
+                                    AND c.relnamespace = to_regnamespace(current_schema())
+                                    AND EXISTS (SELECT 1 FROM pg_attribute a
+                                                WHERE a.attrelid = c.oid AND a.attname = :vector_col
+                                                AND NOT a.attisdropped)
+                                    ORDER BY c.relname
+                                    """)
+                results = await session.execute(list_sql, {"vector_col": PgVectorTableSchemeEnums.VECTOR.value})
+                collection_names = results.scalars().all()
+
+        return [ c for c in collection_names if self.get_partition_spec(c)[0] ]
+
+    async def migrate_collection_to_partition(self, collection_name: str) -> int:
+        # moves a standalone collection table into its partition; returns the moved records count,
+        # None when there is nothing to migrate
+        parent_name, project_id = self.get_partition_spec(collection_name)
+        if not parent_name:
+            self.logger.error(f"Collection {collection_name} has no partition in the {self.layout} layout")
+            return None
+
+        embedding_size = await self.get_collection_embedding_size(collection_name=collection_name)
+        if embedding_size is None:
+            return None
+
+        index_config = await self.get_stored_index_config(collection_name=collection_name)
+        staging_name = f"{collection_name}_migrating"
+        id_col = PgVectorTableSchemeEnums.ID.value
+        columns_sql = ", ".join([
+            id_col,
+            PgVectorTableSchemeEnums.TEXT.value,
+            PgVectorTableSchemeEnums.VECTOR.value,
+            PgVectorTableSchemeEnums.METADATA.value,
+            PgVectorTableSchemeEnums.CHUNK_ID.value,
+        ])
+
+        self.logger.info(f"START: Migrating collection {collection_name} into {parent_name}")
+        start_time = time.perf_counter()
+
+        # copy into a staging partition and swap names in one transaction, the old table stays
+        # readable (SHARE lock blocks writes only) and untouched if anything fails
+        async with self.db_client() as session:
+            async with session.begin():
+                relkind_sql = sql_text('SELECT relispartition FROM pg_class WHERE oid = to_regclass(:collection_name)')
+                is_partition = (await session.execute(relkind_sql, {"collection_name": collection_name})).scalar_one_or_none()
+                if is_partition is not False:
+                    return None
+
+                await session.execute(sql_text(f'LOCK TABLE {collection_name} IN SHARE MODE'))
+                await session.execute(sql_text(self.get_partitioned_table_sql(parent_name, embedding_size)))
+                await session.execute(sql_text(self.get_partition_sql(staging_name, parent_name, project_id)[0]))
+
+                copy_sql = sql_text(f'INSERT INTO {staging_name} ({columns_sql}, {PgVectorTableSchemeEnums.PROJECT_ID.value}) '
+                                    f'SELECT {columns_sql}, {int(project_id)} FROM {collection_name}')
+                records_count = (await session.execute(copy_sql)).rowcount
+
+                await session.execute(sql_text(f'DROP TABLE {collection_name}'))
+                await session.execute(sql_text(f'ALTER TABLE {staging_name} RENAME TO {collection_name}'))
+                await session.execute(sql_text(self.get_partition_sql(collection_name, parent_name, project_id)[1]))
+
+                # copied ids came from the old table sequence, move the shared one past them
+                await session.execute(sql_text(
+                    f'SELECT setval(s.seq, GREATEST((SELECT COALESCE(MAX({id_col}), 0) FROM {collection_name}), '
+                    f'COALESCE(pg_sequence_last_value(s.seq), 0), 1)) '
+                    f'FROM (SELECT pg_get_serial_sequence(:parent_name, :id_col)::regclass AS seq) s'
+                ), {"parent_name": parent_name, "id_col": id_col})
+
+                for index_sql in self.get_secondary_indexes_sql(collection_name):
+                    await session.execute(sql_text(index_sql))
+
+        self.collection_registry.invalidate(collection_name)
+        if index_config:
+            await self.store_index_config(collection_name=collection_name, index_config=index_config)
+
+        _ = await self.build_vector_index(collection_name=collection_name)
+
+        self.logger.info(f"END: Migrated {records_count} records of {collection_name} into {parent_name} "
+                         f"in {time.perf_counter() - start_time:.1f}s")
+
+        return records_count
+
+    def get_columns_sql(self, embedding_size: int):
+        return (
+            f'{PgVectorTableSchemeEnums.TEXT.value} text, '
+            f'{PgVectorTableSchemeEnums.VECTOR.value} vector({embedding_size}), '
+            f'{PgVectorTableSchemeEnums.METADATA.value} jsonb DEFAULT \'{{}}\', '
+            f'{PgVectorTableSchemeEnums.CHUNK_ID.value} integer, '
+            f'{self.get_lexical_column_sql()}'
+        )
+
+    def get_partition_spec(self, collection_name: str):
+        # partitioned layout: "collection_<size>_<project_id>" becomes the partition of the shared
+        # "collection_<size>" table holding that project's records. The partition keeps the collection
+        # name, so everything addressing a single collection works unchanged on either layout
+        match = re.fullmatch(r'(\w+_\d+)_(\d+)', collection_name)
+        if self.layout != PgVectorLayoutEnums.PARTITIONED.value or not match:
+            return None, None
+
+        return match.group(1), int(match.group(2))
+
+    def get_partitioned_table_sql(self, parent_name: str, embedding_size: int):
+        id_col = PgVectorTableSchemeEnums.ID.value
+        project_id_col = PgVectorTableSchemeEnums.PROJECT_ID.value
+        return (
+            f'CREATE TABLE IF NOT EXISTS {parent_name} ('
+                f'{id_col} bigserial, '
+                f'{self.get_columns_sql(embedding_size)}, '
+                f'{project_id_col} integer NOT NULL, '
+                f'PRIMARY KEY ({id_col}, {project_id_col}), '
+                f'FOREIGN KEY ({PgVectorTableSchemeEnums.CHUNK_ID.value}) REFERENCES chunks(chunk_id)'
+            f') PARTITION BY LIST ({project_id_col})'
+        )
+
+    def get_partition_sql(self, collection_name: str, parent_name: str, project_id: int):
+        # rows written straight into the partition (inserts, COPY) get the project_id default
+        return [
+            f'CREATE TABLE {collection_name} PARTITION OF {parent_name} FOR VALUES IN ({int(project_id)})',
+            f'ALTER TABLE {collection_name} ALTER COLUMN {PgVectorTableSchemeEnums.PROJECT_ID.value} '
+            f'SET DEFAULT {int(project_id)}',
+        ]
+
+    def get_secondary_indexes_sql(self, collection_name: str):
+        return [
+            # record lookups (incremental re-indexing deletes, last indexed chunk)
+            f'CREATE INDEX IF NOT EXISTS {collection_name}_chunk_id_idx '
+            f'ON {collection_name} ({PgVectorTableSchemeEnums.CHUNK_ID.value})',
+            self.get_lexical_index_sql(collection_name),
+        ] + self.get_metadata_indexes_sql(collection_name)
+
+    def get_lexical_column_sql(self):
+        return (
+            f'{PgVectorTableSchemeEnums.LEXICAL.value} tsvector GENERATED ALWAYS AS '
+            f"(to_tsvector('{self.text_search_config}'::regconfig, "
+            f'misrlex_normalize_ar(coalesce({PgVectorTableSchemeEnums.TEXT.value}, \'\')))) STORED'
+        )
+
+    def get_lexical_index_sql(self, collection_name: str):
+        return (
+            f'CREATE INDEX IF NOT EXISTS {collection_name}_lexical_idx '
+            f'ON {collection_name} USING gin ({PgVectorTableSchemeEnums.LEXICAL.value})'
+        )
+
+    def get_metadata_range_sql(self, field: str):
+        return f"misrlex_jsonb_numeric({PgVectorTableSchemeEnums.METADATA.value} -> '{field}')"
+
+    def get_metadata_indexes_sql(self, collection_name: str):
+        # containment (equality / $in) filters use the GIN index, numeric ranges the expression indexes
+        metadata_col = PgVectorTableSchemeEnums.METADATA.value
+        return [
+            f'CREATE INDEX IF NOT EXISTS {collection_name}_metadata_idx '
+            f'ON {collection_name} USING gin ({metadata_col} jsonb_path_ops)'
+        ] + [
+            f'CREATE INDEX IF NOT EXISTS {collection_name}_metadata_{field.lower()}_idx '
+            f'ON {collection_name} (({self.get_metadata_range_sql(field)}))'
+            for field in self.metadata_range_fields
+        ]
+
+    async def ensure_metadata_indexes(self, collection_name: str):
+        # collections created before metadata filtering get the indexes on first filtered search
+        if self.collection_registry.get_field(collection_name, "metadata_indexes"):
+            return
+
+        async with self.db_client() as session:
+            async with session.begin():
+                for metadata_index_sql in self.get_metadata_indexes_sql(collection_name):
+                    await session.execute(sql_text(metadata_index_sql))
+
+        self.collection_registry.set(collection_name, metadata_indexes=True)
+
+    def get_metadata_filter_sql(self, metadata_filter: list = None):
+        # compiles MetadataFilter conditions into a WHERE predicate and its bind params
+        if not metadata_filter:
+            return "TRUE", {}
+
+        metadata_col = PgVectorTableSchemeEnums.METADATA.value
+        predicates, params = [], {}
+
+        def bind(value):
+            name = f"filter_{len(params)}"
+            params[name] = value
+            return f":{name}"
+
+        def containment(field, value):
+            return f'{metadata_col} @> CAST({bind(json.dumps({field: value}, ensure_ascii=False))} AS jsonb)'
+
+        range_operators = {
+            MetadataFilter.GT: ">", MetadataFilter.GTE: ">=",
+            MetadataFilter.LT: "<", MetadataFilter.LTE: "<=",
+        }
+
+        for field, operator, value in metadata_filter:
+            if operator == MetadataFilter.EQ:
+                predicates.append(containment(field, value))
+            elif operator == MetadataFilter.NE:
+                predicates.append(f'NOT ({containment(field, value)})')
+            elif operator == MetadataFilter.IN:
+                predicates.append('(' + ' OR '.join([ containment(field, v) for v in value ]) + ')')
+            else:
+                predicates.append(f'{self.get_metadata_range_sql(field)} {range_operators[operator]} {bind(value)}')
+
+        return " AND ".join(predicates), params
+
+    def build_retrieved_document(self, record):
+        metadata = record.metadata
+        if isinstance(metadata, str):
+            metadata = json.loads(metadata)
+
+        return RetrievedDocument(
+            text=record.text,
+            score=record.score,
+            chunk_id=record.chunk_id,
+            asset_id=(metadata or {}).get("asset_id"),
+            metadata=metadata,
+        )
+
+    async def ensure_lexical_index(self, collection_name: str):
+        # collections created before hybrid search get the column on first use
+        if self.collection_registry.get_field(collection_name, "lexical"):
+            return
+
+        async with self.db_client() as session:
+            async with session.begin():
+                check_sql = sql_text('SELECT 1 FROM information_schema.columns '
+                                     'WHERE table_name = :collection_name AND column_name = :column_name')
+                result = await session.execute(check_sql, {"collection_name": collection_name,
+                                                           "column_name": PgVectorTableSchemeEnums.LEXICAL.value})
+
+                if not result.scalar_one_or_none():
+                    self.logger.info(f"Adding lexical index to collection: {collection_name}")
+                    await session.execute(sql_text(
+                        f'ALTER TABLE {collection_name} ADD COLUMN IF NOT EXISTS {self.get_lexical_column_sql()}'
+                    ))
+                    await session.execute(sql_text(self.get_lexical_index_sql(collection_name)))
+
+        self.collection_registry.set(collection_name, lexical=True)
+
+    async def get_index_validity(self, collection_name: str):
+        # None: no index, False: left invalid by a failed (or still running) concurrent build
+        if self.collection_registry.get_field(collection_name, "index_valid"):
+            return True
+
         index_name = self.default_index_name(collection_name)
         async with self.db_client() as session:
             async with session.begin():
                 check_sql = sql_text(f""" 
-                                    SELECT 1 
-                                    FROM pg_indexes 
-                                    WHERE tablename = :collection_name
-                                    AND indexname = :index_name
+                                    SELECT i.indisvalid 
+                                    FROM pg_index i
+                                    JOIN pg_class c ON c.oid = i.indexrelid
+                                    WHERE i.indrelid = to_regclass(:collection_name)
+                                    AND c.relname = :index_name
                                     """)
                 results = await session.execute(check_sql, {"index_name": index_name, "collection_name": collection_name})
-                
-                return bool(results.scalar_one_or_none())
+                index_validity = results.scalar_one_or_none()
+
+        if index_validity:
+            self.collection_registry.set(collection_name, index_valid=True)
+
+        return index_validity
+
+    async def is_index_existed(self, collection_name: str) -> bool:
+        return bool(await self.get_index_validity(collection_name=collection_name))
+
+    async def get_maintenance_connection(self, session):
+        # CREATE / DROP INDEX CONCURRENTLY can not run inside a transaction block
+        return await session.connection(execution_options={"isolation_level": "AUTOCOMMIT"})
+
+    async def get_index_build_progress(self, collection_name: str) -> dict:
+        async with self.db_client() as session:
+            async with session.begin():
+                progress_sql = sql_text("""
+                                        SELECT phase, blocks_done, blocks_total, tuples_done, tuples_total
+                                        FROM pg_stat_progress_create_index
+                                        WHERE relid = to_regclass(:collection_name)
+                                        """)
+                result = await session.execute(progress_sql, {"collection_name": collection_name})
+                record = result.fetchone()
+
+        if not record:
+            return {
+                "in_progress": False,
+                "is_index_existed": await self.is_index_existed(collection_name=collection_name),
+            }
+
+        # hnsw reports loaded tuples, ivfflat and the table scan report blocks
+        done, total = record.tuples_done, record.tuples_total
+        if not total:
+            done, total = record.blocks_done, record.blocks_total
+
+        return {
+            "in_progress": True,
+            "phase": record.phase,
+            "blocks_done": record.blocks_done,
+            "blocks_total": record.blocks_total,
+            "tuples_done": record.tuples_done,
+            "tuples_total": record.tuples_total,
+            "progress": round(done / total, 4) if total else None,
+        }
+
+    async def log_index_build_progress(self, collection_name: str, interval: float = 10.0):
+        while True:
+            await asyncio.sleep(interval)
+            progress = await self.get_index_build_progress(collection_name=collection_name)
+            if progress.get("in_progress"):
+                self.logger.info(f"Vector index build for {collection_name}: {progress['phase']} "
+                                 f"({progress['progress']})")
             
+    async def get_stored_index_config(self, collection_name: str) -> dict:
+        # per-collection index config lives in the collection table comment
+        async with self.db_client() as session:
+            async with session.begin():
+                comment_sql = sql_text('SELECT obj_description(to_regclass(:collection_name), \'pg_class\')')
+                result = await session.execute(comment_sql, {"collection_name": collection_name})
+                comment = result.scalar_one_or_none()
+
+        if not comment:
+            return {}
+
+        try:
+            return json.loads(comment).get("index_config", {})
+        except (ValueError, AttributeError):
+            return {}
+
+    async def store_index_config(self, collection_name: str, index_config: dict):
+        comment = json.dumps({"index_config": index_config}).replace("'", "''")
+        async with self.db_client() as session:
+            async with session.begin():
+                await session.execute(sql_text(f"COMMENT ON TABLE {collection_name} IS '{comment}'"))
+
+        self.collection_registry.unset_field(collection_name, "index_config")
+
+    async def get_index_config(self, collection_name: str) -> dict:
+        # read on every search (quantization), so it goes through the registry
+        index_config = self.collection_registry.get_field(collection_name, "index_config")
+        if index_config is None:
+            index_config = {
+                **self.default_index_config,
+                **(await self.get_stored_index_config(collection_name=collection_name)),
+            }
+            if await self.is_collection_existed(collection_name=collection_name):
+                self.collection_registry.set(collection_name, index_config=index_config)
+
+        return dict(index_config)
+
+    async def set_index_config(self, collection_name: str, index_config: dict) -> bool:
+
+        is_collection_existed = await self.is_collection_existed(collection_name=collection_name)
+        if not is_collection_existed:
+            self.logger.error(f"Can not configure index of a non-existed collection: {collection_name}")
+            return False
+
+        index_type = index_config.get("index_type")
+        if index_type and index_type not in [ t.value for t in PgVectorIndexTypeEnums ]:
+            self.logger.error(f"Unsupported pgvector index type: {index_type}")
+            return False
+
+        quantization = index_config.get("quantization")
+        if quantization and quantization not in [ q.value for q in VectorQuantizationEnums ]:
+            self.logger.error(f"Unsupported quantization: {quantization}")
+            return False
+
+        previous_config = await self.get_stored_index_config(collection_name=collection_name)
+        stored_config = {
+            **previous_config,
+            **{ k: v for k, v in index_config.items() if v is not None },
+        }
+
+        # checked against the merged config, a new ef_construction has to fit the stored m
+        if not self.is_valid_index_config({ **self.default_index_config, **stored_config }):
+            return False
+
+        await self.store_index_config(collection_name=collection_name, index_config=stored_config)
+
+        # rebuild so the new build params take effect; oversample is search time only
+        if set(index_config) - {"oversample"}:
+            try:
+                await self.reset_vector_index(collection_name=collection_name)
+            except Exception as e:
+                # a config the build rejects would fail every later rebuild, go back to the previous one
+                self.logger.error(f"Vector index rebuild failed for collection: {collection_name}: {e}")
+                await self.store_index_config(collection_name=collection_name, index_config=previous_config)
+                await self.reset_vector_index(collection_name=collection_name)
+                return False
+
+        return True
+
+    def is_valid_index_config(self, index_config: dict) -> bool:
+        oversample = index_config.get("oversample")
+        if oversample is not None and not 1 <= float(oversample) <= PgVectorIndexLimitEnums.MAX_OVERSAMPLE.value:
+            self.logger.error(f"Invalid quantization oversample: {oversample}")
+            return False
+
+        if index_config.get("index_type") == PgVectorIndexTypeEnums.IVFFLAT.value:
+            lists = index_config.get("lists")
+            if lists is not None and not (PgVectorIndexLimitEnums.MIN_LISTS.value <= int(lists)
+                                          <= PgVectorIndexLimitEnums.MAX_LISTS.value):
+                self.logger.error(f"Invalid ivfflat lists: {lists}")
+                return False
+            return True
+
+        m, ef_construction = int(index_config["m"]), int(index_config["ef_construction"])
+        if not PgVectorIndexLimitEnums.MIN_M.value <= m <= PgVectorIndexLimitEnums.MAX_M.value:
+            self.logger.error(f"Invalid hnsw m: {m}")
+            return False
+        if not 2 * m <= ef_construction <= PgVectorIndexLimitEnums.MAX_EF_CONSTRUCTION.value:
+            self.logger.error(f"Invalid hnsw ef_construction: {ef_construction} (m = {m})")
+            return False
+
+        return True
+
+    def get_quantized_sql(self, value_sql: str, quantization: str, embedding_size: int):
+        # halfvec keeps 16 bits per dimension, binary_quantize one bit (sign)
+        if quantization == VectorQuantizationEnums.SCALAR.value:
+            return f'({value_sql})::halfvec({embedding_size})'
+        if quantization == VectorQuantizationEnums.BINARY.value:
+            return f'binary_quantize({value_sql})::bit({embedding_size})'
+        return value_sql
+
+    def get_quantized_opclass(self, quantization: str):
+        if quantization == VectorQuantizationEnums.SCALAR.value:
+            return self.distance_method.replace('vector_', 'halfvec_', 1)
+        if quantization == VectorQuantizationEnums.BINARY.value:
+            return PgVectorDistanceMethodEnums.HAMMING.value
+        return self.distance_method
+
+    def get_quantized_operator(self, quantization: str):
+        if quantization == VectorQuantizationEnums.BINARY.value:
+            return PgVectorDistanceOperatorEnums.HAMMING.value
+        return self.distance_operator
+
+    def is_quantized(self, index_config: dict):
+        return index_config.get("quantization") in [ VectorQuantizationEnums.SCALAR.value,
+                                                     VectorQuantizationEnums.BINARY.value ]
+
+    def get_oversample_limit(self, index_config: dict, limit: int):
+        if not self.is_quantized(index_config):
+            return int(limit)
+
+        # the candidates go through the hnsw scan, more than ef_search allows would not be returned
+        oversample_limit = int(np.ceil(int(limit) * max(1.0, float(index_config.get("oversample") or 1.0))))
+        return max(int(limit), min(oversample_limit, PgVectorIndexLimitEnums.MAX_EF_SEARCH.value))
+
+    def get_vector_candidates_sql(self, collection_name: str, index_config: dict, embedding_size: int,
+                                  limit_param: str = "limit", filter_sql: str = "TRUE"):
+        # (id, text, chunk_id, metadata, distance) of the nearest records matching filter_sql, ordered
+        # by full precision distance. Quantized collections take an oversampled candidate set through
+        # the quantized index (:oversample_limit) and rescore it with the full precision vectors
+        id_col = PgVectorTableSchemeEnums.ID.value
+        text_col = PgVectorTableSchemeEnums.TEXT.value
+        vector_col = PgVectorTableSchemeEnums.VECTOR.value
+        chunk_id_col = PgVectorTableSchemeEnums.CHUNK_ID.value
+        metadata_col = PgVectorTableSchemeEnums.METADATA.value
+        query_vector_sql = 'CAST(:vector AS vector)'
+        distance_sql = f'{vector_col} {self.distance_operator} {query_vector_sql}'
+        columns_sql = (f'{id_col} AS id, {text_col} AS text, {chunk_id_col} AS chunk_id, '
+                       f'{metadata_col} AS metadata')
+
+        if not self.is_quantized(index_config):
+            return (f'SELECT {columns_sql}, {distance_sql} AS distance '
+                    f'FROM {collection_name} WHERE {filter_sql} ORDER BY {distance_sql} LIMIT :{limit_param}')
+
+        quantization = index_config["quantization"]
+        quantized_distance_sql = (
+            f'{self.get_quantized_sql(vector_col, quantization, embedding_size)} '
+            f'{self.get_quantized_operator(quantization)} '
+            f'{self.get_quantized_sql(query_vector_sql, quantization, embedding_size)}'
+        )
+
+        return (f'SELECT id, text, chunk_id, metadata, {distance_sql} AS distance FROM ('
+                f'SELECT {columns_sql}, {vector_col} FROM {collection_name} WHERE {filter_sql} '
+                f'ORDER BY {quantized_distance_sql} LIMIT :oversample_limit) q '
+                f'ORDER BY distance LIMIT :{limit_param}')
+
+    def get_index_build_sql(self, collection_name: str, index_config: dict, records_count: int,
+                            embedding_size: int = None):
+        index_type = index_config["index_type"]
+        quantization = index_config.get("quantization")
+        if not embedding_size:
+            quantization = None
+
+        # quantized collections index an expression, the table keeps the full precision vectors
+        index_expression_sql = PgVectorTableSchemeEnums.VECTOR.value
+        if self.is_quantized({"quantization": quantization}):
+            index_expression_sql = f'({self.get_quantized_sql(index_expression_sql, quantization, embedding_size)})'
+
+        if index_type == PgVectorIndexTypeEnums.IVFFLAT.value:
+            lists = index_config.get("lists")
+            if not lists:
+                # pgvector guidance: rows / 1000 up to 1M rows, sqrt(rows) above
+                lists = records_count // 1000 if records_count <= 1000000 else int(np.sqrt(records_count))
+            with_clause = f'WITH (lists = {max(1, int(lists))})'
+        else:
+            index_type = PgVectorIndexTypeEnums.HNSW.value
+            with_clause = (f'WITH (m = {int(index_config["m"])}, '
+                           f'ef_construction = {int(index_config["ef_construction"])})')
+
+        return (
+            f'CREATE INDEX IF NOT EXISTS {self.default_index_name(collection_name)} ON {collection_name} '
+            f'USING {index_type} ({index_expression_sql} {self.get_quantized_opclass(quantization)}) {with_clause}'
+        )
+
     async def create_vector_index(self, collection_name: str,
-                                        index_type: str = PgVectorIndexTypeEnums.HNSW.value):
-        is_index_existed = await self.is_index_existed(collection_name=collection_name)
-        if is_index_existed:
+                                        index_type: str = None):
+
+        index_validity = await self.get_index_validity(collection_name=collection_name)
+        if index_validity:
             return False
+
+        if index_validity is False:
+            progress = await self.get_index_build_progress(collection_name=collection_name)
+            if progress.get("in_progress"):
+                self.logger.info(f"Vector index build already running for collection: {collection_name}")
+                return False
+
+            # leftover of an interrupted concurrent build
+            await self.drop_vector_index(collection_name=collection_name)
+
+        index_config = await self.get_index_config(collection_name=collection_name)
+        if index_type:
+            index_config["index_type"] = index_type
         
+        records_count = await self.get_estimated_records_count(collection_name=collection_name,
+                                                               at_least=self.index_threshold)
+        if index_config["index_type"] == PgVectorIndexTypeEnums.IVFFLAT.value and not index_config.get("lists"):
+            # lists are sized from the row count, the estimate may be stale right after a load
+            async with self.db_client() as session:
+                async with session.begin():
+                    count_sql = sql_text(f'SELECT COUNT(*) FROM {collection_name}')
+                    records_count = (await session.execute(count_sql)).scalar_one()
+
+        if records_count < self.index_threshold:
+            return False
+
+        self.logger.info(f"START: Creating vector index for collection: {collection_name} ({index_config})")
+
+        create_idx_sql = self.get_index_build_sql(collection_name=collection_name,
+                                                  index_config=index_config,
+                                                  records_count=records_count,
+                                                  embedding_size=await self.get_collection_embedding_size(
+                                                      collection_name=collection_name))
+        create_idx_sql = create_idx_sql.replace('CREATE INDEX', 'CREATE INDEX CONCURRENTLY', 1)
+
+        start_time = time.perf_counter()
         async with self.db_client() as session:
-            async with session.begin():
-                count_sql = sql_text(f'SELECT COUNT(*) FROM {collection_name}')
-                result = await session.execute(count_sql)
-                records_count = result.scalar_one()
+            connection = await self.get_maintenance_connection(session)
+            progress_task = asyncio.create_task(self.log_index_build_progress(collection_name=collection_name))
+            try:
+                # session level settings, reset before the connection goes back to the pool
+                await connection.execute(sql_text(f"SET maintenance_work_mem = '{self.maintenance_work_mem}'"))
+                await connection.execute(sql_text(f'SET max_parallel_maintenance_workers = {self.maintenance_workers}'))
 
-                if records_count < self.index_threshold:
-                    return False
-                
-                self.logger.info(f"START: Creating vector index for collection: {collection_name}")
-                
-                index_name = self.default_index_name(collection_name)
-                create_idx_sql = sql_text(
-                                            f'CREATE INDEX {index_name} ON {collection_name} '
-                                            f'USING {index_type} ({PgVectorTableSchemeEnums.VECTOR.value} {self.distance_method})'
-                                          )
+                await connection.execute(sql_text(create_idx_sql))
+            finally:
+                progress_task.cancel()
+                await connection.execute(sql_text('RESET maintenance_work_mem'))
+                await connection.execute(sql_text('RESET max_parallel_maintenance_workers'))
 
-                await session.execute(create_idx_sql)
+        self.logger.info(f"END: Created vector index for collection: {collection_name} "
+                         f"in {time.perf_counter() - start_time:.1f}s")
 
-                self.logger.info(f"END: Created vector index for collection: {collection_name}")
+        self.collection_registry.set(collection_name, index_valid=True)
 
-    async def reset_vector_index(self, collection_name: str, 
-                                       index_type: str = PgVectorIndexTypeEnums.HNSW.value) -> bool:
-        
+        return True
+
+    async def drop_vector_index(self, collection_name: str):
         index_name = self.default_index_name(collection_name)
         async with self.db_client() as session:
-            async with session.begin():
-                drop_sql = sql_text(f'DROP INDEX IF EXISTS {index_name}')
-                await session.execute(drop_sql)
+            connection = await self.get_maintenance_connection(session)
+            await connection.execute(sql_text(f'DROP INDEX CONCURRENTLY IF EXISTS {index_name}'))
+
+        self.collection_registry.unset_field(collection_name, "index_valid")
+
+    async def reset_vector_index(self, collection_name: str, 
+                                       index_type: str = None) -> bool:
+        
+        await self.drop_vector_index(collection_name=collection_name)
         
         return await self.create_vector_index(collection_name=collection_name, index_type=index_type)
 
+    async def defer_vector_index(self, collection_name: str) -> bool:
+        # bulk loads write without maintaining the index, build_vector_index rebuilds it once
+        if not await self.is_collection_existed(collection_name=collection_name):
+            return False
+
+        self.logger.info(f"Dropping vector index for bulk load into collection: {collection_name}")
+        await self.drop_vector_index(collection_name=collection_name)
+
+        return True
+
+    async def build_vector_index(self, collection_name: str) -> bool:
+        if not await self.is_collection_existed(collection_name=collection_name):
+            return False
+
+        return await self.create_vector_index(collection_name=collection_name)
+
+    async def apply_search_params(self, session, limit: int, search_params: dict = None,
+                                  is_filtered: bool = False):
+        # transaction-scoped recall / latency knobs; ef_search below limit would cap the results
+        search_params = {
+            **self.default_search_params,
+            **{ k: v for k, v in (search_params or {}).items() if v is not None },
+        }
+
+        ef_search = min(max(int(search_params["ef_search"]), int(limit)), PgVectorIndexLimitEnums.MAX_EF_SEARCH.value)
+        probes = min(max(1, int(search_params["probes"])), PgVectorIndexLimitEnums.MAX_LISTS.value)
+
+        await session.execute(sql_text(f'SET LOCAL hnsw.ef_search = {ef_search}'))
+        await session.execute(sql_text(f'SET LOCAL ivfflat.probes = {probes}'))
+
+        # filters are applied after the index scan, iterative scans keep going until limit rows match
+        if is_filtered and self.iterative_scan:
+            await session.execute(sql_text(f"SET LOCAL hnsw.iterative_scan = '{self.iterative_scan}'"))
+            await session.execute(sql_text(f"SET LOCAL ivfflat.iterative_scan = '{self.iterative_scan}'"))
+
+    def get_score_sql(self, distance_sql: str):
+        if self.distance_operator == PgVectorDistanceOperatorEnums.DOT.value:
+            # <#> returns the negative inner product
+            return f'({distance_sql}) * -1'
+        if self.distance_operator == PgVectorDistanceOperatorEnums.L2.value:
+            return f'1 / (1 + ({distance_sql}))'
+        return f'1 - ({distance_sql})'
+
     
     async def insert_one(self, collection_name: str, text: str, vector: list,
                             metadata: dict = None,
@@ -212,8 +940,6 @@ class PGVectorProvider(VectorDBInterface):
                     'chunk_id': record_id
                 })
                 await session.commit()
-
-                await self.create_vector_index(collection_name=collection_name)
         
         return True
     
@@ -230,10 +956,23 @@ class PGVectorProvider(VectorDBInterface):
         if len(vectors) != len(record_ids):
             self.logger.error(f"Invalid data items for collection: {collection_name}")
             return False
+
+        embedding_size = await self.get_collection_embedding_size(collection_name=collection_name)
+        if vectors and embedding_size and len(vectors[0]) != embedding_size:
+            self.logger.error(f"Vector size {len(vectors[0])} does not match collection {collection_name} ({embedding_size})")
+            return False
         
         if not metadata or len(metadata) == 0:
             metadata = [None] * len(texts)
-        
+
+        if self.insert_mode == PgVectorInsertModeEnums.COPY.value:
+            _ = await self.copy_many(collection_name=collection_name, texts=texts,
+                                     vectors=vectors, metadata=metadata,
+                                     record_ids=record_ids)
+
+            return True
+
+        start_time = time.perf_counter()
         async with self.db_client() as session:
             async with session.begin():
                 for i in range(0, len(texts), batch_size):
@@ -263,34 +1002,323 @@ class PGVectorProvider(VectorDBInterface):
                     
                     await session.execute(batch_insert_sql, values)
 
-        await self.create_vector_index(collection_name=collection_name)
+        self.log_insert_rate(collection_name=collection_name, records_count=len(texts),
+                             elapsed=time.perf_counter() - start_time, mode=PgVectorInsertModeEnums.INSERT.value)
 
         return True
+
+    @staticmethod
+    def encode_vector_binary(vector) -> bytes:
+        # pgvector binary wire format: int16 dim, int16 unused, dim * float4 (big-endian)
+        vector = np.asarray(vector, dtype=">f4")
+        return struct.pack(">HH", vector.shape[0], 0) + vector.tobytes()
+
+    @staticmethod
+    def decode_vector_binary(data: bytes) -> list:
+        dim, _ = struct.unpack_from(">HH", data)
+        return np.frombuffer(data, dtype=">f4", count=dim, offset=4).astype(np.float32).tolist()
+
+    async def get_copy_connection(self, session):
+        connection = await session.connection()
+        raw_connection = await connection.get_raw_connection()
+        driver_connection = raw_connection.driver_connection
+
+        await driver_connection.set_type_codec(
+            "vector",
+            encoder=self.encode_vector_binary,
+            decoder=self.decode_vector_binary,
+            schema="public",
+            format="binary",
+        )
+
+        return driver_connection
+
+    async def copy_many(self, collection_name: str, texts: list,
+                        vectors: list, metadata: list,
+                        record_ids: list, batch_size: int = None):
+
+        batch_size = batch_size if batch_size else self.copy_batch_size
+        columns = [
+            PgVectorTableSchemeEnums.TEXT.value,
+            PgVectorTableSchemeEnums.VECTOR.value,
+            PgVectorTableSchemeEnums.METADATA.value,
+            PgVectorTableSchemeEnums.CHUNK_ID.value,
+        ]
+
+        start_time = time.perf_counter()
+        async with self.db_client() as session:
+            async with session.begin():
+                driver_connection = await self.get_copy_connection(session)
+
+                try:
+                    # the SQLAlchemy transaction only begins on its first statement, so the COPY
+                    # batches get their own: a failure rolls back the whole load instead of
+                    # leaving the batches before it in place when the page is inserted again
+                    async with driver_connection.transaction():
+                        for i in range(0, len(texts), batch_size):
+                            batch_vectors = np.asarray(vectors[i:i + batch_size], dtype=np.float32)
+
+                            records = [
+                                (
+                                    _text,
+                                    _vector,
+                                    json.dumps(_metadata, ensure_ascii=False) if _metadata is not None else "{}",
+                                    _record_id,
+                                )
+                                for _text, _vector, _metadata, _record_id in zip(
+                                    texts[i:i + batch_size], batch_vectors,
+                                    metadata[i:i + batch_size], record_ids[i:i + batch_size]
+                                )
+                            ]
+
+                            await driver_connection.copy_records_to_table(
+                                collection_name, records=records, columns=columns
+                            )
+                finally:
+                    # pooled connections go back to the other queries, which bind vectors as text
+                    await driver_connection.reset_type_codec("vector", schema="public")
+
+        self.log_insert_rate(collection_name=collection_name, records_count=len(texts),
+                             elapsed=time.perf_counter() - start_time, mode=PgVectorInsertModeEnums.COPY.value)
+
+        return len(texts)
+
+    def log_insert_rate(self, collection_name: str, records_count: int, elapsed: float, mode: str):
+        rate = records_count / elapsed if elapsed > 0 else float("inf")
+        self.logger.info(
+            f"Inserted {records_count} records into {collection_name} using {mode} "
+            f"in {elapsed:.2f}s ({rate:.0f} rows/sec)"
+        )
     
-    async def search_by_vector(self, collection_name: str, vector: list, limit: int):
+    async def delete_records(self, collection_name: str, record_ids: list, batch_size: int = 1000):
+
+        is_collection_existed = await self.is_collection_existed(collection_name=collection_name)
+        if not is_collection_existed:
+            return False
+
+        async with self.db_client() as session:
+            async with session.begin():
+                delete_sql = sql_text(f'DELETE FROM {collection_name} '
+                                      f'WHERE {PgVectorTableSchemeEnums.CHUNK_ID.value} = ANY(:record_ids)')
+
+                for i in range(0, len(record_ids), batch_size):
+                    await session.execute(delete_sql, {"record_ids": list(record_ids[i:i + batch_size])})
+
+        return True
+
+    async def get_last_record_id(self, collection_name: str) -> int:
+
+        is_collection_existed = await self.is_collection_existed(collection_name=collection_name)
+        if not is_collection_existed:
+            return 0
+
+        async with self.db_client() as session:
+            async with session.begin():
+                max_sql = sql_text(f'SELECT MAX({PgVectorTableSchemeEnums.CHUNK_ID.value}) FROM {collection_name}')
+                result = await session.execute(max_sql)
+                last_record_id = result.scalar_one_or_none()
+
+        return last_record_id if last_record_id else 0
+
+    async def search_by_vector(self, collection_name: str, vector: list, limit: int,
+                               search_params: dict = None, metadata_filter: list = None):
 
         is_collection_existed = await self.is_collection_existed(collection_name=collection_name)
         if not is_collection_existed:
             self.logger.error(f"Can not search for records in a non-existed collection: {collection_name}")
             return False
         
+        if metadata_filter:
+            await self.ensure_metadata_indexes(collection_name=collection_name)
+
         vector = "[" + ",".join([ str(v) for v in vector ]) + "]"
+        filter_sql, filter_params = self.get_metadata_filter_sql(metadata_filter)
+        index_config = await self.get_index_config(collection_name=collection_name)
+        oversample_limit = self.get_oversample_limit(index_config=index_config, limit=limit)
+        candidates_sql = self.get_vector_candidates_sql(
+            collection_name=collection_name, index_config=index_config,
+            embedding_size=await self.get_collection_embedding_size(collection_name=collection_name),
+            filter_sql=filter_sql,
+        )
+
         async with self.db_client() as session:
             async with session.begin():
-                search_sql = sql_text(f'SELECT {PgVectorTableSchemeEnums.TEXT.value} as text, 1 - ({PgVectorTableSchemeEnums.VECTOR.value} <=> :vector) as score'
-                                      f' FROM {collection_name}'
-                                      ' ORDER BY score DESC '
-                                      f'LIMIT {limit}'
+                await self.apply_search_params(session=session, limit=oversample_limit, search_params=search_params,
+                                               is_filtered=bool(metadata_filter))
+
+                # ordering by the raw distance expression lets the planner use the ANN index
+                search_sql = sql_text(f'SELECT text, chunk_id, metadata, {self.get_score_sql("distance")} as score'
+                                      f' FROM ({candidates_sql}) c'
+                                      f' ORDER BY distance'
                                       )
                 
-                result = await session.execute(search_sql, {"vector": vector})
+                result = await session.execute(search_sql, {"vector": vector, "limit": int(limit),
+                                                            "oversample_limit": oversample_limit,
+                                                            **filter_params})
 
                 records = result.fetchall()
 
                 return [
-                    RetrievedDocument(
-                        text=record.text,
-                        score=record.score
-                    )
+                    self.build_retrieved_document(record)
                     for record in records
                 ]
+
+    async def search_hybrid(self, collection_name: str, vector: list, query_text: str, limit: int,
+                            search_params: dict = None, metadata_filter: list = None):
+
+        is_collection_existed = await self.is_collection_existed(collection_name=collection_name)
+        if not is_collection_existed:
+            self.logger.error(f"Can not search for records in a non-existed collection: {collection_name}")
+            return False
+
+        await self.ensure_lexical_index(collection_name=collection_name)
+        if metadata_filter:
+            await self.ensure_metadata_indexes(collection_name=collection_name)
+
+        candidates = max(limit, self.hybrid_candidates)
+        vector = "[" + ",".join([ str(v) for v in vector ]) + "]"
+        filter_sql, filter_params = self.get_metadata_filter_sql(metadata_filter)
+        index_config = await self.get_index_config(collection_name=collection_name)
+        oversample_limit = self.get_oversample_limit(index_config=index_config, limit=candidates)
+        candidates_sql = self.get_vector_candidates_sql(
+            collection_name=collection_name, index_config=index_config,
+            embedding_size=await self.get_collection_embedding_size(collection_name=collection_name),
+            limit_param="candidates", filter_sql=filter_sql,
+        )
+
+        # both candidate lists are ranked in one statement and fused with reciprocal rank
+        # fusion; the lexical query ORs the normalized terms so any matching term counts
+        id_col = PgVectorTableSchemeEnums.ID.value
+        text_col = PgVectorTableSchemeEnums.TEXT.value
+        lexical_col = PgVectorTableSchemeEnums.LEXICAL.value
+
+        hybrid_sql = sql_text(
+            f'WITH query AS ('
+            f"  SELECT replace(plainto_tsquery('{self.text_search_config}'::regconfig, "
+            f"misrlex_normalize_ar(:query_text))::text, '&', '|')::tsquery AS q"
+            f'), semantic AS ('
+            f'  SELECT id, ROW_NUMBER() OVER (ORDER BY distance) AS rank'
+            f'  FROM ({candidates_sql}) s'
+            f'), lexical AS ('
+            f'  SELECT {id_col} AS id, ROW_NUMBER() OVER (ORDER BY ts_rank_cd({lexical_col}, query.q) DESC) AS rank'
+            f'  FROM {collection_name}, query'
+            f'  WHERE {lexical_col} @@ query.q AND {filter_sql}'
+            f'  ORDER BY ts_rank_cd({lexical_col}, query.q) DESC LIMIT :candidates'
+            f'), fused AS ('
+            f'  SELECT COALESCE(semantic.id, lexical.id) AS id,'
+            f'         COALESCE(1.0 / (:rrf_k + semantic.rank), 0) + COALESCE(1.0 / (:rrf_k + lexical.rank), 0) AS score'
+            f'  FROM semantic FULL OUTER JOIN lexical ON semantic.id = lexical.id'
+            f'  ORDER BY score DESC LIMIT :limit'
+            f')'
+            f' SELECT c.{text_col} AS text, c.{PgVectorTableSchemeEnums.CHUNK_ID.value} AS chunk_id,'
+            f' c.{PgVectorTableSchemeEnums.METADATA.value} AS metadata, fused.score AS score'
+            f' FROM fused JOIN {collection_name} c ON c.{id_col} = fused.id'
+            f' ORDER BY fused.score DESC'
+        )
+
+        async with self.db_client() as session:
+            async with session.begin():
+                await self.apply_search_params(session=session, limit=oversample_limit, search_params=search_params,
+                                               is_filtered=bool(metadata_filter))
+
+                result = await session.execute(hybrid_sql, {
+                    **filter_params,
+                    "vector": vector,
+                    "query_text": query_text,
+                    "candidates": candidates,
+                    "oversample_limit": oversample_limit,
+                    "rrf_k": self.hybrid_rrf_k,
+                    "limit": limit,
+                })
+
+                records = result.fetchall()
+
+                return [
+                    self.build_retrieved_document(record)
+                    for record in records
+                ]
+
+    def get_vector_bytes(self, embedding_size: int, quantization: str = None):
+        # per-vector storage: float32, halfvec float16 or one bit per dimension (+ varlena header)
+        if quantization == VectorQuantizationEnums.SCALAR.value:
+            return 2 * embedding_size + 8
+        if quantization == VectorQuantizationEnums.BINARY.value:
+            return int(np.ceil(embedding_size / 8)) + 8
+        return 4 * embedding_size + 8
+
+    async def evaluate_quantization(self, collection_name: str, sample_size: int = 20, limit: int = 10) -> dict:
+
+        is_collection_existed = await self.is_collection_existed(collection_name=collection_name)
+        if not is_collection_existed:
+            return None
+
+        index_config = await self.get_index_config(collection_name=collection_name)
+        embedding_size = await self.get_collection_embedding_size(collection_name=collection_name)
+        oversample_limit = self.get_oversample_limit(index_config=index_config, limit=limit)
+        vector_col = PgVectorTableSchemeEnums.VECTOR.value
+
+        # stored vectors double as queries; recall is the overlap of the production search
+        # path with an exact full precision scan
+        candidates_sql = sql_text(self.get_vector_candidates_sql(collection_name=collection_name,
+                                                                 index_config=index_config,
+                                                                 embedding_size=embedding_size))
+        exact_sql = sql_text(f'SELECT {PgVectorTableSchemeEnums.ID.value} AS id FROM {collection_name} '
+                             f'ORDER BY {vector_col} {self.distance_operator} CAST(:vector AS vector) LIMIT :limit')
+
+        async with self.db_client() as session:
+            async with session.begin():
+                sample_sql = sql_text(f'SELECT {vector_col}::text FROM {collection_name} ORDER BY random() LIMIT :sample_size')
+                query_vectors = (await session.execute(sample_sql, {"sample_size": sample_size})).scalars().all()
+
+        recalls, search_elapsed, exact_elapsed = [], 0.0, 0.0
+        for query_vector in query_vectors:
+            params = {"vector": query_vector, "limit": limit, "oversample_limit": oversample_limit}
+
+            async with self.db_client() as session:
+                async with session.begin():
+                    await self.apply_search_params(session=session, limit=oversample_limit)
+                    start_time = time.perf_counter()
+                    found_ids = set((await session.execute(candidates_sql, params)).scalars().all())
+                    search_elapsed += time.perf_counter() - start_time
+
+            async with self.db_client() as session:
+                async with session.begin():
+                    await session.execute(sql_text('SET LOCAL enable_indexscan = off'))
+                    start_time = time.perf_counter()
+                    exact_ids = set((await session.execute(exact_sql, params)).scalars().all())
+                    exact_elapsed += time.perf_counter() - start_time
+
+            if exact_ids:
+                recalls.append(len(found_ids & exact_ids) / len(exact_ids))
+
+        # the full precision column stays in the table (it is used for rescoring), so a quantized
+        # index is extra storage: actual sizes are reported, the per-vector figures are estimates
+        # of what the index holds compared with a full precision index
+        async with self.db_client() as session:
+            async with session.begin():
+                size_sql = sql_text('SELECT pg_relation_size(to_regclass(:index_name)), pg_table_size(to_regclass(:table_name))')
+                index_size, table_size = (await session.execute(size_sql, {
+                    "index_name": self.default_index_name(collection_name),
+                    "table_name": collection_name,
+                })).one()
+
+        records_count = await self.get_estimated_records_count(collection_name=collection_name)
+        quantization = index_config.get("quantization") if self.is_quantized(index_config) else None
+        full_vectors_bytes = records_count * self.get_vector_bytes(embedding_size)
+        indexed_vectors_bytes = records_count * self.get_vector_bytes(embedding_size, quantization)
+
+        return {
+            "quantization": quantization or VectorQuantizationEnums.NONE.value,
+            "oversample_limit": oversample_limit,
+            "sample_size": len(query_vectors),
+            "limit": limit,
+            "recall": round(float(np.mean(recalls)), 4) if recalls else None,
+            "search_latency_ms": round(1000 * search_elapsed / max(len(query_vectors), 1), 2),
+            "exact_latency_ms": round(1000 * exact_elapsed / max(len(query_vectors), 1), 2),
+            "records_count": records_count,
+            "index_size_bytes": index_size,
+            "table_size_bytes": table_size,
+            "estimated_full_precision_index_vectors_bytes": full_vectors_bytes,
+            "estimated_index_vectors_bytes": indexed_vectors_bytes,
+            "estimated_index_bytes_saved": full_vectors_bytes - indexed_vectors_bytes,
+        }
@@ -1,88 +1,245 @@
-from qdrant_client import models, QdrantClient
+from qdrant_client import models, AsyncQdrantClient
 from ..VectorDBInterface import VectorDBInterface
-from ..VectorDBEnums import DistanceMethodEnums
+from ..VectorDBEnums import DistanceMethodEnums, VectorQuantizationEnums
+from ..MetadataFilter import MetadataFilter
+from collections import Counter
+import numpy as np
+import asyncio
 import logging
+import re
+import time
+import zlib
 from typing import List
 from models.db_schemas import RetrievedDocument
 
+ARABIC_NORMALIZATION_TABLE = str.maketrans(
+    "أإآٱىة٠١٢٣٤٥٦٧٨٩۰۱۲۳۴۵۶۷۸۹",
+    "اااايه01234567890123456789",
+)
+
+# named sparse vector of hashed chunk terms, ranked with BM25 for hybrid search
+LEXICAL_VECTOR_NAME = "lexical"
+LEXICAL_BM25_K1 = 1.2
+
 class QdrantDBProvider(VectorDBInterface):
 
     def __init__(self, db_client: str, default_vector_size: int = 512,
-                                     distance_method: str = None, index_threshold: int=100):
+                                     distance_method: str = None, index_threshold: int=100,
+                                     hybrid_candidates: int = 50, hybrid_rrf_k: int = 60,
+                                     url: str = None, api_key: str = None,
+                                     prefer_grpc: bool = True, grpc_port: int = 6334,
+                                     upsert_batch_size: int = 256, upsert_parallel: int = 4,
+                                     upsert_wait: bool = True,
+                                     quantization: str = VectorQuantizationEnums.NONE.value,
+                                     quantization_oversample: float = 4.0,
+                                     metadata_range_fields: list = None):
 
         self.client = None
+        # local storage path, used when no server url is configured
         self.db_client = db_client
+        self.url = url
+        self.api_key = api_key
+        self.prefer_grpc = prefer_grpc
+        self.grpc_port = grpc_port
+
+        self.upsert_batch_size = upsert_batch_size
+        self.upsert_parallel = max(1, upsert_parallel)
+        self.upsert_wait = upsert_wait
+
+        self.quantization = quantization
+        self.quantization_oversample = quantization_oversample
+
+        # payload indexes for filtered search: asset_id plus the numeric range fields
+        self.metadata_range_fields = metadata_range_fields or []
+
         self.distance_method = None
         self.default_vector_size = default_vector_size
+        self.hybrid_candidates = hybrid_candidates
+        self.hybrid_rrf_k = hybrid_rrf_k
+        # collection name -> has the lexical sparse vector (collections created before it don't)
+        self.lexical_vector_collections = {}
+
+        # qdrant's default optimizer threshold (KB of vectors before a segment gets an HNSW index)
+        self.indexing_threshold = 20000
 
         if distance_method == DistanceMethodEnums.COSINE.value:
             self.distance_method = models.Distance.COSINE
         elif distance_method == DistanceMethodEnums.DOT.value:
             self.distance_method = models.Distance.DOT
+        elif distance_method == DistanceMethodEnums.L2.value:
+            self.distance_method = models.Distance.EUCLID
 
         self.logger = logging.getLogger('uvicorn')
 
     async def connect(self):
-        self.client = QdrantClient(path=self.db_client)
+        if self.url:
+            self.client = AsyncQdrantClient(url=self.url, api_key=self.api_key,
+                                            prefer_grpc=self.prefer_grpc, grpc_port=self.grpc_port)
+        else:
+            self.client = AsyncQdrantClient(path=self.db_client)
 
     async def disconnect(self):
+        if self.client:
+            await self.client.close()
         self.client = None
 
     async def is_collection_existed(self, collection_name: str) -> bool:
-        return self.client.collection_exists(collection_name=collection_name)
+        return await self.client.collection_exists(collection_name=collection_name)
     
     async def list_all_collections(self) -> List:
-        return self.client.get_collections()
+        return await self.client.get_collections()
     
-    def get_collection_info(self, collection_name: str) -> dict:
-        return self.client.get_collection(collection_name=collection_name)
+    async def get_collection_info(self, collection_name: str, exact: bool = False) -> dict:
+        if not await self.is_collection_existed(collection_name):
+            return None
+
+        collection_info = await self.client.get_collection(collection_name=collection_name)
+        if exact:
+            count_result = await self.client.count(collection_name=collection_name, exact=True)
+            collection_info.points_count = count_result.count
+
+        return collection_info
     
     async def delete_collection(self, collection_name: str):
-        if self.is_collection_existed(collection_name):
+        self.lexical_vector_collections.pop(collection_name, None)
+        if await self.is_collection_existed(collection_name):
             self.logger.info(f"Deleting collection: {collection_name}")
-            return self.client.delete_collection(collection_name=collection_name)
+            return await self.client.delete_collection(collection_name=collection_name)
         
+    def get_quantization_config(self, quantization: str):
+        # quantized vectors stay in RAM, the originals can live on disk for rescoring
+        if quantization == VectorQuantizationEnums.SCALAR.value:
+            return models.ScalarQuantization(
+                scalar=models.ScalarQuantizationConfig(type=models.ScalarType.INT8, quantile=0.99,
+                                                       always_ram=True)
+            )
+        if quantization == VectorQuantizationEnums.BINARY.value:
+            return models.BinaryQuantization(binary=models.BinaryQuantizationConfig(always_ram=True))
+        return None
+
+    def get_quantization_name(self, quantization_config) -> str:
+        if isinstance(quantization_config, models.ScalarQuantization):
+            return VectorQuantizationEnums.SCALAR.value
+        if isinstance(quantization_config, models.BinaryQuantization):
+            return VectorQuantizationEnums.BINARY.value
+        return VectorQuantizationEnums.NONE.value
+
     async def create_collection(self, collection_name: str, 
                                 embedding_size: int,
-                                do_reset: bool = False):
+                                do_reset: bool = False,
+                                quantization: str = None):
         if do_reset:
-            _ = self.delete_collection(collection_name=collection_name)
+            _ = await self.delete_collection(collection_name=collection_name)
         
-        if not self.is_collection_existed(collection_name):
+        if not await self.is_collection_existed(collection_name):
             self.logger.info(f"Creating new Qdrant collection: {collection_name}")
+
+            quantization_config = self.get_quantization_config(quantization or self.quantization)
             
-            _ = self.client.create_collection(
+            _ = await self.client.create_collection(
                 collection_name=collection_name,
                 vectors_config=models.VectorParams(
                     size=embedding_size,
-                    distance=self.distance_method
+                    distance=self.distance_method,
+                    on_disk=quantization_config is not None,
+                ),
+                quantization_config=quantization_config,
+                # term frequencies are stored per point, qdrant applies the IDF at query time
+                sparse_vectors_config={
+                    LEXICAL_VECTOR_NAME: models.SparseVectorParams(modifier=models.Modifier.IDF),
+                },
+            )
+            self.lexical_vector_collections[collection_name] = True
+
+            # ordered lookups of the last indexed chunk
+            _ = await self.client.create_payload_index(
+                collection_name=collection_name,
+                field_name="chunk_id",
+                field_schema=models.PayloadSchemaType.INTEGER,
+            )
+
+            # metadata filters
+            _ = await self.client.create_payload_index(
+                collection_name=collection_name,
+                field_name="metadata.asset_id",
+                field_schema=models.PayloadSchemaType.INTEGER,
+            )
+            for field in self.metadata_range_fields:
+                _ = await self.client.create_payload_index(
+                    collection_name=collection_name,
+                    field_name=f"metadata.{field}",
+                    field_schema=models.PayloadSchemaType.FLOAT,
                 )
+
+            # full-text index over the normalized chunk text for hybrid search
+            _ = await self.client.create_payload_index(
+                collection_name=collection_name,
+                field_name="lexical",
+                field_schema=models.TextIndexParams(
+                    type=models.TextIndexType.TEXT,
+                    tokenizer=models.TokenizerType.MULTILINGUAL,
+                    lowercase=True,
+                ),
             )
 
             return True
         
         return False
+
+    async def has_lexical_vector(self, collection_name: str) -> bool:
+        if collection_name not in self.lexical_vector_collections:
+            collection_info = await self.client.get_collection(collection_name=collection_name)
+            sparse_vectors = collection_info.config.params.sparse_vectors or {}
+            self.lexical_vector_collections[collection_name] = LEXICAL_VECTOR_NAME in sparse_vectors
+
+        return self.lexical_vector_collections[collection_name]
+
+    def get_lexical_terms(self, text: str) -> list:
+        return re.findall(r'\w+', self.normalize_text(text))
+
+    def get_sparse_vector(self, text: str, is_query: bool = False):
+        # terms hashed to stable ids; documents carry a BM25 saturated term frequency and the
+        # query a unit weight per term, so the IDF-weighted dot product is the BM25 score
+        # (without document length normalization)
+        term_counts = Counter(zlib.crc32(term.encode("utf-8")) for term in self.get_lexical_terms(text))
+
+        return models.SparseVector(
+            indices=list(term_counts.keys()),
+            values=[
+                1.0 if is_query else count * (LEXICAL_BM25_K1 + 1) / (count + LEXICAL_BM25_K1)
+                for count in term_counts.values()
+            ],
+        )
+
+    def build_point(self, record_id: int, text: str, vector: list, metadata: dict = None,
+                    lexical_vector: bool = False):
+        if lexical_vector:
+            vector = { "": vector, LEXICAL_VECTOR_NAME: self.get_sparse_vector(text) }
+
+        return models.PointStruct(
+            id=record_id,
+            vector=vector,
+            payload={
+                "text": text, "metadata": metadata, "chunk_id": record_id,
+                "lexical": self.normalize_text(text)
+            }
+        )
     
     async def insert_one(self, collection_name: str, text: str, vector: list,
                          metadata: dict = None, 
                          record_id: str = None):
         
-        if not self.is_collection_existed(collection_name):
+        if not await self.is_collection_existed(collection_name):
             self.logger.error(f"Can not insert new record to non-existed collection: {collection_name}")
             return False
         
         try:
-            _ = self.client.upload_records(
+            lexical_vector = await self.has_lexical_vector(collection_name)
+            _ = await self.client.upsert(
                 collection_name=collection_name,
-                records=[
-                    models.Record(
-                        id=[record_id],
-                        vector=vector,
-                        payload={
-                            "text": text, "metadata": metadata
-                        }
-                    )
-                ]
+                points=[ self.build_point(record_id=record_id, text=text, vector=vector, metadata=metadata,
+                                          lexical_vector=lexical_vector) ],
+                wait=self.upsert_wait,
             )
         except Exception as e:
             self.logger.error(f"Error while inserting batch: {e}")
@@ -92,7 +249,12 @@ class QdrantDBProvider(VectorDBInterface):
     
     async def insert_many(self, collection_name: str, texts: list, 
                           vectors: list, metadata: list = None, 
-                          record_ids: list = None, batch_size: int = 50):
+                          record_ids: list = None, batch_size: int = None):
+
+        # batches are upserted concurrently, upsert_parallel requests in flight at most.
+        # wait=True returns once the points are applied (searchable), wait=False once they
+        # are accepted into the WAL
+        batch_size = batch_size if batch_size else self.upsert_batch_size
         
         if metadata is None:
             metadata = [None] * len(texts)
@@ -100,52 +262,372 @@ class QdrantDBProvider(VectorDBInterface):
         if record_ids is None:
             record_ids = list(range(0, len(texts)))
 
-        for i in range(0, len(texts), batch_size):
-            batch_end = i + batch_size
-
-            batch_texts = texts[i:batch_end]
-            batch_vectors = vectors[i:batch_end]
-            batch_metadata = metadata[i:batch_end]
-            batch_record_ids = record_ids[i:batch_end]
-
-            batch_records = [
-                models.Record(
-                    id=batch_record_ids[x],
-                    vector=batch_vectors[x],
-                    payload={
-                        "text": batch_texts[x], "metadata": batch_metadata[x]
-                    }
-                )
+        semaphore = asyncio.Semaphore(self.upsert_parallel)
+        lexical_vector = False
 
-                for x in range(len(batch_texts))
+        async def upsert_batch(start: int):
+            batch_end = start + batch_size
+            points = [
+                self.build_point(record_id=record_id, text=text, vector=vector, metadata=meta,
+                                 lexical_vector=lexical_vector)
+                for record_id, text, vector, meta in zip(record_ids[start:batch_end], texts[start:batch_end],
+                                                         vectors[start:batch_end], metadata[start:batch_end])
             ]
 
-            try:
-                _ = self.client.upload_records(
+            async with semaphore:
+                await self.client.upsert(
                     collection_name=collection_name,
-                    records=batch_records,
+                    points=points,
+                    wait=self.upsert_wait,
                 )
-            except Exception as e:
-                self.logger.error(f"Error while inserting batch: {e}")
-                return False
+
+        try:
+            lexical_vector = await self.has_lexical_vector(collection_name)
+            await asyncio.gather(*[ upsert_batch(i) for i in range(0, len(texts), batch_size) ])
+        except Exception as e:
+            self.logger.error(f"Error while inserting batch: {e}")
+            return False
 
         return True
         
-    async def search_by_vector(self, collection_name: str, vector: list, limit: int = 5):
+    def normalize_text(self, text: str) -> str:
+        # same normalization as the pgvector lexical column: drop diacritics and tatweel,
+        # unify alef/yaa/taa marbuta forms and map Arabic-Indic digits
+        text = re.sub(r'[\u064B-\u065F\u0670\u0640]', '', text or '')
+        return text.translate(ARABIC_NORMALIZATION_TABLE).lower()
+
+    async def delete_records(self, collection_name: str, record_ids: list):
+
+        if not await self.is_collection_existed(collection_name):
+            return False
+
+        _ = await self.client.delete(
+            collection_name=collection_name,
+            points_selector=models.PointIdsList(points=list(record_ids)),
+            wait=True,
+        )
+
+        return True
+
+    async def get_last_record_id(self, collection_name: str) -> int:
 
-        results = self.client.search(
+        if not await self.is_collection_existed(collection_name):
+            return 0
+
+        points, _ = await self.client.scroll(
             collection_name=collection_name,
-            query_vector=vector,
-            limit=limit
+            limit=1,
+            order_by=models.OrderBy(key="chunk_id", direction=models.Direction.DESC),
+            with_payload=False,
+            with_vectors=False,
+        )
+
+        return points[0].id if points else 0
+
+    async def defer_vector_index(self, collection_name: str) -> bool:
+        # indexing_threshold=0 turns off HNSW building until the bulk load is done
+        if not await self.is_collection_existed(collection_name):
+            return False
+
+        _ = await self.client.update_collection(
+            collection_name=collection_name,
+            optimizers_config=models.OptimizersConfigDiff(indexing_threshold=0),
+        )
+
+        return True
+
+    async def build_vector_index(self, collection_name: str) -> bool:
+        if not await self.is_collection_existed(collection_name):
+            return False
+
+        _ = await self.client.update_collection(
+            collection_name=collection_name,
+            optimizers_config=models.OptimizersConfigDiff(indexing_threshold=self.indexing_threshold),
+        )
+
+        return True
+
+    async def get_index_build_progress(self, collection_name: str) -> dict:
+        if not await self.is_collection_existed(collection_name):
+            return { "in_progress": False, "is_index_existed": False }
+
+        collection_info = await self.client.get_collection(collection_name=collection_name)
+        points_count = collection_info.points_count or 0
+        indexed_count = collection_info.indexed_vectors_count or 0
+
+        return {
+            "in_progress": collection_info.status != models.CollectionStatus.GREEN,
+            "phase": collection_info.status.value,
+            "tuples_done": indexed_count,
+            "tuples_total": points_count,
+            "progress": round(indexed_count / points_count, 4) if points_count else None,
+        }
+
+    def get_search_params(self, search_params: dict = None, exact: bool = False):
+        # only ef_search maps to qdrant (hnsw_ef); probes is pgvector ivfflat specific.
+        # Quantization params are ignored by collections without quantization
+        ef_search = (search_params or {}).get("ef_search")
+
+        return models.SearchParams(
+            hnsw_ef=int(ef_search) if ef_search else None,
+            exact=exact,
+            quantization=models.QuantizationSearchParams(
+                ignore=exact,
+                rescore=True,
+                oversampling=max(1.0, self.quantization_oversample),
+            ),
+        )
+
+    async def get_index_config(self, collection_name: str) -> dict:
+        if not await self.is_collection_existed(collection_name):
+            return {}
+
+        collection_info = await self.client.get_collection(collection_name=collection_name)
+        hnsw_config = collection_info.config.hnsw_config
+
+        return {
+            "index_type": "hnsw",
+            "m": hnsw_config.m,
+            "ef_construction": hnsw_config.ef_construct,
+            "quantization": self.get_quantization_name(collection_info.config.quantization_config),
+            "oversample": self.quantization_oversample,
+        }
+
+    async def set_index_config(self, collection_name: str, index_config: dict) -> bool:
+
+        if not await self.is_collection_existed(collection_name):
+            return False
+
+        index_type = index_config.get("index_type")
+        if index_type and index_type != "hnsw":
+            self.logger.error(f"Unsupported qdrant index type: {index_type}")
+            return False
+
+        quantization = index_config.get("quantization")
+        if quantization and quantization not in [ q.value for q in VectorQuantizationEnums ]:
+            self.logger.error(f"Unsupported quantization: {quantization}")
+            return False
+
+        if quantization:
+            _ = await self.client.update_collection(
+                collection_name=collection_name,
+                quantization_config=self.get_quantization_config(quantization) or models.Disabled.DISABLED,
+            )
+
+        _ = await self.client.update_collection(
+            collection_name=collection_name,
+            hnsw_config=models.HnswConfigDiff(
+                m=index_config.get("m"),
+                ef_construct=index_config.get("ef_construction"),
+            ),
+        )
+
+        return True
+
+    def get_metadata_filter(self, metadata_filter: list = None):
+        # compiles MetadataFilter conditions into a qdrant payload filter
+        if not metadata_filter:
+            return None
+
+        must, must_not = [], []
+        range_operators = {
+            MetadataFilter.GT: "gt", MetadataFilter.GTE: "gte",
+            MetadataFilter.LT: "lt", MetadataFilter.LTE: "lte",
+        }
+
+        for field, operator, value in metadata_filter:
+            key = f"metadata.{field}"
+            if operator == MetadataFilter.EQ:
+                must.append(models.FieldCondition(key=key, match=models.MatchValue(value=value)))
+            elif operator == MetadataFilter.NE:
+                must_not.append(models.FieldCondition(key=key, match=models.MatchValue(value=value)))
+            elif operator == MetadataFilter.IN:
+                must.append(models.FieldCondition(key=key, match=models.MatchAny(any=value)))
+            else:
+                must.append(models.FieldCondition(key=key, range=models.Range(**{ range_operators[operator]: value })))
+
+        return models.Filter(must=must or None, must_not=must_not or None)
+
+    def build_retrieved_document(self, point, score: float):
+        metadata = point.payload.get("metadata") or {}
+
+        return RetrievedDocument(**{
+            "score": score,
+            "text": point.payload["text"],
+            "chunk_id": point.payload.get("chunk_id", point.id),
+            "asset_id": metadata.get("asset_id"),
+            "metadata": metadata,
+        })
+
+    async def query_by_vector(self, collection_name: str, vector: list, limit: int,
+                              search_params: dict = None, exact: bool = False,
+                              metadata_filter: list = None):
+        response = await self.client.query_points(
+            collection_name=collection_name,
+            query=vector,
+            limit=limit,
+            query_filter=self.get_metadata_filter(metadata_filter),
+            search_params=self.get_search_params(search_params, exact=exact),
+            with_payload=True,
+        )
+
+        return response.points
+
+    async def search_by_vector(self, collection_name: str, vector: list, limit: int = 5,
+                               search_params: dict = None, metadata_filter: list = None):
+
+        results = await self.query_by_vector(
+            collection_name=collection_name,
+            vector=vector,
+            limit=limit,
+            search_params=search_params,
+            metadata_filter=metadata_filter,
         )
 
         if not results or len(results) == 0:
             return None
         
         return [
-            RetrievedDocument(**{
-                "score": result.score,
-                "text": result.payload["text"],
-            })
+            self.build_retrieved_document(result, score=result.score)
             for result in results
         ]
+
+    async def evaluate_quantization(self, collection_name: str, sample_size: int = 20, limit: int = 10) -> dict:
+
+        if not await self.is_collection_existed(collection_name):
+            return None
+
+        collection_info = await self.client.get_collection(collection_name=collection_name)
+        quantization = self.get_quantization_name(collection_info.config.quantization_config)
+        embedding_size = collection_info.config.params.vectors.size
+        points_count = collection_info.points_count or 0
+
+        # stored vectors double as queries; recall is the overlap of the production search
+        # path with an exact full precision search
+        sample_points, _ = await self.client.scroll(
+            collection_name=collection_name,
+            limit=sample_size,
+            with_payload=False,
+            with_vectors=True,
+        )
+
+        recalls, search_elapsed, exact_elapsed = [], 0.0, 0.0
+        for point in sample_points:
+            # the dense vector is named "" next to the lexical sparse vector
+            vector = point.vector.get("") if isinstance(point.vector, dict) else point.vector
+
+            start_time = time.perf_counter()
+            found_points = await self.query_by_vector(collection_name=collection_name,
+                                                      vector=vector, limit=limit)
+            search_elapsed += time.perf_counter() - start_time
+
+            start_time = time.perf_counter()
+            exact_points = await self.query_by_vector(collection_name=collection_name,
+                                                      vector=vector, limit=limit, exact=True)
+            exact_elapsed += time.perf_counter() - start_time
+
+            exact_ids = { p.id for p in exact_points }
+            if exact_ids:
+                recalls.append(len({ p.id for p in found_points } & exact_ids) / len(exact_ids))
+
+        # float32 originals vs int8 (scalar) or one bit per dimension (binary) kept in RAM
+        full_vectors_bytes = points_count * 4 * embedding_size
+        indexed_vectors_bytes = full_vectors_bytes
+        if quantization == VectorQuantizationEnums.SCALAR.value:
+            indexed_vectors_bytes = points_count * embedding_size
+        elif quantization == VectorQuantizationEnums.BINARY.value:
+            indexed_vectors_bytes = points_count * int(np.ceil(embedding_size / 8))
+
+        return {
+            "quantization": quantization,
+            "oversample": self.quantization_oversample,
+            "sample_size": len(sample_points),
+            "limit": limit,
+            "recall": round(float(np.mean(recalls)), 4) if recalls else None,
+            "search_latency_ms": round(1000 * search_elapsed / max(len(sample_points), 1), 2),
+            "exact_latency_ms": round(1000 * exact_elapsed / max(len(sample_points), 1), 2),
+            "records_count": points_count,
+            "full_precision_vectors_bytes": full_vectors_bytes,
+            "indexed_vectors_bytes": indexed_vectors_bytes,
+            "memory_saved_bytes": full_vectors_bytes - indexed_vectors_bytes,
+        }
+
+    async def lexical_candidates(self, collection_name: str, query_text: str, limit: int,
+                                 metadata_filter: list = None):
+        terms = list(dict.fromkeys(self.get_lexical_terms(query_text)))
+        if not terms:
+            return []
+
+        # BM25 top-k over the lexical sparse vector
+        if await self.has_lexical_vector(collection_name):
+            response = await self.client.query_points(
+                collection_name=collection_name,
+                query=self.get_sparse_vector(query_text, is_query=True),
+                using=LEXICAL_VECTOR_NAME,
+                limit=limit,
+                query_filter=self.get_metadata_filter(metadata_filter),
+                with_payload=True,
+            )
+            return response.points
+
+        # collections created before the sparse vector: every full-text match is read, then
+        # ranked by how many query terms it contains and truncated
+        payload_filter = self.get_metadata_filter(metadata_filter) or models.Filter()
+        payload_filter.should = [
+            models.FieldCondition(key="lexical", match=models.MatchText(text=term))
+            for term in terms
+        ]
+
+        lexical_results, offset = [], None
+        while True:
+            points, offset = await self.client.scroll(
+                collection_name=collection_name,
+                scroll_filter=payload_filter,
+                limit=self.upsert_batch_size,
+                offset=offset,
+                with_payload=True,
+                with_vectors=False,
+            )
+            lexical_results.extend(points)
+            if offset is None:
+                break
+
+        return sorted(
+            lexical_results,
+            key=lambda point: sum(term in point.payload.get("lexical", "") for term in terms),
+            reverse=True,
+        )[:limit]
+
+    async def search_hybrid(self, collection_name: str, vector: list, query_text: str, limit: int = 5,
+                            search_params: dict = None, metadata_filter: list = None):
+
+        candidates = max(limit, self.hybrid_candidates)
+
+        semantic_results, lexical_results = await asyncio.gather(
+            self.query_by_vector(collection_name=collection_name, vector=vector,
+                                 limit=candidates, search_params=search_params,
+                                 metadata_filter=metadata_filter),
+            self.lexical_candidates(collection_name=collection_name, query_text=query_text,
+                                    limit=candidates, metadata_filter=metadata_filter),
+        )
+
+        fused_results = self.fuse_ranked_results([ semantic_results, lexical_results ], limit=limit)
+        if not fused_results:
+            return None
+
+        return [
+            self.build_retrieved_document(point, score=score)
+            for point, score in fused_results
+        ]
+
+    def fuse_ranked_results(self, ranked_results_lists: list, limit: int) -> list:
+        # reciprocal rank fusion, returns the top limit (point, score) pairs
+        scores, points = {}, {}
+        for ranked_results in ranked_results_lists:
+            for rank, point in enumerate(ranked_results, start=1):
+                scores[point.id] = scores.get(point.id, 0.0) + 1.0 / (self.hybrid_rrf_k + rank)
+                points[point.id] = point
+
+        fused_ids = sorted(scores, key=scores.get, reverse=True)[:limit]
+
+        return [ (points[point_id], scores[point_id]) for point_id in fused_ids ]
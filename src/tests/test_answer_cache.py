@@ -0,0 +1,66 @@
+import pytest
+
+AnswerCache = pytest.importorskip("stores.llm.AnswerCache").AnswerCache
+
+KEY = ("collection_1024_7", "en", "{}")
+
+
+def store(cache, query="q", vector=(1.0, 0.0), key=KEY, version=None, answer="answer"):
+    version = cache.get_version(key[0]) if version is None else version
+    return cache.set(key=key, query=query, query_vector=list(vector), version=version,
+                     answer=answer, full_prompt="prompt", chat_history=[])
+
+
+def test_hit_on_similar_query_and_miss_below_threshold():
+    cache = AnswerCache(similarity_threshold=0.95)
+    assert store(cache)
+
+    assert cache.get(KEY, [0.99, 0.05])["answer"] == "answer"
+    assert cache.get(KEY, [0.7, 0.7]) is None
+    assert cache.get(("collection_1024_8", "en", "{}"), [1.0, 0.0]) is None
+
+    stats = cache.get_stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 2, 1)
+
+def test_invalidate_drops_entries_and_bumps_version():
+    cache = AnswerCache()
+    other_key = ("collection_1024_8", "en", "{}")
+    store(cache)
+    store(cache, key=other_key)
+
+    cache.invalidate(KEY[0])
+
+    assert cache.get_version(KEY[0]) == 1
+    assert cache.get(KEY, [1.0, 0.0]) is None
+    assert cache.get(other_key, [1.0, 0.0]) is not None
+
+def test_answer_generated_before_a_write_is_not_stored():
+    cache = AnswerCache()
+    version = cache.get_version(KEY[0])
+
+    cache.invalidate(KEY[0])
+
+    assert not store(cache, version=version)
+    assert cache.get(KEY, [1.0, 0.0]) is None
+
+def test_entries_expire_after_ttl(monkeypatch):
+    cache = AnswerCache(ttl=10)
+    now = [1000.0]
+    monkeypatch.setattr("stores.llm.AnswerCache.time.monotonic", lambda: now[0])
+    store(cache)
+
+    now[0] += 11
+
+    assert cache.get(KEY, [1.0, 0.0]) is None
+    assert cache.get_stats()["entries"] == 0
+
+def test_bucket_is_bounded_lru():
+    cache = AnswerCache(max_entries=2)
+    store(cache, query="a", vector=(1.0, 0.0))
+    store(cache, query="b", vector=(0.0, 1.0))
+    assert cache.get(KEY, [1.0, 0.0]) is not None
+
+    store(cache, query="c", vector=(-1.0, 0.0))
+
+    assert cache.get(KEY, [1.0, 0.0]) is not None
+    assert cache.get(KEY, [0.0, 1.0]) is None
@@ -0,0 +1,58 @@
+from types import SimpleNamespace
+import pytest
+
+ContextBuilder = pytest.importorskip("stores.llm.ContextBuilder").ContextBuilder
+
+
+def doc(text, score):
+    return SimpleNamespace(text=text, score=score)
+
+def render(doc_num, text):
+    return f"## Document {doc_num}\n{text}"
+
+def words_count(text):
+    # one token per word keeps the budgets easy to reason about
+    return len(text.split())
+
+
+@pytest.fixture
+def builder():
+    return ContextBuilder(count_tokens=words_count, dedup_threshold=0.85)
+
+
+def test_documents_are_packed_by_score(builder):
+    prompts, stats = builder.build([ doc("low score text", 0.1), doc("high score text", 0.9) ],
+                                   render=render, max_tokens=100)
+
+    assert prompts == [ "## Document 1\nhigh score text", "## Document 2\nlow score text" ]
+    assert (stats["packed"], stats["tokens"], stats["budget"]) == (2, 12, 100)
+
+def test_near_duplicates_are_dropped(builder):
+    text = "the tenant may terminate the lease with three months written notice"
+    prompts, stats = builder.build([ doc(text, 0.9), doc(text + ".", 0.8), doc("unrelated appeal deadline rule", 0.7) ],
+                                   render=render, max_tokens=100)
+
+    assert len(prompts) == 2
+    assert stats["duplicates"] == 1
+
+def test_documents_over_budget_are_skipped_for_smaller_ones(builder):
+    long_text = " ".join(["word"] * 20)
+    prompts, stats = builder.build([ doc("first short one", 0.9), doc(long_text, 0.8), doc("second short one", 0.7) ],
+                                   render=render, max_tokens=15)
+
+    assert prompts == [ "## Document 1\nfirst short one", "## Document 2\nsecond short one" ]
+    assert stats["skipped"] == 1
+    assert stats["tokens"] <= 15
+
+def test_oversized_top_document_is_trimmed_at_sentence_boundary(builder):
+    text = "First sentence here. Second sentence here. Third sentence is here too."
+    prompts, stats = builder.build([ doc(text, 0.9) ], render=render, max_tokens=9)
+
+    assert prompts == [ "## Document 1\nFirst sentence here. Second sentence here." ]
+    assert stats["tokens"] <= 9
+
+def test_count_falls_back_to_characters_estimate():
+    builder = ContextBuilder(count_tokens=lambda text: None, chars_per_token=4.0)
+
+    assert builder.count("x" * 10) == 3
+    assert ContextBuilder(chars_per_token=2.0).count("abcde") == 3
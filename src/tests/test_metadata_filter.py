@@ -0,0 +1,67 @@
+import pytest
+
+MetadataFilter = pytest.importorskip("stores.vectordb.MetadataFilter").MetadataFilter
+PGVectorProvider = pytest.importorskip("stores.vectordb.providers.PGVectorProvider").PGVectorProvider
+QdrantDBProvider = pytest.importorskip("stores.vectordb.providers.QdrantDBProvider").QdrantDBProvider
+
+
+def test_parse_empty_filter():
+    assert MetadataFilter.parse(None) == []
+    assert MetadataFilter.parse({}) == []
+
+def test_parse_equality_and_operators():
+    conditions = MetadataFilter.parse({
+        "asset_id": 3,
+        "page": { "$gte": 10, "$lt": 20 },
+        "source": { "$in": ["a.pdf", "b.pdf"] },
+    })
+
+    assert conditions == [
+        ("asset_id", "$eq", 3),
+        ("page", "$gte", 10),
+        ("page", "$lt", 20),
+        ("source", "$in", ["a.pdf", "b.pdf"]),
+    ]
+
+@pytest.mark.parametrize("expression", [
+    ["asset_id"],
+    { "page; DROP TABLE x": 1 },
+    { "page": { "$regex": "1" } },
+    { "page": { "$in": [] } },
+    { "page": { "$gt": "10" } },
+    { "page": { "$gt": True } },
+    { "source": { "$eq": {"nested": 1} } },
+])
+def test_parse_rejects_invalid_filters(expression):
+    with pytest.raises(ValueError):
+        MetadataFilter.parse(expression)
+
+def test_pgvector_filter_sql():
+    provider = PGVectorProvider(db_client=None)
+    conditions = MetadataFilter.parse({ "asset_id": { "$ne": 3 }, "page": { "$gte": 10 },
+                                        "source": { "$in": ["a", "b"] } })
+
+    filter_sql, params = provider.get_metadata_filter_sql(conditions)
+
+    assert filter_sql == (
+        "NOT (metadata @> CAST(:filter_0 AS jsonb)) AND "
+        "misrlex_jsonb_numeric(metadata -> 'page') >= :filter_1 AND "
+        "(metadata @> CAST(:filter_2 AS jsonb) OR metadata @> CAST(:filter_3 AS jsonb))"
+    )
+    assert params == { "filter_0": '{"asset_id": 3}', "filter_1": 10,
+                       "filter_2": '{"source": "a"}', "filter_3": '{"source": "b"}' }
+
+def test_pgvector_filter_sql_without_conditions():
+    assert PGVectorProvider(db_client=None).get_metadata_filter_sql([]) == ("TRUE", {})
+
+def test_qdrant_payload_filter():
+    provider = QdrantDBProvider(db_client=None)
+    conditions = MetadataFilter.parse({ "asset_id": 3, "page": { "$lt": 20 }, "source": { "$ne": "a" } })
+
+    payload_filter = provider.get_metadata_filter(conditions)
+
+    assert [ c.key for c in payload_filter.must ] == ["metadata.asset_id", "metadata.page"]
+    assert payload_filter.must[0].match.value == 3
+    assert payload_filter.must[1].range.lt == 20
+    assert payload_filter.must_not[0].key == "metadata.source"
+    assert provider.get_metadata_filter([]) is None
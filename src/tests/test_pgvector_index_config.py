@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+
+PGVectorProvider = pytest.importorskip("stores.vectordb.providers.PGVectorProvider").PGVectorProvider
+
+
+@pytest.fixture
+def provider():
+    return PGVectorProvider(db_client=None)
+
+
+def test_default_index_config_is_valid(provider):
+    assert provider.is_valid_index_config(provider.default_index_config)
+
+
+@pytest.mark.parametrize("m, ef_construction", [(1, 64), (101, 400), (16, 31), (16, 1001)])
+def test_hnsw_params_out_of_range(provider, m, ef_construction):
+    index_config = {**provider.default_index_config, "m": m, "ef_construction": ef_construction}
+    assert not provider.is_valid_index_config(index_config)
+
+
+@pytest.mark.parametrize("lists, is_valid", [(None, True), (1, True), (32768, True), (0, False), (32769, False)])
+def test_ivfflat_lists_range(provider, lists, is_valid):
+    index_config = {**provider.default_index_config, "index_type": "ivfflat", "lists": lists}
+    assert provider.is_valid_index_config(index_config) is is_valid
+
+
+
+@pytest.mark.parametrize("oversample, is_valid", [(None, True), (1, True), (20, True), (0.5, False), (21, False)])
+def test_oversample_range(provider, oversample, is_valid):
+    index_config = {**provider.default_index_config, "oversample": oversample}
+    assert provider.is_valid_index_config(index_config) is is_valid
+
+
+@pytest.mark.parametrize("quantization, limit, expected", [
+    ("none", 10, 10),
+    ("scalar", 10, 40),
+    ("binary", 500, 1000),
+    ("binary", 1000, 1000),
+])
+def test_oversample_limit_is_clamped(provider, quantization, limit, expected):
+    index_config = {**provider.default_index_config, "quantization": quantization}
+    assert provider.get_oversample_limit(index_config=index_config, limit=limit) == expected
+
+class RecordingSession:
+
+    def __init__(self):
+        self.statements = []
+
+    async def execute(self, statement):
+        self.statements.append(str(statement))
+
+
+@pytest.mark.parametrize("limit, search_params, expected", [
+    (5, None, "hnsw.ef_search = 40"),
+    (200, None, "hnsw.ef_search = 200"),
+    (5000, {"ef_search": 2000}, "hnsw.ef_search = 1000"),
+])
+def test_ef_search_is_clamped(provider, limit, search_params, expected):
+    session = RecordingSession()
+    asyncio.run(provider.apply_search_params(session=session, limit=limit, search_params=search_params))
+    assert f"SET LOCAL {expected}" in session.statements
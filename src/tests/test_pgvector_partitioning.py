@@ -0,0 +1,38 @@
+import pytest
+
+PGVectorProvider = pytest.importorskip("stores.vectordb.providers.PGVectorProvider").PGVectorProvider
+
+
+@pytest.fixture
+def partitioned_provider():
+    return PGVectorProvider(db_client=None, layout="partitioned")
+
+
+def test_partition_spec_of_project_collection(partitioned_provider):
+    assert partitioned_provider.get_partition_spec("collection_1024_7") == ("collection_1024", 7)
+    assert partitioned_provider.get_partition_spec("collection_384_120") == ("collection_384", 120)
+
+@pytest.mark.parametrize("collection_name", [
+    "collection_1024",
+    "collection_1024_7_old",
+    "collection_1024_abc",
+    "embeddings",
+])
+def test_partition_spec_of_other_tables(partitioned_provider, collection_name):
+    assert partitioned_provider.get_partition_spec(collection_name) == (None, None)
+
+def test_partition_spec_with_table_layout():
+    provider = PGVectorProvider(db_client=None, layout="table")
+    assert provider.get_partition_spec("collection_1024_7") == (None, None)
+
+def test_unknown_layout_falls_back_to_table():
+    provider = PGVectorProvider(db_client=None, layout="sharded")
+    assert provider.get_partition_spec("collection_1024_7") == (None, None)
+
+def test_partition_sql_sets_project_default(partitioned_provider):
+    create_sql, default_sql = partitioned_provider.get_partition_sql(
+        collection_name="collection_1024_7", parent_name="collection_1024", project_id=7
+    )
+
+    assert create_sql == "CREATE TABLE collection_1024_7 PARTITION OF collection_1024 FOR VALUES IN (7)"
+    assert default_sql.endswith("SET DEFAULT 7")
@@ -0,0 +1,54 @@
+from types import SimpleNamespace
+import pytest
+
+ProcessController = pytest.importorskip("controllers.ProcessController").ProcessController
+
+
+@pytest.fixture
+def process_controller():
+    # diff_chunks does not touch the project files, skip the directory setup of __init__
+    return ProcessController.__new__(ProcessController)
+
+def chunk(chunk_id, chunk_hash):
+    return SimpleNamespace(chunk_id=chunk_id, chunk_hash=chunk_hash)
+
+def record(chunk_hash):
+    return SimpleNamespace(chunk_hash=chunk_hash)
+
+
+def test_diff_chunks_keeps_unchanged_chunks(process_controller):
+    new_records, removed_ids = process_controller.diff_chunks(
+        existing_chunks=[ chunk(1, "a"), chunk(2, "b") ],
+        chunks_records=[ record("a"), record("b") ],
+    )
+
+    assert new_records == []
+    assert removed_ids == []
+
+def test_diff_chunks_inserts_new_and_removes_changed(process_controller):
+    new_b = record("b2")
+    new_records, removed_ids = process_controller.diff_chunks(
+        existing_chunks=[ chunk(1, "a"), chunk(2, "b") ],
+        chunks_records=[ record("a"), new_b ],
+    )
+
+    assert new_records == [new_b]
+    assert removed_ids == [2]
+
+def test_diff_chunks_matches_duplicated_texts_one_to_one(process_controller):
+    extra = record("a")
+    new_records, removed_ids = process_controller.diff_chunks(
+        existing_chunks=[ chunk(1, "a"), chunk(2, "a"), chunk(3, "c") ],
+        chunks_records=[ record("a"), record("a"), extra, record("c") ],
+    )
+
+    assert new_records == [extra]
+    assert removed_ids == []
+
+    new_records, removed_ids = process_controller.diff_chunks(
+        existing_chunks=[ chunk(1, "a"), chunk(2, "a") ],
+        chunks_records=[ record("a") ],
+    )
+
+    assert new_records == []
+    assert len(removed_ids) == 1 and removed_ids[0] in (1, 2)
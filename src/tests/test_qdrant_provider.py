@@ -0,0 +1,45 @@
+from types import SimpleNamespace
+import pytest
+
+QdrantDBProvider = pytest.importorskip("stores.vectordb.providers.QdrantDBProvider").QdrantDBProvider
+
+
+@pytest.fixture
+def provider():
+    return QdrantDBProvider(db_client=None, hybrid_rrf_k=60)
+
+def points(*ids):
+    return [ SimpleNamespace(id=point_id) for point_id in ids ]
+
+
+def test_fuse_ranked_results_scores_by_reciprocal_rank(provider):
+    fused = provider.fuse_ranked_results([ points(1, 2, 3), points(3, 4) ], limit=10)
+    scores = { point.id: score for point, score in fused }
+
+    assert scores[3] == pytest.approx(1 / 63 + 1 / 61)
+    assert scores[1] == pytest.approx(1 / 61)
+    assert scores[4] == pytest.approx(1 / 62)
+    # found by both retrievers beats the top hit of only one
+    assert [ point.id for point, _ in fused ] == [3, 1, 2, 4]
+
+def test_fuse_ranked_results_truncates_to_limit(provider):
+    fused = provider.fuse_ranked_results([ points(1, 2, 3), points(4, 5, 6) ], limit=2)
+
+    assert [ point.id for point, _ in fused ] == [1, 4]
+
+def test_fuse_ranked_results_handles_empty_rankings(provider):
+    assert provider.fuse_ranked_results([ [], [] ], limit=5) == []
+    assert [ p.id for p, _ in provider.fuse_ranked_results([ points(7), [] ], limit=5) ] == [7]
+
+def test_sparse_vector_weights_terms(provider):
+    document_vector = provider.get_sparse_vector("المادة ١٤٧ المادة")
+    query_vector = provider.get_sparse_vector("المادة 147", is_query=True)
+
+    # Arabic-Indic digits are normalized, so the article number matches
+    assert set(query_vector.indices) == set(document_vector.indices)
+    assert query_vector.values == [1.0, 1.0]
+
+    weights = dict(zip(document_vector.indices, document_vector.values))
+    repeated_term, single_term = [ weights[i] for i in query_vector.indices ]
+    # BM25 saturation: a repeated term weighs more, but less than twice as much
+    assert single_term < repeated_term < 2 * single_term
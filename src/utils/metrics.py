@@ -7,6 +7,14 @@ import time
 REQUEST_COUNT = Counter('http_requests_total', 'Total HTTP Requests', ['method', 'endpoint', 'status'])
 REQUEST_LATENCY = Histogram('http_request_duration_seconds', 'HTTP Request Latency', ['method', 'endpoint'])
 
+EMBEDDING_CACHE_HITS = Counter('embedding_cache_hits_total', 'Embedding Cache Hits', ['provider'])
+EMBEDDING_CACHE_MISSES = Counter('embedding_cache_misses_total', 'Embedding Cache Misses', ['provider'])
+QUERY_EMBEDDING_REQUESTS = Counter('query_embedding_requests_total', 'Query Embedding Requests', ['outcome'])
+ANSWER_CACHE_REQUESTS = Counter('answer_cache_requests_total', 'Answer Cache Requests', ['outcome'])
+ANSWER_CACHE_TOKENS_SAVED = Counter('answer_cache_tokens_saved_total', 'Estimated LLM Tokens Saved By Answer Cache Hits')
+RAG_ANSWER_FIRST_TOKEN_LATENCY = Histogram('rag_answer_first_token_seconds', 'Streamed RAG Answer Time To First Token')
+RAG_STAGE_LATENCY = Histogram('rag_stage_duration_seconds', 'RAG Pipeline Stage Latency', ['stage'])
+
 class PrometheusMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next):
 